@@ -3,19 +3,22 @@ FastAPI Backend for Data Analysis Agent
 Vercel Serverless Functions Compatible
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import QueryParams
+from starlette.types import Scope
 import pandas as pd
 import numpy as np
 import io
-import json
 import sys
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union
 import uuid
+from collections import OrderedDict
 import tempfile
 import os
+import asyncio
 
 # Add parent directory to path to import src module
 parent_dir = str(Path(__file__).parent.parent)
@@ -24,6 +27,25 @@ if parent_dir not in sys.path:
 
 from src.eda_agent import EDAAgent
 from src.schema_compressor import SchemaCompressor
+from src.session_store import SessionStore
+from src.sorting import normalize_sort_keys
+from src.query_plan import QueryPlan
+from src.disk_table import DiskDataset, DiskResult, iter_table_export
+from src.csv_reader import read_csv_fast, iter_csv_chunks, infer_csv_dtypes
+from src.excel_reader import read_excel_fast, list_sheets
+from src.text_sniffer import sniff_text, read_lines
+from src.dtype_optimizer import DtypeOptimizer
+from src.column_stats import get_statistics as get_column_statistics
+from src.exporters import iter_csv, iter_ndjson, iter_arrow_ipc, iter_parquet
+from src.executor import TaskExecutor
+from src.ingest_jobs import IngestJob, JobRegistry
+from src.serialization import FastJSONResponse, frame_records, frame_payload, dumps, LAYOUTS
+from src.compression import CompressionMiddleware
+from src.upload_limit import UploadLimitMiddleware
+from src.http_cache import make_etag, etag_matches, not_modified, cache_headers
+from src.pdf_tables import (
+    PageTableCache, count_pages, page_ranges, extract_page_range, merge_page_tables, extract_pdf_tables
+)
 
 # File processors
 try:
@@ -46,7 +68,12 @@ try:
 except ImportError:
     pdfplumber = None
 
-app = FastAPI(title="Data Analysis Agent API", version="2.0.0")
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+app = FastAPI(title="Data Analysis Agent API", version="2.0.0", default_response_class=FastJSONResponse)
 
 # CORS configuration
 app.add_middleware(
@@ -57,8 +84,187 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for demo (use Redis/Database in production)
-sessions: Dict[str, Dict[str, Any]] = {}
+# JSON and CSV bodies of at least COMPRESSION_MIN_BYTES are sent gzip or Brotli
+# compressed to clients that accept it
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+)
+
+# Session frames are shared by concurrent requests and never copied per request;
+# copy-on-write (always on from pandas 3) keeps frames derived from them, such as
+# column selections, as views until written to
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# Bounded session storage: memory budget, idle TTL and LRU spill-to-disk
+# are configured via SESSION_MEMORY_BUDGET_MB, SESSION_TTL_SECONDS and SESSION_SPILL_DIR
+sessions = SessionStore.from_env()
+
+# CPU-heavy work runs off the event loop: pandas/NumPy in a thread pool,
+# GIL-bound parsing and document rendering in a process pool. Pool sizes and
+# the per-task timeout come from EXECUTOR_THREADS, EXECUTOR_PROCESSES and
+# EXECUTOR_TIMEOUT_SECONDS
+executor = TaskExecutor.from_env()
+
+# Upload formats whose parsers are pure Python and hold the GIL
+ISOLATED_FORMATS = {'xlsx', 'xls', 'pdf', 'docx', 'doc'}
+
+# PDF tables are extracted in page ranges of PDF_PAGES_PER_TASK pages across
+# the process pool; finished pages are cached in PDF_PAGE_CACHE_DIR so
+# re-uploads and retries after a timeout skip them
+PDF_PAGES_PER_TASK = int(os.environ.get("PDF_PAGES_PER_TASK", "8"))
+pdf_page_cache = PageTableCache(os.environ.get("PDF_PAGE_CACHE_DIR") or None)
+
+
+async def run_in_thread(fn, *args, **kwargs):
+    """Run blocking pandas work on the thread pool, mapping timeouts to 504"""
+    try:
+        return await executor.run_in_thread(fn, *args, **kwargs)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Request timed out")
+
+
+async def run_in_process(fn, *args, **kwargs):
+    """Run a picklable function in the process pool, mapping timeouts to 504"""
+    try:
+        return await executor.run_in_process(fn, *args, **kwargs)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Request timed out")
+
+
+@app.on_event("startup")
+def start_executor():
+    """Spawn the process workers in the background"""
+    executor.start()
+
+
+@app.on_event("shutdown")
+def shutdown_executor():
+    """Stop the worker pools"""
+    executor.shutdown()
+
+
+def get_session(session_id: str) -> Dict[str, Any]:
+    """Look up a session, reloading it from disk if it was spilled"""
+    try:
+        return sessions[session_id]
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+
+# Filter result handles kept per session; the oldest are dropped first
+MAX_RESULT_HANDLES = 32
+
+
+def register_result(session: Dict[str, Any], filters: Dict[str, Any]) -> str:
+    """Register a filtered view under a new result handle"""
+    results = session.setdefault('results', OrderedDict())
+    result_id = uuid.uuid4().hex
+    results[result_id] = filters
+    while len(results) > MAX_RESULT_HANDLES:
+        results.popitem(last=False)
+    return result_id
+
+
+def get_result_filters(session: Dict[str, Any], result_id: str) -> Dict[str, Any]:
+    """Look up the filters behind a result handle"""
+    results = session.get('results') or {}
+    if result_id not in results:
+        raise HTTPException(status_code=404, detail="Filter result not found")
+    return results[result_id]
+
+
+def session_columns(session_id: str, session: Dict[str, Any]) -> pd.Index:
+    """Columns of a session's data, in memory or on disk"""
+    dataset = session.get('dataset')
+    return sessions.dataframe(session_id).columns if dataset is None else dataset.columns
+
+
+def execute_plan(session_id: str, session: Dict[str, Any], plan: QueryPlan) -> Tuple[pd.DataFrame, int]:
+    """
+    Run a query plan on a session's data, in memory or on disk
+    Returns the result rows and the number of rows in the view
+    """
+    dataset = session.get('dataset')
+    if dataset is not None:
+        result = dataset.execute(plan)
+        return result.frame(), result.total_rows
+    # Read through the store, which holds its lock so a concurrent spill cannot hand back None
+    df = sessions.dataframe(session_id)
+    result = plan.execute(sessions, session_id, df)
+    return result.frame(df), result.total_rows
+
+
+def validate_layout(layout: str):
+    """Reject unknown payload layouts"""
+    if layout not in LAYOUTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown layout '{layout}'. Use one of: {', '.join(LAYOUTS)}"
+        )
+
+
+# Uploads are spooled to disk in chunks and rejected once they exceed MAX_UPLOAD_MB
+MAX_UPLOAD_BYTES = int(float(os.environ.get("MAX_UPLOAD_MB", "1024")) * 1024 * 1024)
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+# CSV parser engine ('auto' uses the multithreaded PyArrow reader when installed)
+# and whether dtypes inferred on a sample are pinned for the full read
+CSV_ENGINE = os.environ.get("CSV_ENGINE", "auto")
+CSV_INFER_DTYPES = os.environ.get("CSV_INFER_DTYPES", "0").lower() in ['1', 'true', 'yes']
+
+# Allowance for multipart boundaries and part headers around the file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Session backends: CSV uploads of at least DISK_BACKEND_MIN_MB (or any CSV
+# with backend=disk) are converted to memory-mapped Arrow files under
+# DISK_SESSION_DIR and queried in record batches, so they are limited by
+# MAX_DISK_UPLOAD_MB instead of memory. External sorts use runs of DISK_SORT_RUN_MB
+BACKENDS = ['auto', 'memory', 'disk']
+DISK_BACKEND_MIN_BYTES = int(float(os.environ.get("DISK_BACKEND_MIN_MB", "1024")) * 1024 * 1024)
+MAX_DISK_UPLOAD_BYTES = int(float(os.environ.get("MAX_DISK_UPLOAD_MB", "65536")) * 1024 * 1024)
+DISK_SESSION_DIR = os.environ.get("DISK_SESSION_DIR") or None
+DISK_SORT_RUN_BYTES = int(float(os.environ.get("DISK_SORT_RUN_MB", "256")) * 1024 * 1024)
+
+# Rows of a disk-backed dataset loaded into memory for the agent and previews
+DISK_SAMPLE_ROWS = 10000
+
+# Excel sheets hold at most this many rows below the header
+XLSX_MAX_ROWS = 1048575
+
+
+def upload_limit(backend: str, extension: Optional[str] = None) -> int:
+    """Largest accepted upload; CSV files may go to the disk backend unless backend=memory or pyarrow is missing"""
+    if pyarrow is not None and backend != 'memory' and extension in (None, 'csv'):
+        return max(MAX_UPLOAD_BYTES, MAX_DISK_UPLOAD_BYTES)
+    return MAX_UPLOAD_BYTES
+
+# Uploads are parsed by background jobs; CSV files are read CSV_CHUNK_ROWS
+# rows at a time and become queryable after the first chunk. A stage running
+# past INGEST_TIMEOUT_SECONDS fails the job, but a parse already running is not
+# interrupted and keeps its worker until it returns (see TaskExecutor), which is
+# why pure-Python parsers run in the process pool rather than on request threads
+SUPPORTED_FORMATS = {'csv', 'xlsx', 'xls', 'json', 'pdf', 'docx', 'doc', 'txt'}
+CSV_CHUNK_ROWS = int(os.environ.get("CSV_CHUNK_ROWS", "100000"))
+INGEST_TIMEOUT_SECONDS = float(os.environ.get("INGEST_TIMEOUT_SECONDS", "3600"))
+JOB_EVENT_INTERVAL_SECONDS = 0.25
+jobs = JobRegistry()
+
+
+def request_upload_limit(scope: Scope) -> Optional[int]:
+    """Largest accepted file for a request that spools an upload (None = no limit)"""
+    if scope['path'] == "/api/upload":
+        # The file type is not known yet: allow for the disk backend
+        return upload_limit(QueryParams(scope['query_string']).get('backend', 'auto'))
+    if scope['path'] == "/api/sheets":
+        return MAX_UPLOAD_BYTES
+    return None
+
+
+# Upload bodies are counted as they arrive and refused with a 413 once they
+# pass the limit, including chunked uploads without a Content-Length
+app.add_middleware(UploadLimitMiddleware, limit=request_upload_limit, overhead=MULTIPART_OVERHEAD_BYTES)
 
 
 @app.get("/")
@@ -73,127 +279,135 @@ async def health():
     return {"status": "ok", "version": "2.0.0"}
 
 
-def extract_text_from_pdf(file_content: bytes) -> str:
+def open_source(file: Union[str, bytes]) -> Union[str, io.BytesIO]:
+    """Return a path or file-like object parsers can read an upload from"""
+    return io.BytesIO(file) if isinstance(file, bytes) else file
+
+
+def extract_text_from_pdf(file: Union[str, bytes]) -> str:
     """Extract text from PDF file"""
     if PyPDF2 is None:
         raise HTTPException(status_code=400, detail="PDF processing not available. Install PyPDF2.")
     
-    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+    pdf_reader = PyPDF2.PdfReader(open_source(file))
     text = ""
     for page in pdf_reader.pages:
         text += page.extract_text() + "\n"
     return text
 
 
-def extract_text_from_docx(file_content: bytes) -> str:
+def extract_text_from_docx(file: Union[str, bytes]) -> str:
     """Extract text from DOCX file"""
     if docx is None:
         raise HTTPException(status_code=400, detail="DOCX processing not available. Install python-docx.")
     
-    doc = docx.Document(io.BytesIO(file_content))
+    doc = docx.Document(open_source(file))
     text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
     return text
 
 
-def process_file_to_dataframe(file_content: bytes, filename: str) -> pd.DataFrame:
+def process_file_to_dataframe(
+    file: Union[str, bytes],
+    filename: str,
+    pdf_tables: Optional[List[List[Optional[str]]]] = None,
+    sheet_name: Optional[str] = None
+) -> pd.DataFrame:
     """
     Process uploaded file and convert to DataFrame
     Supports: CSV, XLSX, XLS, JSON, PDF, DOCX, TXT
+    `file` is the path of the spooled upload (or its raw bytes)
+    `pdf_tables` are the table rows of a PDF already extracted by the caller
+    `sheet_name` selects the worksheet of a workbook (default: the first)
     """
     extension = filename.lower().split('.')[-1]
     
     try:
         if extension == 'csv':
-            df = pd.read_csv(io.BytesIO(file_content))
+            df = read_csv_fast(open_source(file), engine=CSV_ENGINE, infer_dtypes=CSV_INFER_DTYPES)
         
         elif extension in ['xlsx', 'xls']:
-            df = pd.read_excel(io.BytesIO(file_content))
+            # Rows are streamed in read-only mode; only the selected sheet is parsed
+            df = read_excel_fast(open_source(file), sheet_name=sheet_name)
         
         elif extension == 'json':
-            df = pd.read_json(io.BytesIO(file_content))
+            df = pd.read_json(open_source(file))
         
         elif extension == 'pdf':
             # Use pdfplumber for better table extraction
             if pdfplumber is not None:
                 try:
-                    pdf_file = io.BytesIO(file_content)
+                    # Tables come pre-extracted in parallel from the upload
+                    # handler, or are extracted page by page here
+                    if pdf_tables is not None:
+                        all_tables = pdf_tables
+                    else:
+                        all_tables = extract_pdf_tables(file, pdf_page_cache)
                     
-                    with pdfplumber.open(pdf_file) as pdf:
-                        all_tables = []
+                    # If we found tables, convert to DataFrame
+                    if all_tables and len(all_tables) > 1:
+                        # First row is header
+                        headers = all_tables[0]
+                        data = all_tables[1:]
                         
-                        # Extract tables from all pages
-                        for page in pdf.pages:
-                            tables = page.extract_tables()
-                            if tables:
-                                for table in tables:
-                                    if table and len(table) > 0:
-                                        all_tables.extend(table)
+                        print(f"DEBUG: Headers = {headers}")
+                        print(f"DEBUG: First data row = {data[0] if data else 'No data'}")
                         
-                        # If we found tables, convert to DataFrame
-                        if all_tables and len(all_tables) > 1:
-                            # First row is header
-                            headers = all_tables[0]
-                            data = all_tables[1:]
+                        # Check if all data is in first cell (merged cell issue)
+                        if data and data[0][0] and '\n' in str(data[0][0]) and all(not cell or str(cell) == 'None' for cell in data[0][1:]):
+                            print("⚠️ Detected merged cells - extracting text and using CSV format parser")
+                            text_content = str(data[0][0])
+                            lines = [line.strip() for line in text_content.split('\n') if line.strip()]
                             
-                            print(f"DEBUG: Headers = {headers}")
-                            print(f"DEBUG: First data row = {data[0] if data else 'No data'}")
+                            # Each line pattern: Title [#] [Type] [Genre] [Country...] [Year] [Rating] [Duration]
+                            # Try to parse using regex for known patterns
+                            import re
+                            parsed_rows = []
                             
-                            # Check if all data is in first cell (merged cell issue)
-                            if data and data[0][0] and '\n' in str(data[0][0]) and all(not cell or str(cell) == 'None' for cell in data[0][1:]):
-                                print("⚠️ Detected merged cells - extracting text and using CSV format parser")
-                                text_content = str(data[0][0])
-                                lines = [line.strip() for line in text_content.split('\n') if line.strip()]
-                                
-                                # Each line pattern: Title [#] [Type] [Genre] [Country...] [Year] [Rating] [Duration]
-                                # Try to parse using regex for known patterns
-                                import re
-                                parsed_rows = []
-                                
-                                for line in lines:
-                                    # Pattern: starts with "Title" followed by number, then type (TV Show/Movie)
-                                    match = re.match(r'(Title\s+\d+)\s+(TV Show|Movie)\s+(\w+)\s+([\w\s]+?)\s+(\d{4})\s+([\w-]+)\s+(.*)', line)
-                                    if match:
-                                        title, type_, genre, country, year, rating, duration = match.groups()
-                                        parsed_rows.append([
-                                            title.strip(),
-                                            type_.strip(),
-                                            genre.strip(),
-                                            country.strip(),
-                                            year.strip(),
-                                            rating.strip(),
-                                            duration.strip()
-                                        ])
-                                
-                                if parsed_rows:
-                                    df = pd.DataFrame(parsed_rows, columns=headers)
-                                    print(f"✅ Parsed {len(df)} rows from merged cells into {len(df.columns)} columns")
-                                    print(f"First row: {df.iloc[0].to_dict()}")
-                                    return df
-                                else:
-                                    print("❌ Failed to parse merged cells with regex")
+                            for line in lines:
+                                # Pattern: starts with "Title" followed by number, then type (TV Show/Movie)
+                                match = re.match(r'(Title\s+\d+)\s+(TV Show|Movie)\s+(\w+)\s+([\w\s]+?)\s+(\d{4})\s+([\w-]+)\s+(.*)', line)
+                                if match:
+                                    title, type_, genre, country, year, rating, duration = match.groups()
+                                    parsed_rows.append([
+                                        title.strip(),
+                                        type_.strip(),
+                                        genre.strip(),
+                                        country.strip(),
+                                        year.strip(),
+                                        rating.strip(),
+                                        duration.strip()
+                                    ])
                             
-                            # Clean None values and empty strings
-                            headers = [str(h).strip() if h and str(h).strip() else f"Column_{i}" for i, h in enumerate(headers)]
-                            cleaned_data = []
-                            for row in data:
-                                # Make sure row has same number of elements as headers
-                                if len(row) < len(headers):
-                                    row = row + [''] * (len(headers) - len(row))
-                                elif len(row) > len(headers):
-                                    row = row[:len(headers)]
-                                
-                                cleaned_row = [str(cell).strip() if cell and str(cell).strip() not in ['None', 'nan', ''] else "" for cell in row]
-                                cleaned_data.append(cleaned_row)
+                            if parsed_rows:
+                                df = pd.DataFrame(parsed_rows, columns=headers)
+                                print(f"✅ Parsed {len(df)} rows from merged cells into {len(df.columns)} columns")
+                                print(f"First row: {df.iloc[0].to_dict()}")
+                                return df
+                            else:
+                                print("❌ Failed to parse merged cells with regex")
+                        
+                        # Clean None values and empty strings
+                        headers = [str(h).strip() if h and str(h).strip() else f"Column_{i}" for i, h in enumerate(headers)]
+                        cleaned_data = []
+                        for row in data:
+                            # Make sure row has same number of elements as headers
+                            if len(row) < len(headers):
+                                row = row + [''] * (len(headers) - len(row))
+                            elif len(row) > len(headers):
+                                row = row[:len(headers)]
                             
-                            df = pd.DataFrame(cleaned_data, columns=headers)
-                            print(f"✅ pdfplumber extracted table with {len(df.columns)} columns, {len(df)} rows")
-                            print(f"Column names: {list(df.columns)}")
-                            return df
+                            cleaned_row = [str(cell).strip() if cell and str(cell).strip() not in ['None', 'nan', ''] else "" for cell in row]
+                            cleaned_data.append(cleaned_row)
+                        
+                        df = pd.DataFrame(cleaned_data, columns=headers)
+                        print(f"✅ pdfplumber extracted table with {len(df.columns)} columns, {len(df)} rows")
+                        print(f"Column names: {list(df.columns)}")
+                        return df
                 except Exception as e:
                     print(f"pdfplumber extraction failed: {e}")
             
             # Fallback to text extraction
-            text = extract_text_from_pdf(file_content)
+            text = extract_text_from_pdf(file)
             lines = [line.strip() for line in text.split('\n') if line.strip()]
             
             if not lines:
@@ -215,7 +429,7 @@ def process_file_to_dataframe(file_content: bytes, filename: str) -> pd.DataFram
             df = pd.DataFrame({'content': lines})
         
         elif extension in ['docx', 'doc']:
-            text = extract_text_from_docx(file_content)
+            text = extract_text_from_docx(file)
             lines = [line.strip() for line in text.split('\n') if line.strip()]
             
             if not lines:
@@ -234,43 +448,39 @@ def process_file_to_dataframe(file_content: bytes, filename: str) -> pd.DataFram
             df = pd.DataFrame({'content': lines})
         
         elif extension == 'txt':
-            text = file_content.decode('utf-8')
-            lines = [line.strip() for line in text.split('\n') if line.strip()]
-            
-            if not lines:
-                raise HTTPException(status_code=400, detail="Text file appears to be empty")
-            
-            first_line = lines[0]
+            # Sniff the layout from a bounded prefix, then parse the file once
+            sniff = sniff_text(file)
+            print(f"🔎 Sniffed {sniff.format} text (confidence {sniff.confidence:.2f})")
             
-            # Try CSV format first
-            if ',' in first_line:
+            df = None
+            if sniff.format == 'delimited':
                 try:
-                    df = pd.read_csv(io.StringIO(text))
-                    if len(df.columns) > 1:
-                        return df
-                except:
-                    pass
+                    df = read_csv_fast(open_source(file), engine=CSV_ENGINE, **sniff.read_kwargs())
+                except Exception as e:
+                    print(f"Delimited parse failed: {e}")
             
-            # Try tab-separated
-            if '\t' in first_line:
+            # Fixed-width is the sniffed format, or the second attempt for a failed delimited parse
+            if df is None and sniff.format in ['delimited', 'fixed_width']:
                 try:
-                    df = pd.read_csv(io.StringIO(text), sep='\t')
-                    if len(df.columns) > 1:
-                        return df
-                except:
-                    pass
+                    kwargs = sniff.read_kwargs() if sniff.format == 'fixed_width' else {'encoding': sniff.encoding}
+                    df = pd.read_fwf(open_source(file), infer_nrows=200, **kwargs)
+                    if len(df.columns) < 2 or len(df) == 0:
+                        df = None
+                except Exception as e:
+                    print(f"Fixed-width parse failed: {e}")
+                    df = None
             
-            # Try fixed-width format
-            try:
-                df = pd.read_fwf(io.StringIO(text), infer_nrows=200)
-                if len(df.columns) > 1 and len(df) > 0:
-                    df.columns = [str(col).strip() for col in df.columns]
-                    return df
-            except:
-                pass
+            if df is None:
+                # Fallback to single column
+                df = read_lines(file, sniff.encoding)
+                if df.empty:
+                    raise HTTPException(status_code=400, detail="Text file appears to be empty")
+            elif not sniff.has_header:
+                df.columns = [f"Column_{i}" for i in range(len(df.columns))]
+            else:
+                df.columns = [str(col).strip() for col in df.columns]
             
-            # Fallback to single column
-            df = pd.DataFrame({'content': lines})
+            df.attrs['format'] = sniff.to_dict()
         
         else:
             raise HTTPException(
@@ -280,6 +490,8 @@ def process_file_to_dataframe(file_content: bytes, filename: str) -> pd.DataFram
         
         return df
     
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Upload error: {str(e)}")
         import traceback
@@ -290,151 +502,592 @@ def process_file_to_dataframe(file_content: bytes, filename: str) -> pd.DataFram
         )
 
 
-@app.post("/api/upload")
-async def upload_file(file: UploadFile = File(...)):
+def parse_upload(
+    path: str,
+    filename: str,
+    pdf_tables: Optional[List[List[Optional[str]]]] = None,
+    sheet_name: Optional[str] = None
+) -> Tuple[Optional[pd.DataFrame], Optional[Tuple[int, str]]]:
     """
-    Upload and process data file
-    Returns session_id and initial data preview
+    Worker entry point for parsing a spooled upload
+    HTTPException does not survive pickling, so errors come back as (status_code, detail)
     """
     try:
-        print(f"📤 Upload request - Filename: {file.filename}, Content-Type: {file.content_type}")
-        
-        # Read file content
-        content = await file.read()
-        print(f"📦 File size: {len(content)} bytes")
-        
-        # Process file to DataFrame
-        df = process_file_to_dataframe(content, file.filename)
-        
-        # Create session
-        session_id = str(uuid.uuid4())
+        return process_file_to_dataframe(path, filename, pdf_tables, sheet_name), None
+    except HTTPException as e:
+        return None, (e.status_code, e.detail)
+
+
+async def extract_pdf_tables_parallel(path: str, timeout: Optional[float] = None) -> List[List[Optional[str]]]:
+    """
+    Extract the tables of a PDF in page ranges across the process pool
+    Returns the table rows merged in page order; timeout bounds the whole extraction
+    """
+    return await asyncio.wait_for(_extract_pdf_tables(path, timeout), timeout)
+
+
+async def _extract_pdf_tables(path: str, timeout: Optional[float]) -> List[List[Optional[str]]]:
+    document_key = await run_in_thread(pdf_page_cache.document_key, path)
+    await run_in_thread(pdf_page_cache.touch, document_key)
+    n_pages = await run_in_thread(count_pages, path)
+    
+    ranges = page_ranges(n_pages, PDF_PAGES_PER_TASK)
+    results = await asyncio.gather(*[
+        run_in_process(extract_page_range, path, start, end, pdf_page_cache.cache_dir, document_key, timeout=timeout)
+        for start, end in ranges
+    ])
+    return merge_page_tables([tables for pages in results for tables in pages])
+
+
+def new_session(df: pd.DataFrame, filename: str) -> Dict[str, Any]:
+    """Session dict for a freshly loaded DataFrame (the agent is attached once loading finishes)"""
+    return {
+        'dataframe': df,
+        'agent': None,
+        'filename': filename,
+        'original_shape': df.shape,
+        'current_sort': None,
+        'current_filters': None,
+        'optimize_dtypes': False,
+        'memory_report': None
+    }
+
+
+def publish_dataframe(job: IngestJob, df: pd.DataFrame):
+    """Make the rows loaded so far queryable under the job's session"""
+    if job.session_ready:
+        sessions.update_dataframe(job.session_id, df)
+    else:
+        sessions[job.session_id] = new_session(df, job.filename)
+        job.update(session_ready=True)
+
+
+def ingest_csv(job: IngestJob, path: str) -> pd.DataFrame:
+    """
+    Read a CSV upload in chunks, publishing the session after the first chunk
+    The session's frame is refreshed whenever the row count has doubled, so
+    re-concatenation stays linear in the file size
+    """
+    dtype = infer_csv_dtypes(path) if CSV_INFER_DTYPES else None
+    chunks = []
+    rows, published_rows = 0, 0
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter_csv_chunks(f, chunk_rows=CSV_CHUNK_ROWS, engine=CSV_ENGINE, dtype=dtype):
+                chunks.append(chunk)
+                rows += len(chunk)
+                job.update(bytes_parsed=f.tell(), rows=rows)
+                
+                if rows >= 2 * published_rows:
+                    chunks = [pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]]
+                    publish_dataframe(job, chunks[0])
+                    published_rows = rows
+    except Exception as e:
+        # Chunks whose types disagree with the first block: read the whole file instead
+        print(f"Chunked CSV read failed ({e}); reading the whole file")
+        chunks = []
+    
+    if not chunks:
+        df = process_file_to_dataframe(path, job.filename)
+    else:
+        df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    job.update(bytes_parsed=job.bytes_total, rows=len(df))
+    return df
+
+
+def finish_session(job: IngestJob, df: pd.DataFrame, optimize_dtypes: bool) -> Dict[str, Any]:
+    """
+    Optimise dtypes, build the agent and publish the final session for a parsed upload
+    Returns the upload result payload
+    """
+    # Layout detected for text uploads (attrs do not survive the optimiser)
+    text_format = df.attrs.get('format')
+    
+    # Compact dtypes for this session if requested
+    memory_report = None
+    if optimize_dtypes:
+        job.update(stage='optimizing')
+        df, memory_report = DtypeOptimizer().optimize(df)
+        print(f"🗜️ Memory: {memory_report['memory_before_mb']:.2f} MB → {memory_report['memory_after_mb']:.2f} MB")
+    
+    # Initialize EDA Agent (schema compression runs here)
+    job.update(stage='profiling')
+    agent = EDAAgent(df, name="Web Agent")
+    
+    # Store session data
+    publish_dataframe(job, df)
+    session = sessions[job.session_id]
+    session.update({
+        'agent': agent,
+        'original_shape': df.shape,
+        'optimize_dtypes': optimize_dtypes,
+        'memory_report': memory_report
+    })
+    
+    # Prepare response
+    preview_data = frame_records(df.head(100))
+    columns = [{'field': col, 'headerName': col, 'type': str(df[col].dtype)} 
+               for col in df.columns]
+    
+    return {
+        'session_id': job.session_id,
+        'filename': job.filename,
+        'shape': {'rows': df.shape[0], 'columns': df.shape[1]},
+        'columns': columns,
+        'data': preview_data,
+        'dtypes': df.dtypes.astype(str).to_dict(),
+        'summary': agent.get_schema_context()[:500],
+        'memory': memory_report,
+        'format': text_format,
+        'backend': 'memory'
+    }
+
+
+def ingest_csv_to_disk(job: IngestJob, path: str) -> Dict[str, Any]:
+    """
+    Convert a CSV upload to a memory-mapped Arrow dataset and publish its session
+    Only the first DISK_SAMPLE_ROWS rows are loaded into memory, for the agent
+    and the preview; queries run against the dataset
+    Returns the upload result payload
+    """
+    dataset = DiskDataset.from_csv(
+        path,
+        DISK_SESSION_DIR,
+        progress=lambda parsed, rows: job.update(bytes_parsed=parsed, rows=rows),
+        sort_run_bytes=DISK_SORT_RUN_BYTES
+    )
+    job.update(stage='profiling', bytes_parsed=job.bytes_total, rows=dataset.num_rows)
+    sample = dataset.sample(DISK_SAMPLE_ROWS)
+    agent = EDAAgent(sample, name="Web Agent")
+    
+    session = new_session(sample, job.filename)
+    session.update({'dataset': dataset, 'agent': agent, 'original_shape': dataset.shape})
+    sessions[job.session_id] = session
+    job.update(session_ready=True)
+    
+    return {
+        'session_id': job.session_id,
+        'filename': job.filename,
+        'shape': {'rows': dataset.num_rows, 'columns': len(dataset.columns)},
+        'columns': [{'field': col, 'headerName': col, 'type': str(sample[col].dtype)} for col in sample.columns],
+        'data': frame_records(sample.head(100)),
+        'dtypes': sample.dtypes.astype(str).to_dict(),
+        'summary': agent.get_schema_context()[:500],
+        'memory': None,
+        'format': None,
+        'backend': 'disk'
+    }
+
+
+async def run_ingest_job(
+    job: IngestJob,
+    path: str,
+    optimize_dtypes: bool,
+    sheet: Optional[str] = None,
+    on_disk: bool = False
+):
+    """Parse a spooled upload in the background and record the outcome on the job"""
+    try:
+        job.update(stage='parsing')
         
-        # Initialize EDA Agent
-        agent = EDAAgent(df, name="Web Agent")
+        if on_disk:
+            result = await run_in_thread(ingest_csv_to_disk, job, path, timeout=INGEST_TIMEOUT_SECONDS)
+            job.update(stage='ready', result=result)
+            print(f"✅ Job {job.job_id} ready on disk: {job.rows} rows")
+            return
         
-        # Store session data
-        sessions[session_id] = {
-            'dataframe': df,
-            'agent': agent,
-            'filename': file.filename,
-            'original_shape': df.shape,
-            'current_sort': None,
-            'current_filters': None
-        }
+        # CSV is read in chunks on a thread; pure-Python parsers run in the
+        # process pool; PDF tables are extracted page range by page range
+        extension = job.filename.lower().split('.')[-1]
+        sheets = None
+        if extension in ['xlsx', 'xls']:
+            try:
+                sheets = await run_in_thread(list_sheets, path)
+            except HTTPException:
+                raise
+            except Exception:
+                pass  # Unreadable workbook: the parse below reports the error
         
-        # Prepare response
-        preview_data = df.head(100).to_dict('records')
-        columns = [{'field': col, 'headerName': col, 'type': str(df[col].dtype)} 
-                   for col in df.columns]
+        if extension == 'csv':
+            df = await run_in_thread(ingest_csv, job, path, timeout=INGEST_TIMEOUT_SECONDS)
+        else:
+            if extension == 'pdf' and pdfplumber is not None:
+                try:
+                    pdf_tables = await extract_pdf_tables_parallel(path, timeout=INGEST_TIMEOUT_SECONDS)
+                except HTTPException:
+                    raise
+                except asyncio.TimeoutError:
+                    raise HTTPException(status_code=504, detail="Request timed out")
+                except Exception as e:
+                    # Unreadable by pdfplumber: fall back to text extraction
+                    print(f"pdfplumber extraction failed: {e}")
+                    pdf_tables = []
+                df, error = await run_in_process(
+                    parse_upload, path, job.filename, pdf_tables, timeout=INGEST_TIMEOUT_SECONDS
+                )
+            else:
+                run = run_in_process if extension in ISOLATED_FORMATS else run_in_thread
+                df, error = await run(parse_upload, path, job.filename, None, sheet, timeout=INGEST_TIMEOUT_SECONDS)
+            if error is not None:
+                raise HTTPException(status_code=error[0], detail=error[1])
+            job.update(bytes_parsed=job.bytes_total, rows=len(df))
         
-        return JSONResponse({
-            'session_id': session_id,
-            'filename': file.filename,
-            'shape': {'rows': df.shape[0], 'columns': df.shape[1]},
-            'columns': columns,
-            'data': preview_data,
-            'dtypes': df.dtypes.astype(str).to_dict(),
-            'summary': agent.get_schema_context()[:500]
-        })
+        result = await run_in_thread(finish_session, job, df, optimize_dtypes, timeout=INGEST_TIMEOUT_SECONDS)
+        if sheets is not None:
+            result['sheets'] = sheets
+            result['sheet'] = sheet or (sheets[0]['name'] if sheets else None)
+        job.update(stage='ready', result=result)
+        print(f"✅ Job {job.job_id} ready: {job.rows} rows")
     
     except HTTPException as he:
-        raise he
+        job.fail(he.status_code, he.detail)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        print(f"❌ Job {job.job_id} failed: {e}")
+        job.fail(500, str(e))
+    finally:
+        os.remove(path)
+
+
+async def spool_upload(file: UploadFile, limit: int = MAX_UPLOAD_BYTES) -> Tuple[str, int]:
+    """
+    Copy an upload to a temporary file in chunks, enforcing a size limit
+    Returns the temp file path and the number of bytes written
+    """
+    suffix = Path(file.filename or '').suffix.lower()
+    fd, path = tempfile.mkstemp(prefix="upload-", suffix=suffix)
+    size = 0
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > limit:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large (limit {limit / (1024 * 1024):g} MB)"
+                    )
+                out.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path, size
+
+
+@app.post("/api/upload", status_code=202)
+async def upload_file(
+    file: UploadFile = File(...),
+    optimize_dtypes: bool = False,
+    sheet: Optional[str] = None,
+    backend: str = 'auto'
+):
+    """
+    Upload a data file and start parsing it in the background
+    Returns a job whose progress is reported by /api/jobs/{job_id}; its
+    session_id becomes queryable once the job reports session_ready
+    With optimize_dtypes, columns are compacted (category, downcast numerics,
+    Arrow strings) and the before/after memory is reported
+    For workbooks, sheet selects the worksheet to load (default: the first)
+    backend: 'memory', 'disk' (CSV only: memory-mapped Arrow files processed in
+    record batches, for data larger than RAM) or 'auto' (disk for CSV files of
+    at least DISK_BACKEND_MIN_MB)
+    """
+    print(f"📤 Upload request - Filename: {file.filename}, Content-Type: {file.content_type}")
+    
+    extension = (file.filename or '').lower().split('.')[-1]
+    if extension not in SUPPORTED_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported file format: {extension}")
+    if backend not in BACKENDS:
+        raise HTTPException(status_code=400, detail=f"Unknown backend '{backend}'. Use one of: {', '.join(BACKENDS)}")
+    if backend == 'disk' and extension != 'csv':
+        raise HTTPException(status_code=400, detail="The disk backend supports CSV uploads only")
+    if backend == 'disk' and pyarrow is None:
+        raise HTTPException(status_code=400, detail="The disk backend is not available. Install pyarrow.")
+    
+    # Spool the upload to disk instead of holding it in memory
+    path, size = await spool_upload(file, upload_limit(backend, extension))
+    print(f"📦 File size: {size} bytes")
+    on_disk = extension == 'csv' and pyarrow is not None and \
+        (backend == 'disk' or (backend == 'auto' and size >= DISK_BACKEND_MIN_BYTES))
+    
+    job = jobs.create(file.filename, size, str(uuid.uuid4()))
+    job.task = asyncio.create_task(run_ingest_job(job, path, optimize_dtypes, sheet, on_disk))
+    return FastJSONResponse(status_code=202, content=job.to_dict())
+
+
+@app.post("/api/sheets")
+async def list_workbook_sheets(file: UploadFile = File(...)):
+    """
+    List the worksheets of an Excel workbook without parsing their rows
+    Pass one of the names as ?sheet= to /api/upload to load it
+    """
+    extension = (file.filename or '').lower().split('.')[-1]
+    if extension not in ['xlsx', 'xls']:
+        raise HTTPException(status_code=400, detail="Sheet listing requires an Excel workbook")
+    
+    path, _ = await spool_upload(file)
+    try:
+        sheets = await run_in_thread(list_sheets, path)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error reading workbook: {str(e)}")
+    finally:
+        os.remove(path)
+    
+    return FastJSONResponse({'filename': file.filename, 'sheets': sheets})
+
+
+def get_job(job_id: str) -> IngestJob:
+    """Look up an ingest job"""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """
+    Get the progress of an upload job: stage, bytes parsed, rows produced
+    Once the stage is 'ready', result holds the upload summary and preview
+    """
+    return FastJSONResponse(get_job(job_id).to_dict())
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_status(job_id: str):
+    """
+    Stream the progress of an upload job as server-sent events
+    An event is sent on every change; the stream ends when the job is done
+    """
+    job = get_job(job_id)
+    
+    async def events():
+        last_update = None
+        while True:
+            if job.updated_at != last_update:
+                last_update = job.updated_at
+                yield f"data: {dumps(job.to_dict()).decode()}\n\n"
+            if job.done:
+                break
+            await asyncio.sleep(JOB_EVENT_INTERVAL_SECONDS)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 @app.get("/api/data/{session_id}")
 async def get_data(
+    request: Request,
     session_id: str,
     page: int = 0,
     page_size: int = 100,
-    sort_column: Optional[str] = None,
-    sort_order: Optional[str] = 'asc'
+    sort_column: Optional[List[str]] = Query(None),
+    sort_order: Optional[List[str]] = Query(None),
+    result_id: Optional[str] = None,
+    search: Optional[str] = None,
+    columns: Optional[List[str]] = Query(None),
+    layout: str = 'records'
 ):
     """
     Get paginated and sorted data
+    Repeat sort_column (and sort_order) to sort by several columns, most significant first
+    Repeat columns to return only those columns
+    Pass the result_id returned by /api/filter to page within a filtered view
+    layout: 'records' (one object per row) or 'columnar' (one array per column,
+    low-cardinality text columns as dictionary codes)
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified
     """
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
+    validate_layout(layout)
     
-    df = sessions[session_id]['dataframe'].copy()
-    
-    # Apply sorting
-    if sort_column and sort_column in df.columns:
-        ascending = sort_order == 'asc'
-        df = df.sort_values(by=sort_column, ascending=ascending)
-    
-    # Pagination
-    start_idx = page * page_size
-    end_idx = start_idx + page_size
-    paginated_df = df.iloc[start_idx:end_idx]
+    def build_page():
+        session = get_session(session_id)
+        filters = get_result_filters(session, result_id) if result_id else None
+        
+        # The version is read before the data, so a concurrent update yields a new tag
+        etag = make_etag(session_id, sessions.version(session_id), request.query_params.multi_items())
+        if etag_matches(request.headers.get('if-none-match'), etag):
+            return etag, None
+        
+        # Filter, sort and page as row positions; only the page rows are gathered
+        plan = QueryPlan(
+            filters=filters,
+            search=search,
+            columns=columns,
+            sort_keys=normalize_sort_keys(sort_column, sort_order, session_columns(session_id, session)),
+            offset=page * page_size,
+            limit=page_size
+        )
+        page_df, total_rows = execute_plan(session_id, session, plan)
+        
+        return etag, {
+            'data': frame_payload(page_df, layout),
+            'total_rows': total_rows,
+            'page': page,
+            'page_size': page_size,
+            'result_id': result_id
+        }
     
-    return JSONResponse({
-        'data': paginated_df.to_dict('records'),
-        'total_rows': len(df),
-        'page': page,
-        'page_size': page_size
-    })
+    etag, payload = await run_in_thread(build_page)
+    if payload is None:
+        return not_modified(etag)
+    return FastJSONResponse(payload, headers=cache_headers(etag))
 
 
 @app.post("/api/filter/{session_id}")
 async def filter_data(
     session_id: str,
-    filters: Dict[str, Any]
+    filters: Dict[str, Any],
+    page_size: int = 100,
+    layout: str = 'records'
 ):
     """
     Apply filters to data
     filters format: {
-        'column_name': {'operator': 'eq|ne|gt|lt|contains', 'value': '...'},
+        'column_name': {'operator': 'eq|ne|gt|lt|gte|lte|contains|in|is_null|not_null', 'value': '...'},
         ...
     }
+    Returns a result_id for paging the filtered view through /api/data,
+    the number of matching rows and the first page (in the given layout, see /api/data)
     """
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
+    validate_layout(layout)
+    
+    def run_filter():
+        session = get_session(session_id)
+        dataset = session.get('dataset')
+        
+        # Register the filtered view under a result handle
+        result_id = register_result(session, filters)
+        page_df, filtered_rows = execute_plan(session_id, session, QueryPlan(filters=filters, limit=page_size))
+        
+        # Store current filters
+        session['current_filters'] = filters
+        
+        return {
+            'result_id': result_id,
+            'data': frame_payload(page_df, layout),
+            'filtered_rows': filtered_rows,
+            'total_rows': len(sessions.dataframe(session_id)) if dataset is None else dataset.num_rows,
+            'page': 0,
+            'page_size': page_size
+        }
+    
+    return FastJSONResponse(await run_in_thread(run_filter))
+
+
+# Export formats streamed from disk-backed views, with their media types
+DISK_STREAMED_FORMATS = {
+    'csv': "text/csv",
+    'ndjson': "application/x-ndjson",
+    'json': "application/json",
+    'arrow': "application/vnd.apache.arrow.stream",
+    'parquet': "application/vnd.apache.parquet",
+}
+
+
+def render_xlsx(df: pd.DataFrame) -> bytes:
+    """Render a DataFrame as an Excel workbook (runs in the process pool)"""
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False)
+    return output.getvalue()
+
+
+def render_pdf(df: pd.DataFrame) -> bytes:
+    """Render the first 1000 rows of a DataFrame as a PDF table (runs in the process pool)"""
+    # Create simple PDF with table data
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter, A4, landscape
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+    from reportlab.lib.units import inch
+    
+    output = io.BytesIO()
+    
+    # Use landscape for wide tables
+    pagesize = landscape(A4) if len(df.columns) > 6 else A4
+    doc = SimpleDocTemplate(output, pagesize=pagesize, 
+                            leftMargin=0.5*inch, rightMargin=0.5*inch,
+                            topMargin=0.5*inch, bottomMargin=0.5*inch)
+    elements = []
     
-    df = sessions[session_id]['dataframe'].copy()
+    # Prepare data - ensure proper string conversion
+    header = [str(col) for col in df.columns.tolist()]
+    rows = []
     
-    # Apply filters
-    for column, filter_config in filters.items():
-        if column not in df.columns:
-            continue
+    # Convert each row properly to avoid misalignment
+    for idx, row in df.head(1000).iterrows():
+        row_data = [str(val) if pd.notna(val) else '' for val in row.values]
+        rows.append(row_data)
+    
+    # Combine header and data
+    table_data = [header] + rows
+    
+    # Calculate column widths dynamically
+    num_cols = len(df.columns)
+    available_width = (pagesize[0] - inch) / num_cols
+    col_widths = [available_width] * num_cols
+    
+    # Create table with column widths
+    table = Table(table_data, colWidths=col_widths, repeatRows=1)
+    # Style the table
+    table.setStyle(TableStyle([
+        # Header styling
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 7),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+        ('TOPPADDING', (0, 0), (-1, 0), 8),
         
-        operator = filter_config.get('operator', 'eq')
-        value = filter_config.get('value')
+        # Data rows styling
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 6),
+        ('TOPPADDING', (0, 1), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+        ('LEFTPADDING', (0, 0), (-1, -1), 4),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
         
-        # Convert value to appropriate type
-        col_dtype = df[column].dtype
-        try:
-            if pd.api.types.is_numeric_dtype(col_dtype):
-                value = pd.to_numeric(value)
-            elif pd.api.types.is_bool_dtype(col_dtype):
-                value = str(value).lower() in ['true', '1', 'yes']
-        except (ValueError, TypeError):
-            pass  # Keep as string
+        # Grid
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
         
-        if operator == 'eq':
-            df = df[df[column] == value]
-        elif operator == 'ne':
-            df = df[df[column] != value]
-        elif operator == 'gt':
-            df = df[df[column] > value]
-        elif operator == 'lt':
-            df = df[df[column] < value]
-        elif operator == 'gte':
-            df = df[df[column] >= value]
-        elif operator == 'lte':
-            df = df[df[column] <= value]
-        elif operator == 'contains':
-            df = df[df[column].astype(str).str.contains(str(value), case=False, na=False)]
-    
-    # Store current filters
-    sessions[session_id]['current_filters'] = filters
-    
-    return JSONResponse({
-        'data': df.to_dict('records'),
-        'filtered_rows': len(df),
-        'total_rows': sessions[session_id]['dataframe'].shape[0]
-    })
+        # Alternating row colors
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')])
+    ]))
+    
+    elements.append(table)
+    doc.build(elements)
+    return output.getvalue()
+
+
+def render_docx(df: pd.DataFrame) -> bytes:
+    """Render the first 1000 rows of a DataFrame as a DOCX table (runs in the process pool)"""
+    doc = docx.Document()
+    doc.add_heading('Data Export', 0)
+    
+    # Add table
+    table = doc.add_table(rows=1, cols=len(df.columns))
+    table.style = 'Light Grid Accent 1'
+    
+    # Header row
+    hdr_cells = table.rows[0].cells
+    for i, col in enumerate(df.columns):
+        hdr_cells[i].text = str(col)
+    
+    # Data rows (limit to 1000 for performance)
+    for _, row in df.head(1000).iterrows():
+        row_cells = table.add_row().cells
+        for i, value in enumerate(row):
+            row_cells[i].text = str(value)
+    
+    output = io.BytesIO()
+    doc.save(output)
+    return output.getvalue()
 
 
 @app.post("/api/export/{session_id}")
@@ -443,88 +1096,93 @@ async def export_data(
     filters: Optional[Dict[str, Any]] = None,
     columns: Optional[List[str]] = None,
     format: str = 'csv',
-    sort_column: Optional[str] = None,
-    sort_order: str = 'asc'
+    sort_column: Optional[List[str]] = Query(None),
+    sort_order: Optional[List[str]] = Query(None)
 ):
     """
     Export filtered and sorted data in specified format
+    Formats: csv, ndjson, arrow, parquet (streamed in row blocks), xlsx, json, pdf, docx
+    Repeat sort_column (and sort_order) to sort by several columns
+    Disk-backed sessions also stream json; xlsx holds at most XLSX_MAX_ROWS rows
     """
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
+    def resolve_export():
+        session = get_session(session_id)
+        available = session_columns(session_id, session)
+        
+        # Apply filters if provided (use current filters if not specified)
+        filters_to_apply = filters or session.get('current_filters')
+        
+        # Apply sorting (use current sort if not specified)
+        sort_keys = normalize_sort_keys(sort_column, sort_order, available)
+        if not sort_keys and session.get('current_sort'):
+            sort_info = session['current_sort']
+            sort_keys = normalize_sort_keys([sort_info['column']], [sort_info['order']], available)
+        
+        # PDF and DOCX render only the first 1000 rows, so only those are resolved
+        limit = {'pdf': 1000, 'docx': 1000, 'xlsx': XLSX_MAX_ROWS}.get(format)
+        plan = QueryPlan(filters=filters_to_apply, columns=columns or None, sort_keys=sort_keys, limit=limit)
+        
+        dataset = session.get('dataset')
+        if dataset is not None:
+            return None, dataset.execute(plan)
+        df = sessions.dataframe(session_id)
+        return df, plan.execute(sessions, session_id, df)
     
-    df = sessions[session_id]['dataframe'].copy()
+    df, result = await run_in_thread(resolve_export)
     
-    # Apply filters if provided (use current filters if not specified)
-    filters_to_apply = filters or sessions[session_id].get('current_filters')
-    if filters_to_apply:
-        for column, filter_config in filters_to_apply.items():
-            if column not in df.columns:
-                continue
-            
-            operator = filter_config.get('operator', 'eq')
-            value = filter_config.get('value')
-            
-            # Convert value to appropriate type
-            col_dtype = df[column].dtype
-            try:
-                if pd.api.types.is_numeric_dtype(col_dtype):
-                    value = pd.to_numeric(value)
-                elif pd.api.types.is_bool_dtype(col_dtype):
-                    value = str(value).lower() in ['true', '1', 'yes']
-            except (ValueError, TypeError):
-                pass
-            
-            if operator == 'eq':
-                df = df[df[column] == value]
-            elif operator == 'ne':
-                df = df[df[column] != value]
-            elif operator == 'gt':
-                df = df[df[column] > value]
-            elif operator == 'lt':
-                df = df[df[column] < value]
-            elif operator == 'gte':
-                df = df[df[column] >= value]
-            elif operator == 'lte':
-                df = df[df[column] <= value]
-            elif operator == 'contains':
-                df = df[df[column].astype(str).str.contains(str(value), case=False, na=False)]
-    
-    # Apply sorting (use current sort if not specified)
-    if sort_column and sort_column in df.columns:
-        df = df.sort_values(by=sort_column, ascending=sort_order.lower() == 'asc')
-    elif sessions[session_id].get('current_sort'):
-        sort_info = sessions[session_id]['current_sort']
-        if sort_info['column'] in df.columns:
-            df = df.sort_values(by=sort_info['column'], ascending=sort_info['order'].lower() == 'asc')
-    
-    # Select columns if specified
-    if columns:
-        df = df[[col for col in columns if col in df.columns]]
-    
-    # Export in requested format
+    # Disk-backed views stream straight from their memory-mapped files
+    if isinstance(result, DiskResult) and format in DISK_STREAMED_FORMATS:
+        return StreamingResponse(
+            iter_table_export(result, format),
+            media_type=DISK_STREAMED_FORMATS[format],
+            headers={"Content-Disposition": f"attachment; filename=export.{format}"}
+        )
+    
+    # Streamed formats serialise the view block by block
     if format == 'csv':
-        output = io.StringIO()
-        df.to_csv(output, index=False)
-        output.seek(0)
         return StreamingResponse(
-            io.BytesIO(output.getvalue().encode()),
+            iter_csv(df, result.rows, result.columns),
             media_type="text/csv",
             headers={"Content-Disposition": f"attachment; filename=export.csv"}
         )
     
-    elif format == 'xlsx':
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False)
-        output.seek(0)
+    elif format == 'ndjson':
+        return StreamingResponse(
+            iter_ndjson(df, result.rows, result.columns),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f"attachment; filename=export.ndjson"}
+        )
+    
+    elif format in ['arrow', 'parquet']:
+        if pyarrow is None:
+            raise HTTPException(status_code=400, detail="Arrow export not available. Install pyarrow.")
+        
+        if format == 'arrow':
+            return StreamingResponse(
+                iter_arrow_ipc(df, result.rows, result.columns),
+                media_type="application/vnd.apache.arrow.stream",
+                headers={"Content-Disposition": f"attachment; filename=export.arrow"}
+            )
+        return StreamingResponse(
+            iter_parquet(df, result.rows, result.columns),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": f"attachment; filename=export.parquet"}
+        )
+    
+    # Document formats are rendered from the materialised view
+    def materialise():
+        return result.frame() if df is None else result.frame(df)
+    
+    if format == 'xlsx':
+        content = await run_in_process(render_xlsx, await run_in_thread(materialise))
         return StreamingResponse(
-            output,
+            io.BytesIO(content),
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             headers={"Content-Disposition": f"attachment; filename=export.xlsx"}
         )
     
     elif format == 'json':
-        json_str = df.to_json(orient='records')
+        json_str = await run_in_thread(lambda: materialise().to_json(orient='records'))
         return StreamingResponse(
             io.BytesIO(json_str.encode()),
             media_type="application/json",
@@ -532,76 +1190,11 @@ async def export_data(
         )
     
     elif format == 'pdf':
-        # Create simple PDF with table data
-        from reportlab.lib import colors
-        from reportlab.lib.pagesizes import letter, A4, landscape
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
-        from reportlab.lib.units import inch
-        
-        output = io.BytesIO()
-        
-        # Use landscape for wide tables
-        pagesize = landscape(A4) if len(df.columns) > 6 else A4
-        doc = SimpleDocTemplate(output, pagesize=pagesize, 
-                                leftMargin=0.5*inch, rightMargin=0.5*inch,
-                                topMargin=0.5*inch, bottomMargin=0.5*inch)
-        elements = []
-        
-        # Prepare data - ensure proper string conversion
-        header = [str(col) for col in df.columns.tolist()]
-        rows = []
-        
-        # Convert each row properly to avoid misalignment
-        for idx, row in df.head(1000).iterrows():
-            row_data = [str(val) if pd.notna(val) else '' for val in row.values]
-            rows.append(row_data)
-        
-        # Combine header and data
-        table_data = [header] + rows
-        
-        # Calculate column widths dynamically
-        num_cols = len(df.columns)
-        available_width = (pagesize[0] - inch) / num_cols
-        col_widths = [available_width] * num_cols
-        
-        # Create table with column widths
-        table = Table(table_data, colWidths=col_widths, repeatRows=1)
-        # Style the table
-        table.setStyle(TableStyle([
-            # Header styling
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 7),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('TOPPADDING', (0, 0), (-1, 0), 8),
-            
-            # Data rows styling
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 6),
-            ('TOPPADDING', (0, 1), (-1, -1), 4),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-            ('LEFTPADDING', (0, 0), (-1, -1), 4),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-            
-            # Grid
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            
-            # Alternating row colors
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f5f5f5')])
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        output.seek(0)
-        
+        # Only the first 1000 rows are rendered, so only those are sent to the worker
+        view = await run_in_thread(materialise)
+        content = await run_in_process(render_pdf, view)
         return StreamingResponse(
-            output,
+            io.BytesIO(content),
             media_type="application/pdf",
             headers={"Content-Disposition": f"attachment; filename=export.pdf"}
         )
@@ -611,30 +1204,10 @@ async def export_data(
         if docx is None:
             raise HTTPException(status_code=400, detail="python-docx not installed")
         
-        doc = docx.Document()
-        doc.add_heading('Data Export', 0)
-        
-        # Add table
-        table = doc.add_table(rows=1, cols=len(df.columns))
-        table.style = 'Light Grid Accent 1'
-        
-        # Header row
-        hdr_cells = table.rows[0].cells
-        for i, col in enumerate(df.columns):
-            hdr_cells[i].text = str(col)
-        
-        # Data rows (limit to 1000 for performance)
-        for _, row in df.head(1000).iterrows():
-            row_cells = table.add_row().cells
-            for i, value in enumerate(row):
-                row_cells[i].text = str(value)
-        
-        output = io.BytesIO()
-        doc.save(output)
-        output.seek(0)
-        
+        view = await run_in_thread(materialise)
+        content = await run_in_process(render_docx, view)
         return StreamingResponse(
-            output,
+            io.BytesIO(content),
             media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
             headers={"Content-Disposition": f"attachment; filename=export.docx"}
         )
@@ -648,50 +1221,48 @@ async def analyze_data(session_id: str, query: str = Form(...)):
     """
     Perform AI-powered analysis on the data
     """
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    agent = sessions[session_id]['agent']
-    
-    # Get basic insights
-    insights = agent.get_basic_insights()
+    def run_analysis():
+        agent = get_session(session_id)['agent']
+        if agent is None:
+            raise HTTPException(status_code=409, detail="Session is still loading")
+        
+        # Get basic insights
+        insights = agent.get_basic_insights()
+        
+        return {
+            'insights': insights,
+            'schema': agent.get_schema_context()
+        }
     
-    return JSONResponse({
-        'insights': insights,
-        'schema': agent.get_schema_context()
-    })
+    return FastJSONResponse(await run_in_thread(run_analysis))
 
 
 @app.get("/api/statistics/{session_id}")
-async def get_statistics(session_id: str):
-    """Get statistical summary of the data"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    df = sessions[session_id]['dataframe']
-    
-    # Numeric statistics
-    numeric_stats = df.describe().to_dict()
-    
-    # Categorical statistics
-    categorical_stats = {}
-    for col in df.select_dtypes(include=['object']).columns:
-        categorical_stats[col] = {
-            'unique_values': int(df[col].nunique()),
-            'top_value': str(df[col].mode()[0]) if len(df[col].mode()) > 0 else None,
-            'top_frequency': int(df[col].value_counts().iloc[0]) if len(df[col]) > 0 else 0
-        }
-    
-    # Missing values
-    missing_values = df.isnull().sum().to_dict()
+async def get_statistics(request: Request, session_id: str, result_id: Optional[str] = None):
+    """
+    Get statistical summary of the data
+    Pass a result_id from /api/filter for the statistics of the filtered view
+    Results are cached per session data version and carry an ETag
+    """
+    def compute():
+        session = get_session(session_id)
+        filters = get_result_filters(session, result_id) if result_id else None
+        
+        etag = make_etag(session_id, sessions.version(session_id), request.query_params.multi_items())
+        if etag_matches(request.headers.get('if-none-match'), etag):
+            return etag, None
+        dataset = session.get('dataset')
+        if dataset is not None:
+            return etag, dataset.statistics(filters)
+        df = sessions.dataframe(session_id)
+        rows = QueryPlan(filters=filters).execute(sessions, session_id, df).rows
+        
+        return etag, get_column_statistics(sessions, session_id, df, filters, rows)
     
-    return JSONResponse({
-        'numeric_statistics': numeric_stats,
-        'categorical_statistics': categorical_stats,
-        'missing_values': missing_values,
-        'total_rows': len(df),
-        'total_columns': len(df.columns)
-    })
+    etag, payload = await run_in_thread(compute)
+    if payload is None:
+        return not_modified(etag)
+    return FastJSONResponse(payload, headers=cache_headers(etag))
 
 
 # Vercel serverless function handler
@@ -4,7 +4,6 @@ Streamlit app with ScaleDown API integration
 """
 
 import streamlit as st
-import pandas as pd
 import sys
 from pathlib import Path
 
@@ -15,6 +14,7 @@ from src.eda_agent import EDAAgent
 from src.schema_compressor import SchemaCompressor
 from src.scaledown_api import ScaleDownIntegration, save_api_key, load_api_key
 from src.visualizations import plot_missing_values, plot_correlation_matrix
+from src.csv_reader import read_csv_fast
 
 # Page configuration
 st.set_page_config(
@@ -128,7 +128,7 @@ with tab1:
         
         if uploaded_file is not None:
             try:
-                df = pd.read_csv(uploaded_file)
+                df = read_csv_fast(uploaded_file)
                 st.session_state.df = df
                 st.session_state.agent = EDAAgent(df, name="Web Analysis")
                 
@@ -0,0 +1,94 @@
+"""
+Benchmark equality, 'in' and null filters with and without bitmap indexes.
+
+The baseline is the boolean-indexing path: every predicate compares the whole
+column and the masks are ANDed (`build_filter_mask` without a session store).
+The indexed path answers the same filters from per-column bitmap indexes,
+built once per session. Both end with the filtered frame (`df[mask]`).
+
+Usage:
+    python benchmarks/bench_bitmap_filters.py [--rows 2000000] [--repeat 10]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.session_store import SessionStore
+from src.filter_engine import build_filter_mask
+
+
+def make_frame(n_rows: int) -> pd.DataFrame:
+    """Build a frame with low-cardinality text, numeric and nullable columns."""
+    rng = np.random.default_rng(42)
+    embarked = rng.choice(['S', 'C', 'Q', None], n_rows, p=[0.7, 0.18, 0.1, 0.02])
+    return pd.DataFrame({
+        'status': rng.choice(['active', 'inactive', 'pending', 'closed'], n_rows),
+        'country': rng.choice([f'country_{i}' for i in range(40)], n_rows),
+        'embarked': pd.Series(embarked, dtype=object),
+        'pclass': rng.integers(1, 4, n_rows),
+        'value': rng.normal(100, 20, n_rows),
+    })
+
+
+CASES = {
+    'eq': {'status': {'operator': 'eq', 'value': 'active'}},
+    'ne': {'country': {'operator': 'ne', 'value': 'country_3'}},
+    'in': {'country': {'operator': 'in', 'value': ['country_1', 'country_7', 'country_9']}},
+    'is_null': {'embarked': {'operator': 'is_null'}},
+    'eq AND in AND eq': {
+        'status': {'operator': 'eq', 'value': 'pending'},
+        'country': {'operator': 'in', 'value': ['country_1', 'country_2']},
+        'pclass': {'operator': 'eq', 'value': 1},
+    },
+    'eq AND not_null AND ne': {
+        'embarked': {'operator': 'not_null'},
+        'status': {'operator': 'eq', 'value': 'active'},
+        'pclass': {'operator': 'ne', 'value': 3},
+    },
+}
+
+
+def time_call(fn, repeat: int) -> float:
+    """Best-of-`repeat` wall time of `fn()` in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(n_rows: int, repeat: int):
+    df = make_frame(n_rows)
+    store = SessionStore()
+    store['bench'] = {'dataframe': df}
+
+    print(f"{n_rows} rows")
+    print(f"{'filters':<24} {'matches':>9} {'scan ms':>9} {'bitmap ms':>10} {'speedup':>8}")
+    for name, filters in CASES.items():
+        expected = build_filter_mask(df, filters)
+        indexed = build_filter_mask(df, filters, store, 'bench')  # builds the indexes
+        assert np.array_equal(expected, indexed), name
+
+        scan = time_call(lambda: df[build_filter_mask(df, filters)], repeat)
+        bitmap = time_call(lambda: df[build_filter_mask(df, filters, store, 'bench')], repeat)
+        print(f"{name:<24} {int(expected.sum()):>9} {scan:>9.2f} {bitmap:>10.2f} {scan / bitmap:>7.1f}x")
+
+    index_bytes = store.memory_usage() - int(df.memory_usage(deep=True).sum())
+    print(f"\nIndex memory: ~{max(index_bytes, 0) / (1024 * 1024):.1f} MB")
+    store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark bitmap-indexed filters")
+    parser.add_argument('--rows', type=int, default=2_000_000, help='Rows in the frame')
+    parser.add_argument('--repeat', type=int, default=10, help='Runs per measurement (best is reported)')
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
@@ -0,0 +1,121 @@
+"""
+Benchmark /api/data latency while uploads are being processed.
+
+Paging requests run against an existing session while large CSV and Excel
+uploads are parsed concurrently. The run is repeated with the handlers'
+work done inline on the event loop (the behaviour without the executor
+layer) and with it offloaded to the worker pools.
+
+Usage:
+    python benchmarks/bench_concurrent_latency.py [--rows 500000] [--uploads 4]
+"""
+
+import argparse
+import asyncio
+import io
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "api"))
+
+import main
+
+
+def make_frame(n_rows: int) -> pd.DataFrame:
+    """Build a synthetic frame with numeric and text columns."""
+    rng = np.random.default_rng(42)
+    return pd.DataFrame({
+        'id': np.arange(n_rows),
+        'value': rng.normal(100, 20, n_rows),
+        'count': rng.integers(0, 1000, n_rows),
+        'group': rng.choice(['alpha', 'beta', 'gamma', 'delta'], n_rows),
+        'label': [f"item {i}" for i in range(n_rows)],
+    })
+
+
+async def run_inline(fn, *args, timeout=None, **kwargs):
+    """Stand-in for the executor helpers that blocks the event loop."""
+    return fn(*args, **kwargs)
+
+
+async def upload_and_wait(client: httpx.AsyncClient, filename: str, content: bytes) -> dict:
+    """Upload a file and poll its ingest job until it finishes."""
+    r = await client.post('/api/upload', files={'file': (filename, content)})
+    r.raise_for_status()
+    job = r.json()
+    while job['stage'] not in ('ready', 'failed'):
+        await asyncio.sleep(0.05)
+        job = (await client.get(f"/api/jobs/{job['job_id']}")).json()
+    if job['stage'] == 'failed':
+        raise RuntimeError(job['error'])
+    return job
+
+
+async def measure(client: httpx.AsyncClient, session_id: str, uploads, duration: float):
+    """Page through a session while the uploads run; return the latencies in ms."""
+    latencies = []
+
+    async def page_loop():
+        page = 0
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline or not upload_tasks.done():
+            start = time.perf_counter()
+            r = await client.get(f'/api/data/{session_id}', params={
+                'page': page % 50, 'page_size': 100, 'sort_column': 'value'
+            })
+            r.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+            page += 1
+            await asyncio.sleep(0.005)
+
+    upload_tasks = asyncio.gather(*(upload_and_wait(client, name, content) for name, content in uploads))
+    await asyncio.gather(page_loop(), upload_tasks)
+    return np.array(latencies)
+
+
+async def run(rows: int, n_uploads: int, duration: float):
+    df = make_frame(rows)
+    csv_bytes = df.to_csv(index=False).encode()
+    excel = io.BytesIO()
+    df.head(min(rows, 20000)).to_excel(excel, index=False)
+
+    uploads = []
+    for i in range(n_uploads):
+        uploads.append((f'upload_{i}.csv', csv_bytes))
+        uploads.append((f'upload_{i}.xlsx', excel.getvalue()))
+
+    offloaded = (main.run_in_thread, main.run_in_process)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench', timeout=None) as client:
+        session_id = (await upload_and_wait(client, 'base.csv', csv_bytes))['session_id']
+
+        print(f"{rows} rows, {len(uploads)} concurrent uploads "
+              f"({len(csv_bytes) / (1024 * 1024):.1f} MB CSV + Excel)")
+        print(f"{'mode':<10} {'requests':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for mode in ['inline', 'offloaded']:
+            if mode == 'inline':
+                main.run_in_thread = main.run_in_process = run_inline
+            else:
+                main.run_in_thread, main.run_in_process = offloaded
+
+            latencies = await measure(client, session_id, uploads, duration)
+            print(f"{mode:<10} {len(latencies):>8} {np.percentile(latencies, 50):>8.1f} "
+                  f"{np.percentile(latencies, 99):>8.1f} {latencies.max():>8.1f}")
+
+    main.run_in_thread, main.run_in_process = offloaded
+    main.executor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark /api/data latency during uploads")
+    parser.add_argument('--rows', type=int, default=500_000, help='Rows in each uploaded file')
+    parser.add_argument('--uploads', type=int, default=4, help='Concurrent CSV + Excel upload pairs')
+    parser.add_argument('--duration', type=float, default=2.0, help='Minimum seconds of paging per mode')
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.uploads, args.duration))
@@ -0,0 +1,84 @@
+"""
+Benchmark CSV ingestion engines on tall and wide synthetic files.
+
+Usage:
+    python benchmarks/bench_csv_engines.py [--rows 1000000] [--wide-columns 500]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.csv_reader import read_csv_fast, iter_csv_chunks, pyarrow
+
+
+def make_frame(n_rows: int, n_numeric: int, n_text: int) -> pd.DataFrame:
+    """Build a synthetic frame with integer, float and low-cardinality text columns."""
+    rng = np.random.default_rng(42)
+    data = {}
+    for i in range(n_numeric):
+        if i % 2 == 0:
+            data[f'int_{i}'] = rng.integers(0, 1_000_000, n_rows)
+        else:
+            data[f'float_{i}'] = rng.normal(100, 20, n_rows)
+    for i in range(n_text):
+        data[f'text_{i}'] = rng.choice(['alpha', 'beta', 'gamma', 'delta'], n_rows)
+    return pd.DataFrame(data)
+
+
+def time_call(fn, repeat: int = 3) -> float:
+    """Best wall-clock time of `repeat` calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows: int, wide_columns: int, repeat: int):
+    cases = {
+        'tall': make_frame(rows, 6, 2),
+        'wide': make_frame(max(rows // 50, 1000), wide_columns - wide_columns // 5, wide_columns // 5),
+    }
+
+    engines = [('c', False), ('c', True)]
+    if pyarrow is not None:
+        engines += [('pyarrow', False), ('pyarrow', True)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'file':<6} {'shape':>16} {'size MB':>8}  {'engine':<20} {'seconds':>8}")
+        for name, df in cases.items():
+            path = os.path.join(tmp, f'{name}.csv')
+            df.to_csv(path, index=False)
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+            shape = f"{df.shape[0]}x{df.shape[1]}"
+
+            baseline = time_call(lambda: pd.read_csv(path), repeat)
+            print(f"{name:<6} {shape:>16} {size_mb:>8.1f}  {'pandas default':<20} {baseline:>8.3f}")
+
+            for engine, pinned in engines:
+                label = f"{engine}{' + pinned' if pinned else ''}"
+                seconds = time_call(lambda: read_csv_fast(path, engine=engine, infer_dtypes=pinned), repeat)
+                print(f"{name:<6} {shape:>16} {size_mb:>8.1f}  {label:<20} {seconds:>8.3f}"
+                      f"  ({baseline / seconds:.1f}x)")
+
+            chunked = time_call(lambda: sum(len(c) for c in iter_csv_chunks(path)), repeat)
+            print(f"{name:<6} {shape:>16} {size_mb:>8.1f}  {'chunked (auto)':<20} {chunked:>8.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark CSV ingestion engines")
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Rows in the tall file')
+    parser.add_argument('--wide-columns', type=int, default=500, help='Columns in the wide file')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions per engine')
+    args = parser.parse_args()
+    run(args.rows, args.wide_columns, args.repeat)
@@ -0,0 +1,125 @@
+"""
+Benchmark JSON response encoding of data pages.
+
+Compares the previous path (`DataFrame.to_dict('records')` rendered by
+FastAPI's standard JSONResponse) with the column-wise serialization layer
+(`frame_records` rendered by FastJSONResponse). It then compares the records
+and columnar layouts on a wide table by payload size, encode time and parse
+time (json.loads standing in for the client's JSON.parse).
+
+The baseline cannot encode NaN, so the frame has no missing values; the
+missing-value case is timed for the new path only.
+
+Usage:
+    python benchmarks/bench_json_serialization.py [--page-sizes 100 1000 10000] [--repeat 20]
+        [--wide-rows 1000] [--wide-columns 40]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.serialization import FastJSONResponse, frame_records, frame_payload, orjson
+
+
+def make_frame(n_rows: int, missing: bool = False) -> pd.DataFrame:
+    """Build a synthetic page with numeric, text, categorical and boolean columns."""
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({
+        'id': np.arange(n_rows),
+        'value': rng.normal(100, 20, n_rows),
+        'count': rng.integers(0, 1000, n_rows).astype('int32'),
+        'group': pd.Categorical(rng.choice(['alpha', 'beta', 'gamma', 'delta'], n_rows)),
+        'label': [f"item {i}" for i in range(n_rows)],
+        'flag': rng.random(n_rows) > 0.5,
+        'ratio': rng.random(n_rows).astype('float32'),
+        'city': rng.choice(['Paris', 'Lima', 'Oslo', 'Kyiv', 'Pune'], n_rows),
+    })
+    if missing:
+        df.loc[df.index % 7 == 0, 'value'] = np.nan
+        df.loc[df.index % 11 == 0, 'label'] = None
+    return df
+
+
+def make_wide_frame(n_rows: int, n_columns: int) -> pd.DataFrame:
+    """Build a wide table cycling through categorical, numeric and free-text columns."""
+    rng = np.random.default_rng(7)
+    columns = {}
+    for i in range(n_columns):
+        kind = i % 4
+        if kind == 0:
+            columns[f'category_{i}'] = rng.choice(['north', 'south', 'east', 'west', 'central'], n_rows)
+        elif kind == 1:
+            columns[f'status_{i}'] = rng.choice(['active', 'inactive', 'pending'], n_rows)
+        elif kind == 2:
+            columns[f'amount_{i}'] = rng.normal(1000, 250, n_rows).round(2)
+        else:
+            columns[f'description_{i}'] = [f"record {i}-{j}" for j in range(n_rows)]
+    return pd.DataFrame(columns)
+
+
+def time_call(fn, repeat: int) -> float:
+    """Best-of-`repeat` wall time of `fn()` in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def baseline(df: pd.DataFrame) -> bytes:
+    return JSONResponse({'data': df.to_dict('records'), 'total_rows': len(df)}).body
+
+
+def serialized(df: pd.DataFrame) -> bytes:
+    return FastJSONResponse({'data': frame_records(df), 'total_rows': len(df)}).body
+
+
+def compare_layouts(n_rows: int, n_columns: int, repeat: int):
+    """Payload size, encode and parse time of the records and columnar layouts."""
+    df = make_wide_frame(n_rows, n_columns)
+    print(f"\n{n_rows} rows x {n_columns} columns")
+    print(f"{'layout':<10} {'bytes':>10} {'encode ms':>10} {'parse ms':>10}")
+    sizes = {}
+    for layout in ['records', 'columnar']:
+        body = FastJSONResponse({'data': frame_payload(df, layout)}).body
+        encode = time_call(lambda: FastJSONResponse({'data': frame_payload(df, layout)}).body, repeat)
+        parse = time_call(lambda: json.loads(body), repeat)
+        sizes[layout] = len(body)
+        print(f"{layout:<10} {len(body):>10} {encode:>10.2f} {parse:>10.2f}")
+    print(f"columnar payload is {sizes['records'] / sizes['columnar']:.1f}x smaller")
+
+
+def run(page_sizes, repeat: int):
+    print(f"encoder: {'orjson ' + orjson.__version__ if orjson is not None else 'json (orjson not installed)'}")
+    print(f"{'rows':>8} {'to_dict+JSONResponse ms':>24} {'frame_records+Fast ms':>22} {'speedup':>8} {'with NaN ms':>12}")
+    for n_rows in page_sizes:
+        df = make_frame(n_rows)
+        assert len(baseline(df)) > 0 and len(serialized(df)) > 0
+
+        old = time_call(lambda: baseline(df), repeat)
+        new = time_call(lambda: serialized(df), repeat)
+        missing = make_frame(n_rows, missing=True)
+        with_nan = time_call(lambda: serialized(missing), repeat)
+        print(f"{n_rows:>8} {old:>24.2f} {new:>22.2f} {old / new:>7.1f}x {with_nan:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON encoding of data pages")
+    parser.add_argument('--page-sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000],
+                        help='Rows per encoded page')
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per measurement (best is reported)')
+    parser.add_argument('--wide-rows', type=int, default=1000, help='Rows of the layout comparison table')
+    parser.add_argument('--wide-columns', type=int, default=40, help='Columns of the layout comparison table')
+    args = parser.parse_args()
+    run(args.page_sizes, args.repeat)
+    compare_layouts(args.wide_rows, args.wide_columns, args.repeat)
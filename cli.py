@@ -4,7 +4,6 @@ Command-line interface for the Data Analysis Agent.
 
 import argparse
 import sys
-import pandas as pd
 from pathlib import Path
 
 # Add src to path
@@ -13,14 +12,15 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 from src.eda_agent import EDAAgent
 from src.schema_compressor import SchemaCompressor
 from src.utils import load_sample_data
+from src.csv_reader import read_csv_fast, ENGINES
 
 
-def analyze_file(filepath, output=None, auto=False):
+def analyze_file(filepath, output=None, auto=False, engine='auto'):
     """Analyze a CSV file."""
     print(f"Loading data from {filepath}...")
     
     try:
-        df = pd.read_csv(filepath)
+        df = read_csv_fast(filepath, engine=engine)
         print(f"✓ Loaded {df.shape[0]} rows × {df.shape[1]} columns")
     except Exception as e:
         print(f"✗ Error loading file: {e}")
@@ -81,12 +81,12 @@ def analyze_sample(dataset_name, output=None):
     return 0
 
 
-def compress_schema(filepath, output=None):
+def compress_schema(filepath, output=None, engine='auto'):
     """Compress schema of a CSV file."""
     print(f"Loading data from {filepath}...")
     
     try:
-        df = pd.read_csv(filepath)
+        df = read_csv_fast(filepath, engine=engine)
         print(f"✓ Loaded {df.shape[0]} rows × {df.shape[1]} columns")
     except Exception as e:
         print(f"✗ Error loading file: {e}")
@@ -147,6 +147,8 @@ Examples:
     analyze_parser.add_argument('--output', '-o', help='Output file for report')
     analyze_parser.add_argument('--auto', '-a', action='store_true', 
                                help='Run automated EDA')
+    analyze_parser.add_argument('--engine', choices=ENGINES, default='auto',
+                               help='CSV parser engine (auto uses PyArrow when installed)')
     
     # Sample command
     sample_parser = subparsers.add_parser('sample', help='Analyze sample dataset')
@@ -159,6 +161,8 @@ Examples:
     schema_parser = subparsers.add_parser('schema', help='Compress schema only')
     schema_parser.add_argument('file', help='Path to CSV file')
     schema_parser.add_argument('--output', '-o', help='Output file for schema')
+    schema_parser.add_argument('--engine', choices=ENGINES, default='auto',
+                              help='CSV parser engine (auto uses PyArrow when installed)')
     
     args = parser.parse_args()
     
@@ -168,11 +172,11 @@ Examples:
     
     try:
         if args.command == 'analyze':
-            return analyze_file(args.file, args.output, args.auto)
+            return analyze_file(args.file, args.output, args.auto, args.engine)
         elif args.command == 'sample':
             return analyze_sample(args.dataset, args.output)
         elif args.command == 'schema':
-            return compress_schema(args.file, args.output)
+            return compress_schema(args.file, args.output, args.engine)
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user")
         return 130
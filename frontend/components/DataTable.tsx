@@ -1,4 +1,4 @@
-import { useState, useMemo } from 'react'
+import { useState, useMemo, useEffect } from 'react'
 import {
   Table,
   TableBody,
@@ -17,14 +17,50 @@ import {
 } from '@mui/material'
 import SearchIcon from '@mui/icons-material/Search'
 
+// Page returned by the API with layout=columnar: one array per column,
+// low-cardinality text columns as codes into a dictionary (-1 = missing)
+export interface ColumnarData {
+  layout: 'columnar'
+  length: number
+  columns: {
+    name: string
+    values?: any[]
+    encoding?: 'dictionary'
+    dictionary?: any[]
+    codes?: number[]
+  }[]
+}
+
+export function decodeColumnar(payload: ColumnarData): any[] {
+  const rows: any[] = Array.from({ length: payload.length }, () => ({}))
+  for (const column of payload.columns) {
+    if (column.encoding === 'dictionary') {
+      const { dictionary = [], codes = [] } = column
+      for (let i = 0; i < payload.length; i++) {
+        rows[i][column.name] = codes[i] < 0 ? null : dictionary[codes[i]]
+      }
+    } else {
+      const values = column.values || []
+      for (let i = 0; i < payload.length; i++) {
+        rows[i][column.name] = values[i]
+      }
+    }
+  }
+  return rows
+}
+
 interface DataTableProps {
-  data: any[]
+  data: any[] | ColumnarData
   columns: any[]
   onSort?: (column: string, order: 'asc' | 'desc') => void
   loading?: boolean
+  // Rows in the whole view; data may hold only its first pages
+  totalRows?: number
+  // Called when a table page reaches past the loaded rows
+  onLoadMore?: () => void
 }
 
-export default function DataTable({ data, columns, onSort, loading }: DataTableProps) {
+export default function DataTable({ data, columns, onSort, loading, totalRows, onLoadMore }: DataTableProps) {
   const [orderBy, setOrderBy] = useState<string>('')
   const [order, setOrder] = useState<'asc' | 'desc'>('asc')
   const [page, setPage] = useState(0)
@@ -41,15 +77,27 @@ export default function DataTable({ data, columns, onSort, loading }: DataTableP
     }
   }
 
+  const rows = useMemo(() => (Array.isArray(data) ? data : decodeColumnar(data)), [data])
+
   const filteredData = useMemo(() => {
-    if (!searchTerm) return data
+    if (!searchTerm) return rows
 
-    return data.filter((row) =>
+    return rows.filter((row) =>
       Object.values(row).some((value) =>
         String(value).toLowerCase().includes(searchTerm.toLowerCase())
       )
     )
-  }, [data, searchTerm])
+  }, [rows, searchTerm])
+
+  // Rows beyond the loaded pages are counted but fetched only when paged to;
+  // the search box filters the loaded rows
+  const viewRows = searchTerm ? filteredData.length : Math.max(totalRows ?? 0, rows.length)
+
+  useEffect(() => {
+    if (onLoadMore && !loading && !searchTerm && rows.length < viewRows && (page + 1) * rowsPerPage > rows.length) {
+      onLoadMore()
+    }
+  }, [onLoadMore, loading, searchTerm, rows.length, viewRows, page, rowsPerPage])
 
   const paginatedData = useMemo(() => {
     const start = page * rowsPerPage
@@ -82,7 +130,7 @@ export default function DataTable({ data, columns, onSort, loading }: DataTableP
           }}
         />
         <Chip
-          label={`${filteredData.length} rows`}
+          label={`${viewRows.toLocaleString()} rows`}
           color="primary"
           variant="outlined"
         />
@@ -146,7 +194,7 @@ export default function DataTable({ data, columns, onSort, loading }: DataTableP
       {/* Pagination */}
       <TablePagination
         component="div"
-        count={filteredData.length}
+        count={viewRows}
         page={page}
         onPageChange={(_, newPage) => setPage(newPage)}
         rowsPerPage={rowsPerPage}
@@ -72,6 +72,8 @@ export default function ExportDialog({ open, onClose, onExport, columns }: Expor
             <FormControlLabel value="csv" control={<Radio />} label="CSV (.csv)" />
             <FormControlLabel value="xlsx" control={<Radio />} label="Excel (.xlsx)" />
             <FormControlLabel value="json" control={<Radio />} label="JSON (.json)" />
+            <FormControlLabel value="parquet" control={<Radio />} label="Parquet (.parquet)" />
+            <FormControlLabel value="arrow" control={<Radio />} label="Arrow IPC (.arrow)" />
             <FormControlLabel value="pdf" control={<Radio />} label="PDF (.pdf)" />
             <FormControlLabel value="docx" control={<Radio />} label="Word Document (.docx)" />
           </RadioGroup>
@@ -19,19 +19,24 @@ import {
   Download as DownloadIcon,
 } from '@mui/icons-material'
 import FileUpload from '../components/FileUpload'
-import DataTable from '../components/DataTable'
+import DataTable, { ColumnarData, decodeColumnar } from '../components/DataTable'
 import FilterPanel from '../components/FilterPanel'
 import ExportDialog from '../components/ExportDialog'
 import StatisticsPanel from '../components/StatisticsPanel'
 import { toast } from 'react-hot-toast'
 
+// Rows fetched per request when paging through a view
+const PAGE_ROWS = 1000
+
 export default function Home() {
   const [sessionId, setSessionId] = useState<string | null>(null)
-  const [data, setData] = useState<any[]>([])
+  const [data, setData] = useState<any[] | ColumnarData>([])
   const [columns, setColumns] = useState<any[]>([])
   const [loading, setLoading] = useState(false)
   const [fileInfo, setFileInfo] = useState<any>(null)
   const [filters, setFilters] = useState<any>({})
+  const [resultId, setResultId] = useState<string | null>(null)
+  const [totalRows, setTotalRows] = useState(0)
   const [sortColumn, setSortColumn] = useState<string | null>(null)
   const [sortOrder, setSortOrder] = useState<'asc' | 'desc'>('asc')
   const [exportDialogOpen, setExportDialogOpen] = useState(false)
@@ -52,10 +57,30 @@ export default function Home() {
         throw new Error('Upload failed')
       }
 
-      const result = await response.json()
+      // Parsing runs as a background job; poll it until the data is ready
+      let job = await response.json()
+      while (job.stage !== 'ready') {
+        if (job.stage === 'failed') {
+          toast.dismiss(job.job_id)
+          throw new Error(job.error?.detail || 'Upload failed')
+        }
+        toast.loading(`Processing ${job.stage}… ${Math.round(job.progress * 100)}%`, { id: job.job_id })
+        await new Promise((resolve) => setTimeout(resolve, 500))
+        const status = await fetch(`${process.env.NEXT_PUBLIC_API_URL || '/api'}/jobs/${job.job_id}`)
+        if (!status.ok) {
+          throw new Error('Upload failed')
+        }
+        job = await status.json()
+      }
+      toast.dismiss(job.job_id)
+
+      const result = job.result
       
       setSessionId(result.session_id)
+      setResultId(null)
+      setSortColumn(null)
       setData(result.data)
+      setTotalRows(result.shape.rows)
       setColumns(result.columns)
       setFileInfo({
         filename: result.filename,
@@ -72,19 +97,40 @@ export default function Home() {
     }
   }, [])
 
+  // One page of the current view (filtered by resultId, sorted by column)
+  const fetchPage = useCallback(async (
+    page: number,
+    view: string | null,
+    column: string | null,
+    order: 'asc' | 'desc'
+  ) => {
+    const params = new URLSearchParams({
+      page: String(page),
+      page_size: String(PAGE_ROWS),
+      layout: 'columnar',
+    })
+    if (column) {
+      params.append('sort_column', column)
+      params.append('sort_order', order)
+    }
+    if (view) {
+      params.append('result_id', view)
+    }
+    const response = await fetch(
+      `${process.env.NEXT_PUBLIC_API_URL || '/api'}/data/${sessionId}?${params}`
+    )
+    if (!response.ok) throw new Error('Loading data failed')
+    return response.json()
+  }, [sessionId])
+
   const handleSort = useCallback(async (column: string, order: 'asc' | 'desc') => {
     if (!sessionId) return
 
     setLoading(true)
     try {
-      const response = await fetch(
-        `${process.env.NEXT_PUBLIC_API_URL || '/api'}/data/${sessionId}?sort_column=${column}&sort_order=${order}&page_size=1000`
-      )
-      
-      if (!response.ok) throw new Error('Sort failed')
-      
-      const result = await response.json()
+      const result = await fetchPage(0, resultId, column, order)
       setData(result.data)
+      setTotalRows(result.total_rows)
       setSortColumn(column)
       setSortOrder(order)
       toast.success('Data sorted!')
@@ -94,7 +140,28 @@ export default function Home() {
     } finally {
       setLoading(false)
     }
-  }, [sessionId])
+  }, [sessionId, resultId, fetchPage])
+
+  // Append the next page once the table pages past the loaded rows
+  const handleLoadMore = useCallback(async () => {
+    if (!sessionId) return
+
+    const loaded = Array.isArray(data) ? data : decodeColumnar(data)
+    const page = Math.floor(loaded.length / PAGE_ROWS)
+    setLoading(true)
+    try {
+      const result = await fetchPage(page, resultId, sortColumn, sortOrder)
+      setData(loaded.slice(0, page * PAGE_ROWS).concat(decodeColumnar(result.data)))
+      setTotalRows(result.total_rows)
+    } catch (error) {
+      console.error('Load error:', error)
+      toast.error('Failed to load more rows')
+      // Stop paging past the loaded rows instead of retrying
+      setTotalRows(loaded.length)
+    } finally {
+      setLoading(false)
+    }
+  }, [sessionId, data, resultId, sortColumn, sortOrder, fetchPage])
 
   const handleFilter = useCallback(async (newFilters: any) => {
     if (!sessionId) return
@@ -104,7 +171,7 @@ export default function Home() {
 
     try {
       const response = await fetch(
-        `${process.env.NEXT_PUBLIC_API_URL || '/api'}/filter/${sessionId}`,
+        `${process.env.NEXT_PUBLIC_API_URL || '/api'}/filter/${sessionId}?page_size=1000&layout=columnar`,
         {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
@@ -115,7 +182,10 @@ export default function Home() {
       if (!response.ok) throw new Error('Filter failed')
       
       const result = await response.json()
-      setData(result.data)
+      setResultId(result.result_id)
+      setTotalRows(result.filtered_rows)
+      // The filter returns its first page unsorted; keep the current sort
+      setData(sortColumn ? (await fetchPage(0, result.result_id, sortColumn, sortOrder)).data : result.data)
       toast.success(`Filtered: ${result.filtered_rows} of ${result.total_rows} rows`)
     } catch (error) {
       console.error('Filter error:', error)
@@ -123,7 +193,7 @@ export default function Home() {
     } finally {
       setLoading(false)
     }
-  }, [sessionId])
+  }, [sessionId, sortColumn, sortOrder, fetchPage])
 
   const handleExport = useCallback(async (format: string, selectedColumns?: string[]) => {
     if (!sessionId) return
@@ -332,6 +402,8 @@ export default function Home() {
                   columns={columns}
                   onSort={handleSort}
                   loading={loading}
+                  totalRows={totalRows}
+                  onLoadMore={handleLoadMore}
                 />
               </Box>
             </Paper>
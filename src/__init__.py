@@ -10,10 +10,12 @@ from .schema_compressor import SchemaCompressor
 from .history_compressor import HistoryCompressor
 from .eda_agent import EDAAgent
 from .scaledown_api import ScaleDownIntegration
+from .session_store import SessionStore
 
 __all__ = [
     "SchemaCompressor",
     "HistoryCompressor",
     "EDAAgent",
     "ScaleDownIntegration",
+    "SessionStore",
 ]
@@ -0,0 +1,147 @@
+"""
+Bitmap Index Module
+Per-column bitmap indexes for equality, membership and null filters on
+low-cardinality columns.
+
+Each distinct value of a column owns a bitset of the rows holding it, packed
+eight rows to a byte. An equality, 'in' or null predicate is the OR of the
+bitsets of the values it selects, and several such predicates combine with
+a bitwise AND before being unpacked into a row mask once.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Union
+
+from .session_store import SessionStore
+
+
+# Columns shorter than this are compared directly; the index would not pay off
+BITMAP_INDEX_MIN_ROWS = 10000
+
+# Columns with more distinct values than this are not bitmap indexed
+BITMAP_MAX_VALUES = 128
+
+# Operators that can be answered from a bitmap index
+BITMAP_OPERATORS = {'eq', 'ne', 'in', 'is_null', 'not_null'}
+
+
+class BitmapIndex:
+    """Packed bitsets, one per distinct value of a column plus one for missing values."""
+
+    def __init__(self, series: pd.Series, codes: np.ndarray, uniques):
+        """
+        Build the bitsets of a factorized column.
+
+        Args:
+            series: The indexed column
+            codes: Code of every row (-1 = missing), from `pd.factorize`
+            uniques: Distinct values, from `pd.factorize`
+        """
+        self.n_rows = len(series)
+
+        # Distinct values in the column's dtype, followed by one missing value
+        # when the column has any, so predicates evaluate on them exactly as on
+        # the column
+        missing = codes < 0
+        values = pd.Series(uniques)
+        if missing.any():
+            values = pd.concat([values, series.iloc[[int(np.argmax(missing))]]], ignore_index=True)
+        self.values = values
+
+        self.bitsets = [np.packbits(codes == code) for code in range(len(uniques))]
+        if missing.any():
+            self.bitsets.append(np.packbits(missing))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the bitsets."""
+        return int(sum(bitset.nbytes for bitset in self.bitsets))
+
+    def lookup(self, predicate) -> np.ndarray:
+        """
+        Resolve a predicate as a packed bitset.
+
+        The predicate is evaluated once per distinct value and the bitsets of
+        the selected values are ORed (or, when most values are selected, the
+        bitsets of the others, inverted).
+
+        Args:
+            predicate: A `filter_engine.Predicate` on the indexed column
+
+        Returns:
+            Packed bitset of the matching rows (see `np.packbits`)
+        """
+        matches = predicate.evaluate(pd.DataFrame({predicate.column: self.values}))
+
+        # Most values selected (e.g. 'ne'): OR the others and invert
+        invert = matches.sum() > len(matches) / 2
+        codes = np.flatnonzero(~matches if invert else matches)
+
+        result = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for code in codes:
+            np.bitwise_or(result, self.bitsets[code], out=result)
+        return np.invert(result, out=result) if invert else result
+
+
+def unpack_bitset(bitset: np.ndarray, n_rows: int) -> np.ndarray:
+    """Expand a packed bitset into a boolean row mask."""
+    return np.unpackbits(bitset, count=n_rows).view(bool)
+
+
+def build_bitmap_index(series: pd.Series, max_values: int = BITMAP_MAX_VALUES) -> Optional[BitmapIndex]:
+    """
+    Build the bitmap index of a column.
+
+    Args:
+        series: Column to index
+        max_values: Largest number of distinct values indexed
+
+    Returns:
+        The index, or None when the column has too many distinct values
+    """
+    try:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    except TypeError:
+        return None
+    if len(uniques) > max_values:
+        return None
+    return BitmapIndex(series, codes, uniques)
+
+
+def get_bitmap_index(
+    store: SessionStore,
+    session_id: str,
+    column: str,
+    df: Optional[pd.DataFrame] = None
+) -> Optional[BitmapIndex]:
+    """
+    Return the bitmap index of a session column, building it on first use.
+
+    The index is cached in the session store, counts against the memory
+    budget and is dropped when the data changes. High-cardinality columns
+    are remembered as not indexable.
+
+    Args:
+        store: Session store holding the session
+        session_id: Session identifier
+        column: Column to index
+        df: The session's DataFrame, if already fetched
+
+    Returns:
+        The column's BitmapIndex, or None when the column is not indexable
+    """
+    key = ('bitmap_index', column)
+    index: Union[BitmapIndex, bool, None] = store.cache_get(session_id, key)
+    if index is not None:
+        return index or None
+
+    version = store.version(session_id)
+    if df is None:
+        df = store[session_id]['dataframe']
+    index = build_bitmap_index(df[column])
+    if index is None:
+        store.cache_put(session_id, key, False, nbytes=0, version=version)
+        return None
+    store.cache_put(session_id, key, index, nbytes=index.nbytes, version=version)
+    return index
@@ -0,0 +1,158 @@
+"""
+Column Statistics Module
+Single-pass summary statistics for the statistics endpoint.
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional
+
+from .session_store import SessionStore
+
+
+def _finite_or_none(value: float) -> Optional[float]:
+    """Convert a statistic to a JSON-safe float (None for NaN/inf)."""
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def numeric_summary(series: pd.Series) -> Dict[str, Any]:
+    """
+    Summarise a numeric column like `Series.describe()`.
+
+    Quantiles, minimum and maximum come from a single percentile call over
+    the non-missing values.
+
+    Args:
+        series: Numeric column
+
+    Returns:
+        Dict with count, mean, std, min, 25%, 50%, 75% and max
+    """
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    values = values[~np.isnan(values)]
+    count = len(values)
+
+    if count == 0:
+        return {"count": 0.0, "mean": None, "std": None, "min": None,
+                "25%": None, "50%": None, "75%": None, "max": None}
+
+    q0, q25, q50, q75, q100 = np.percentile(values, [0, 25, 50, 75, 100])
+    return {
+        "count": float(count),
+        "mean": _finite_or_none(values.mean()),
+        "std": _finite_or_none(values.std(ddof=1)) if count > 1 else None,
+        "min": _finite_or_none(q0),
+        "25%": _finite_or_none(q25),
+        "50%": _finite_or_none(q50),
+        "75%": _finite_or_none(q75),
+        "max": _finite_or_none(q100),
+    }
+
+
+def categorical_summary(series: pd.Series) -> Dict[str, Any]:
+    """
+    Summarise a text or categorical column from a single `value_counts` pass.
+
+    Args:
+        series: Text or categorical column
+
+    Returns:
+        Dict with unique_values, top_value, top_frequency and the non-missing count
+    """
+    counts = series.value_counts(sort=False)
+    counts = counts[counts > 0]  # unused categories
+
+    if len(counts) == 0:
+        return {"unique_values": 0, "top_value": None, "top_frequency": 0, "count": 0}
+
+    frequencies = counts.to_numpy()
+    top_frequency = frequencies.max()
+    # Ties resolve to the smallest value, as with Series.mode()
+    tied = counts.index[frequencies == top_frequency]
+    try:
+        top_value = min(tied)
+    except TypeError:
+        top_value = tied[0]
+
+    return {
+        "unique_values": int(len(counts)),
+        "top_value": str(top_value),
+        "top_frequency": int(top_frequency),
+        "count": int(frequencies.sum())
+    }
+
+
+def compute_statistics(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Compute the statistics payload with one pass per column.
+
+    Args:
+        df: Input DataFrame
+
+    Returns:
+        Dict with numeric_statistics, categorical_statistics, missing_values,
+        total_rows and total_columns
+    """
+    n_rows = len(df)
+    numeric_stats = {}
+    categorical_stats = {}
+    missing_values = {}
+
+    for col in df.columns:
+        series = df[col]
+        dtype = series.dtype
+
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            summary = numeric_summary(series)
+            numeric_stats[col] = summary
+            missing_values[col] = n_rows - int(summary["count"])
+        elif pd.api.types.is_object_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype) \
+                or pd.api.types.is_string_dtype(dtype):
+            summary = categorical_summary(series)
+            missing_values[col] = n_rows - summary.pop("count")
+            categorical_stats[col] = summary
+        else:
+            missing_values[col] = int(series.isna().sum())
+
+    return {
+        "numeric_statistics": numeric_stats,
+        "categorical_statistics": categorical_stats,
+        "missing_values": missing_values,
+        "total_rows": n_rows,
+        "total_columns": len(df.columns)
+    }
+
+
+def get_statistics(
+    store: SessionStore,
+    session_id: str,
+    df: pd.DataFrame,
+    filters: Optional[Dict[str, Any]] = None,
+    rows: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
+    """
+    Return the statistics of a session (or of a filtered view of it), cached
+    per data version.
+
+    Args:
+        store: Session store holding the session
+        session_id: Session identifier
+        df: The session's DataFrame
+        filters: Filters defining the view (None = whole frame)
+        rows: Row positions of the filtered view
+
+    Returns:
+        Statistics payload (see `compute_statistics`)
+    """
+    key = ('statistics', json.dumps(filters, sort_keys=True, default=str) if filters else None)
+    statistics = store.cache_get(session_id, key)
+    if statistics is not None:
+        return statistics
+
+    version = store.version(session_id)
+    statistics = compute_statistics(df if rows is None else df.iloc[rows])
+    # Payload size is tiny next to the data; account a rough per-column cost
+    store.cache_put(session_id, key, statistics, nbytes=1024 * len(df.columns), version=version)
+    return statistics
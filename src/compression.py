@@ -0,0 +1,186 @@
+"""
+Compression Module
+ASGI middleware compressing text responses (JSON, CSV, NDJSON) with Brotli
+or gzip, negotiated from Accept-Encoding. Streamed bodies are compressed
+chunk by chunk.
+"""
+
+import zlib
+from typing import Any, Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Bodies smaller than this are sent uncompressed
+DEFAULT_MINIMUM_SIZE = 1024
+
+# Media types worth compressing; binary exports (Parquet, Arrow, XLSX, PDF)
+# are already compact or compressed
+COMPRESSIBLE_TYPES = {
+    'application/json',
+    'text/csv',
+    'application/x-ndjson',
+    'text/plain',
+}
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick a content encoding from an Accept-Encoding header.
+
+    Brotli is preferred when installed, then gzip; encodings with q=0 are
+    refused.
+
+    Args:
+        accept_encoding: Header value, e.g. 'gzip, deflate, br;q=0.9'
+
+    Returns:
+        'br', 'gzip' or None
+    """
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+
+    def quality(name: str) -> float:
+        return accepted.get(name, accepted.get('*', 0.0))
+
+    if brotli is not None and quality('br') > 0:
+        return 'br'
+    if quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+
+class _Compressor:
+    """Incremental Brotli or gzip compressor."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it, so streamed output reaches the client."""
+        if self.encoding == 'br':
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """Return the end of the compressed stream."""
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    Compress compressible responses for clients that accept it.
+
+    Responses that already have a Content-Encoding, that are not of a
+    compressible media type, or whose complete body is below `minimum_size`
+    pass through unchanged.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        gzip_level: int = 6,
+        brotli_quality: int = 4
+    ):
+        """
+        Initialize the CompressionMiddleware.
+
+        Args:
+            app: Wrapped ASGI application
+            minimum_size: Smallest body (in bytes) that is compressed
+            gzip_level: zlib compression level
+            brotli_quality: Brotli quality (0-11)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Dict[str, Any] = {}
+        compressor: List[Optional[_Compressor]] = [None]
+        state = {'decided': False, 'passthrough': False}
+
+        async def send_compressed(message: Message):
+            if message['type'] == 'http.response.start':
+                start.update(message)
+                headers = Headers(raw=message['headers'])
+                media_type = headers.get('content-type', '').split(';')[0].strip().lower()
+                state['passthrough'] = (
+                    'content-encoding' in headers
+                    or media_type not in COMPRESSIBLE_TYPES
+                    or message['status'] in (204, 304)
+                )
+                if state['passthrough']:
+                    state['decided'] = True
+                    await send(message)
+                return
+
+            if message['type'] != 'http.response.body' or state['passthrough']:
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+
+            if not state['decided']:
+                state['decided'] = True
+                if not more_body and len(body) < self.minimum_size:
+                    await send(start)
+                    await send(message)
+                    state['passthrough'] = True
+                    return
+
+                compressor[0] = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers = MutableHeaders(raw=start['headers'])
+                headers['Content-Encoding'] = encoding
+                headers.add_vary_header('Accept-Encoding')
+                if 'content-length' in headers:
+                    del headers['Content-Length']
+                if not more_body:
+                    # Whole body known: send it with its compressed length
+                    data = compressor[0].compress(body) + compressor[0].finish()
+                    headers['Content-Length'] = str(len(data))
+                    await send(start)
+                    await send({'type': 'http.response.body', 'body': data, 'more_body': False})
+                    return
+                await send(start)
+
+            data = compressor[0].compress(body) if body else b''
+            if not more_body:
+                data += compressor[0].finish()
+            if data or not more_body:
+                await send({'type': 'http.response.body', 'body': data, 'more_body': more_body})
+
+        await self.app(scope, receive, send_compressed)
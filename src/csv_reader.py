@@ -0,0 +1,199 @@
+"""
+CSV Reader Module
+Fast-path CSV ingestion: multithreaded PyArrow parsing, sample-based dtype pinning and chunked reads.
+"""
+
+import pandas as pd
+from typing import Dict, Any, Optional, Iterator, Union, IO
+
+try:
+    import pyarrow
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pyarrow = None
+    pa_csv = None
+
+
+ENGINES = ['auto', 'pyarrow', 'c', 'python']
+
+# Rows read to infer the dtypes pinned for the full read
+DEFAULT_SAMPLE_ROWS = 1000
+
+CsvSource = Union[str, IO]
+
+
+def resolve_engine(engine: str = 'auto') -> str:
+    """
+    Pick the parser engine to use.
+
+    Args:
+        engine: 'auto', 'pyarrow', 'c' or 'python'
+
+    Returns:
+        'pyarrow' for 'auto' when pyarrow is installed, otherwise the C engine
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown CSV engine: {engine}")
+    if engine == 'auto':
+        return 'pyarrow' if pyarrow is not None else 'c'
+    if engine == 'pyarrow' and pyarrow is None:
+        raise ImportError("The pyarrow CSV engine requires pyarrow. Install pyarrow.")
+    return engine
+
+
+def _arrow_convert_options(dtype: Optional[Dict[str, Any]] = None) -> "pa_csv.ConvertOptions":
+    """
+    Arrow conversion options matching the pandas C engine: empty fields are
+    missing values and dates are not parsed.
+    """
+    column_types = {
+        col: pyarrow.from_numpy_dtype(pd.api.types.pandas_dtype(col_dtype))
+        for col, col_dtype in (dtype or {}).items()
+    }
+    return pa_csv.ConvertOptions(
+        column_types=column_types,
+        strings_can_be_null=True,
+        timestamp_parsers=[]
+    )
+
+
+def _arrow_to_pandas(table: "pyarrow.Table") -> pd.DataFrame:
+    """Convert an Arrow table to pandas, keeping inferred dates as text like the C engine."""
+    for i, field in enumerate(table.schema):
+        if pyarrow.types.is_temporal(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pyarrow.string()))
+    return table.to_pandas()
+
+
+def _rewind(source: CsvSource):
+    """Move a file-like source back to its start so it can be read again."""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def infer_csv_dtypes(
+    source: CsvSource,
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    **read_kwargs
+) -> Dict[str, Any]:
+    """
+    Infer column dtypes from the first rows of a CSV.
+
+    Integer, float and boolean columns are pinned; text columns and columns
+    that may hold dates are left to the parser.
+
+    Args:
+        source: Path or file-like object
+        sample_rows: Number of rows to inspect
+        **read_kwargs: Extra arguments for `pd.read_csv`
+
+    Returns:
+        Mapping of column name to dtype
+    """
+    sample = pd.read_csv(source, nrows=sample_rows, **read_kwargs)
+    _rewind(source)
+
+    dtypes = {}
+    for col in sample.columns:
+        dtype = sample[col].dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            dtypes[col] = 'bool'
+        elif pd.api.types.is_integer_dtype(dtype):
+            dtypes[col] = 'int64'
+        elif pd.api.types.is_float_dtype(dtype):
+            dtypes[col] = 'float64'
+    return dtypes
+
+
+def read_csv_fast(
+    source: CsvSource,
+    engine: str = 'auto',
+    infer_dtypes: bool = False,
+    sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    **read_kwargs
+) -> pd.DataFrame:
+    """
+    Read a CSV file with the fastest available engine.
+
+    With `infer_dtypes`, dtypes are inferred on a sample and pinned for the
+    full read; if the pinned dtypes do not fit the rest of the file, the file
+    is re-read with full inference.
+
+    Args:
+        source: Path or file-like object
+        engine: 'auto', 'pyarrow', 'c' or 'python'
+        infer_dtypes: Infer dtypes on a sample and pin them for the full read
+        sample_rows: Number of rows used for dtype inference
+        **read_kwargs: Extra arguments for `pd.read_csv`
+
+    Returns:
+        Parsed DataFrame
+    """
+    engine = resolve_engine(engine)
+
+    # The Arrow reader is used directly (multithreaded) unless pandas-specific options are given
+    if engine == 'pyarrow' and not read_kwargs:
+        def read(dtype=None):
+            return _arrow_to_pandas(pa_csv.read_csv(source, convert_options=_arrow_convert_options(dtype)))
+    else:
+        if engine == 'c' and isinstance(source, str):
+            read_kwargs.setdefault('memory_map', True)
+
+        def read(dtype=None):
+            return pd.read_csv(source, engine=engine, dtype=dtype, **read_kwargs)
+
+    if infer_dtypes and 'dtype' not in read_kwargs:
+        sample_kwargs = {k: v for k, v in read_kwargs.items() if k != 'memory_map'}
+        dtypes = infer_csv_dtypes(source, sample_rows, **sample_kwargs)
+        try:
+            return read(dtypes)
+        except (ValueError, TypeError, OverflowError):
+            _rewind(source)
+
+    return read()
+
+
+def iter_csv_chunks(
+    source: CsvSource,
+    chunk_rows: int = 100000,
+    engine: str = 'auto',
+    dtype: Optional[Dict[str, Any]] = None,
+    **read_kwargs
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV file in chunks, for files that do not fit in memory.
+
+    The pyarrow engine uses Arrow's streaming reader (record batches decoded
+    in parallel); other engines use pandas' chunked reader.
+
+    Args:
+        source: Path or file-like object
+        chunk_rows: Approximate number of rows per chunk
+        engine: 'auto', 'pyarrow', 'c' or 'python'
+        dtype: Optional pinned dtypes (e.g. from `infer_csv_dtypes`)
+        **read_kwargs: Extra arguments for `pd.read_csv` (non-pyarrow engines)
+
+    Yields:
+        DataFrame chunks in file order
+    """
+    engine = resolve_engine(engine)
+
+    if engine == 'pyarrow' and not read_kwargs:
+        # Block size is chosen so that a block holds roughly chunk_rows rows of a narrow table
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(block_size=max(1 << 20, chunk_rows * 64)),
+            convert_options=_arrow_convert_options(dtype)
+        )
+        offset = 0
+        for batch in reader:
+            chunk = _arrow_to_pandas(pyarrow.Table.from_batches([batch]))
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+            offset += len(chunk)
+            yield chunk
+        return
+
+    if engine == 'pyarrow':
+        engine = 'c'
+    for chunk in pd.read_csv(source, engine=engine, chunksize=chunk_rows, dtype=dtype, **read_kwargs):
+        yield chunk
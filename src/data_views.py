@@ -0,0 +1,94 @@
+"""
+Data Views Module
+Resolves filtered, searched and sorted views of a session as row-position arrays.
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional, Sequence, Tuple
+
+from .session_store import SessionStore
+from .filter_engine import Predicate, build_filter_mask
+from .sorting import get_multi_sort_permutation, positions_dtype
+
+
+def build_search_mask(
+    df: pd.DataFrame,
+    search: str,
+    store: Optional[SessionStore] = None,
+    session_id: Optional[str] = None
+) -> np.ndarray:
+    """
+    Match rows where any column contains the search text (case-insensitive).
+
+    Args:
+        df: DataFrame to search
+        search: Text to look for
+        store: Optional session store holding the columns' text indexes
+        session_id: Session the DataFrame belongs to
+
+    Returns:
+        Boolean NumPy array with one entry per row
+    """
+    mask = np.zeros(len(df), dtype=bool)
+    for column in df.columns:
+        np.logical_or(mask, Predicate(column, 'contains', search).evaluate(df, store, session_id), out=mask)
+    return mask
+
+
+def resolve_view_rows(
+    store: SessionStore,
+    session_id: str,
+    df: pd.DataFrame,
+    filters: Optional[Dict[str, Any]] = None,
+    search: Optional[str] = None,
+    sort_keys: Optional[Sequence[Tuple[str, bool]]] = None
+) -> Optional[np.ndarray]:
+    """
+    Resolve the ordered row positions of a view over a session's DataFrame.
+
+    The result is cached in the session store, so paging through the same
+    view only slices the cached array.
+
+    Args:
+        store: Session store holding the session
+        session_id: Session identifier
+        df: The session's DataFrame
+        filters: Filters dict (see `filter_engine.compile_filters`)
+        search: Optional text that must appear in any column
+        sort_keys: (column, ascending) pairs to sort the view by, most
+            significant first
+
+    Returns:
+        Array of row positions in view order, or None when the view is the
+        whole frame in its natural order
+    """
+    sort_keys = tuple((column, bool(asc)) for column, asc in sort_keys or () if column in df.columns)
+
+    permutation = None
+    if sort_keys:
+        permutation = get_multi_sort_permutation(store, session_id, sort_keys, df=df)
+
+    if not filters and not search:
+        return permutation
+
+    key = ('view', json.dumps(filters, sort_keys=True, default=str), search, sort_keys)
+    rows = store.cache_get(session_id, key)
+    if rows is not None:
+        return rows
+
+    version = store.version(session_id)
+    mask = build_filter_mask(df, filters, store, session_id)
+    if search:
+        search_mask = build_search_mask(df, search, store, session_id)
+        mask = search_mask if mask is None else np.logical_and(mask, search_mask, out=mask)
+    if mask is None:
+        return permutation
+
+    if permutation is None:
+        rows = np.flatnonzero(mask).astype(positions_dtype(len(df)))
+    else:
+        rows = permutation[mask[permutation]]
+    store.cache_put(session_id, key, rows, version=version)
+    return rows
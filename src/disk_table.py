@@ -0,0 +1,856 @@
+"""
+Disk Table Module
+Out-of-core session data for datasets larger than memory.
+
+A dataset is converted once into an uncompressed Arrow IPC (Feather v2) file
+on local disk and memory-mapped, so only the pages a request touches are
+read. Every operation works one record batch at a time:
+
+- Pages are zero-copy slices of the mapped file
+- Filters and search evaluate the existing predicates batch by batch and
+  write the matching rows to a new file
+- Sorts are external merge sorts: sorted runs of bounded size are written
+  to disk and merged a block per run at a time
+- Statistics are merged from per-batch partial aggregates; quantiles come
+  from a bounded uniform sample and distinct counts from a KMV sketch
+- Exports stream the view batch by batch
+
+Filtered and sorted views are kept as files next to the data and reused by
+later requests over the same view.
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pc = None
+    pa_csv = None
+    pq = None
+
+from .filter_engine import build_filter_mask
+from .data_views import build_search_mask
+from .column_stats import _finite_or_none
+
+
+# Rows per record batch written to and streamed from disk tables
+DISK_BATCH_ROWS = 65536
+
+# Bytes of CSV parsed per block while converting an upload (the reader keeps a
+# few dozen blocks in flight, so this bounds its memory)
+CSV_BLOCK_BYTES = 1024 * 1024
+
+# Memory used by one in-memory sorted run (and by the merge buffers)
+SORT_RUN_BYTES = 256 * 1024 * 1024
+
+# Smallest block read per run while merging
+MIN_MERGE_BLOCK_ROWS = 1024
+
+# Filtered and sorted views kept on disk per dataset; the oldest are deleted first
+MAX_CACHED_VIEWS = 8
+
+# Statistics payloads kept per dataset (one per filtered view)
+MAX_CACHED_STATISTICS = 32
+
+# Values per column sampled for approximate quantiles
+QUANTILE_SAMPLE_SIZE = 100000
+
+# Smallest hashes kept per column for distinct counts (exact below this many values)
+DISTINCT_SKETCH_SIZE = 65536
+
+# Distinct values counted exactly per column before the least frequent are pruned
+MAX_TRACKED_VALUES = 100000
+
+# Internal column carrying original row positions through a sort
+_ROW_COLUMN = '__row'
+
+
+def _sort_keys(keys: Sequence[Tuple[str, bool]]) -> List[Tuple[str, str]]:
+    """Arrow sort keys for (column, ascending) pairs, with original position breaking ties."""
+    return [(column, 'ascending' if ascending else 'descending') for column, ascending in keys] + \
+        [(_ROW_COLUMN, 'ascending')]
+
+
+class DiskTable:
+    """Read-only, memory-mapped Arrow IPC file."""
+
+    def __init__(self, path: str):
+        """
+        Map an Arrow IPC file written by `write_table`.
+
+        Args:
+            path: Path of the file
+        """
+        self.path = path
+        self._source = pa.memory_map(path, 'r')
+        self.table = pa.ipc.open_file(self._source).read_all()
+
+    @property
+    def num_rows(self) -> int:
+        return self.table.num_rows
+
+    @property
+    def columns(self) -> pd.Index:
+        return pd.Index(self.table.column_names)
+
+    def frame(self, start: int = 0, end: Optional[int] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Read a range of rows as a DataFrame.
+
+        Args:
+            start: First row
+            end: End row (exclusive; None = end of the table)
+            columns: Columns to read (None = all columns)
+
+        Returns:
+            DataFrame of the rows; only their pages of the file are read
+        """
+        end = self.num_rows if end is None else min(end, self.num_rows)
+        table = self.table.slice(start, max(end - start, 0))
+        if columns is not None:
+            table = table.select(columns)
+        return table.to_pandas()
+
+    def iter_batches(
+        self,
+        columns: Optional[List[str]] = None,
+        batch_rows: int = DISK_BATCH_ROWS
+    ) -> Iterator["pa.RecordBatch"]:
+        """
+        Yield the table in record batches of at most `batch_rows` rows.
+
+        Args:
+            columns: Columns to read (None = all columns)
+            batch_rows: Rows per batch
+
+        Yields:
+            Record batches backed by the mapped file
+        """
+        table = self.table if columns is None else self.table.select(columns)
+        yield from table.to_batches(max_chunksize=batch_rows)
+
+    def iter_frames(
+        self,
+        columns: Optional[List[str]] = None,
+        batch_rows: int = DISK_BATCH_ROWS
+    ) -> Iterator[pd.DataFrame]:
+        """Yield the table as DataFrames of at most `batch_rows` rows."""
+        for batch in self.iter_batches(columns, batch_rows):
+            yield batch.to_pandas()
+
+    def close(self):
+        """Close the file; tables already read from it stay valid until they are released."""
+        self._source.close()
+
+
+def write_table(path: str, schema: "pa.Schema", batches: Iterator[Any]) -> DiskTable:
+    """
+    Write record batches (or tables) to an Arrow IPC file and map it.
+
+    The file is written under a temporary name and renamed once complete, so
+    a reader never maps a partial file.
+
+    Args:
+        path: Destination path
+        schema: Schema of the batches
+        batches: Record batches or tables to write
+
+    Returns:
+        The written DiskTable
+    """
+    partial = path + '.partial'
+    try:
+        with pa.OSFile(partial, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                if isinstance(batch, pa.Table):
+                    writer.write_table(batch, max_chunksize=DISK_BATCH_ROWS)
+                else:
+                    writer.write_batch(batch)
+        os.replace(partial, path)
+    except BaseException:
+        _remove_file(partial)
+        raise
+    return DiskTable(path)
+
+
+def _csv_reader(source: Any, column_types: Dict[str, Any]) -> "pa_csv.CSVStreamingReader":
+    return pa_csv.open_csv(
+        source,
+        read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types,
+            strings_can_be_null=True,
+            timestamp_parsers=[]
+        )
+    )
+
+
+def _csv_schema(csv_path: str, column_types: Dict[str, Any]) -> "pa.Schema":
+    """Schema inferred from the first block of a CSV file."""
+    with pa.OSFile(csv_path, 'rb') as source:
+        return _csv_reader(source, column_types).schema
+
+
+def csv_to_table(
+    csv_path: str,
+    path: str,
+    progress: Optional[Callable[[int, int], None]] = None
+) -> DiskTable:
+    """
+    Convert a CSV file to a disk table one block at a time.
+
+    Column types are inferred from the first block, with dates and times
+    kept as text like `csv_reader.read_csv_fast`. When a later block does
+    not fit them, the conversion restarts with integer columns widened to
+    float, then with every column read as text.
+
+    Args:
+        csv_path: CSV file to convert
+        path: Destination Arrow IPC file
+        progress: Called with (bytes parsed, rows written) after every batch
+
+    Returns:
+        The converted DiskTable
+    """
+    text_types = {
+        field.name: pa.string() for field in _csv_schema(csv_path, {}) if pa.types.is_temporal(field.type)
+    }
+    column_types = dict(text_types)
+    for attempt in range(3):
+        try:
+            with pa.OSFile(csv_path, 'rb') as source:
+                reader = _csv_reader(source, column_types)
+                rows = 0
+
+                def batches():
+                    nonlocal rows
+                    for batch in reader:
+                        rows += batch.num_rows
+                        if progress is not None:
+                            progress(source.tell(), rows)
+                        yield batch
+
+                return write_table(path, reader.schema, batches())
+        except pa.ArrowInvalid:
+            if attempt == 2:
+                raise
+            schema = _csv_schema(csv_path, column_types)
+            if attempt == 0:
+                column_types = dict(text_types)
+                column_types.update({field.name: pa.float64() for field in schema if pa.types.is_integer(field.type)})
+            else:
+                column_types = {field.name: pa.string() for field in schema}
+
+
+def filter_table(
+    table: DiskTable,
+    path: str,
+    filters: Optional[Dict[str, Any]] = None,
+    search: Optional[str] = None
+) -> DiskTable:
+    """
+    Write the rows of a table matching filters and search to a new table.
+
+    Each batch is evaluated with `filter_engine.build_filter_mask` and
+    `data_views.build_search_mask`, reading only the filtered columns when
+    there is no search.
+
+    Args:
+        table: Source table
+        path: Destination Arrow IPC file
+        filters: Filters dict (see `filter_engine.compile_filters`)
+        search: Optional text that must appear in any column
+
+    Returns:
+        DiskTable with the matching rows in their original order
+    """
+    used = None if search else [col for col in table.table.column_names if col in (filters or {})]
+
+    def batches():
+        for batch in table.iter_batches():
+            frame = batch.to_pandas() if used is None else batch.select(used).to_pandas()
+            mask = build_filter_mask(frame, filters)
+            if search:
+                search_mask = build_search_mask(frame, search)
+                mask = search_mask if mask is None else mask & search_mask
+            yield batch if mask is None else batch.filter(pa.array(mask))
+
+    return write_table(path, table.table.schema, batches())
+
+
+def sort_table(
+    table: DiskTable,
+    path: str,
+    keys: Sequence[Tuple[str, bool]],
+    run_bytes: int = SORT_RUN_BYTES
+) -> DiskTable:
+    """
+    Sort a table by several columns with an external merge sort.
+
+    The table is cut into runs of about `run_bytes`, each sorted in memory
+    and written to disk, then the runs are merged. Ties keep their original
+    order and missing values sort last, as with a stable
+    `DataFrame.sort_values`.
+
+    Args:
+        table: Source table
+        path: Destination Arrow IPC file
+        keys: (column, ascending) pairs, most significant first
+        run_bytes: Memory used by one sorted run
+
+    Returns:
+        The sorted DiskTable
+    """
+    n_rows = table.num_rows
+    row_bytes = max(table.table.nbytes // max(n_rows, 1), 1)
+    run_rows = max(run_bytes // row_bytes, MIN_MERGE_BLOCK_ROWS)
+    sort_keys = _sort_keys(keys)
+    schema = table.table.schema
+
+    if n_rows <= run_rows:
+        data = table.table.append_column(_ROW_COLUMN, pa.array(np.arange(n_rows)))
+        order = pc.sort_indices(data, sort_keys=sort_keys)
+        return write_table(path, schema, [table.table.take(order)])
+
+    run_paths = []
+    try:
+        for start in range(0, n_rows, run_rows):
+            data = table.table.slice(start, run_rows)
+            data = data.append_column(_ROW_COLUMN, pa.array(np.arange(start, start + data.num_rows)))
+            run = data.take(pc.sort_indices(data, sort_keys=sort_keys))
+            run_paths.append(f"{path}.run{len(run_paths)}")
+            write_table(run_paths[-1], run.schema, [run]).close()
+            del data, run
+
+        runs = [DiskTable(run_path) for run_path in run_paths]
+        block_rows = max(run_rows // len(runs), MIN_MERGE_BLOCK_ROWS)
+        try:
+            return write_table(path, schema, _merge_runs(runs, sort_keys, block_rows))
+        finally:
+            for run in runs:
+                run.close()
+    finally:
+        for run_path in run_paths:
+            _remove_file(run_path)
+
+
+def _merge_runs(runs: List[DiskTable], sort_keys: List[Tuple[str, str]], block_rows: int) -> Iterator["pa.Table"]:
+    """
+    K-way merge of sorted runs, holding one buffered block per run in memory.
+
+    Rows are totally ordered (the original position breaks ties). The lowest
+    last row among the blocks of runs with unread rows bounds what can be
+    emitted: every unread row sorts after it. Each step emits the buffered
+    rows up to that bound (a prefix of each block, found from the run heads
+    and the block alone) and refills a run's block only once it is used up,
+    so every row is read and sorted a bounded number of times.
+    """
+    blocks = [run.table.slice(0, block_rows) for run in runs]
+    read = [block.num_rows for block in blocks]
+    while True:
+        for i, run in enumerate(runs):
+            if blocks[i].num_rows == 0 and read[i] < run.num_rows:
+                blocks[i] = run.table.slice(read[i], block_rows)
+                read[i] += blocks[i].num_rows
+        active = [i for i, block in enumerate(blocks) if block.num_rows]
+        if not active:
+            return
+
+        open_runs = [i for i in active if read[i] < runs[i].num_rows]
+        if open_runs:
+            lasts = pa.concat_tables([blocks[i].slice(blocks[i].num_rows - 1, 1) for i in open_runs])
+            bound = lasts.slice(pc.sort_indices(lasts, sort_keys=sort_keys)[0].as_py(), 1)
+            # Only runs whose head is within the bound have rows to emit
+            heads = pa.concat_tables([blocks[i].slice(0, 1) for i in active])
+            emitting = [active[j] for j in np.flatnonzero(_rows_at_most(heads, bound, sort_keys))]
+        else:
+            bound, emitting = None, active
+
+        parts = []
+        for i in emitting:
+            count = blocks[i].num_rows if bound is None else \
+                int(_rows_at_most(blocks[i], bound, sort_keys).sum())
+            parts.append(blocks[i].slice(0, count))
+            blocks[i] = blocks[i].slice(count)
+        merged = pa.concat_tables(parts)
+        yield merged.take(pc.sort_indices(merged, sort_keys=sort_keys)).drop_columns([_ROW_COLUMN])
+
+
+def _key_classes(values: "pa.ChunkedArray") -> np.ndarray:
+    """Sort class of each value: 0 for values, 1 for NaN, 2 for null (both last in either direction)."""
+    classes = np.zeros(len(values), dtype=np.int8)
+    if pa.types.is_floating(values.type):
+        classes[pc.fill_null(pc.is_nan(values), False).to_numpy(zero_copy_only=False)] = 1
+    if values.null_count:
+        classes[pc.is_null(values).to_numpy(zero_copy_only=False)] = 2
+    return classes
+
+
+def _rows_at_most(table: "pa.Table", bound: "pa.Table", sort_keys: List[Tuple[str, str]]) -> np.ndarray:
+    """Mask of the rows of a table that sort at or before a one-row bound, as `pc.sort_indices` orders them."""
+    before = np.zeros(table.num_rows, dtype=bool)
+    equal = np.ones(table.num_rows, dtype=bool)
+    for column, order in sort_keys:
+        values, limit = table.column(column), bound.column(column)
+        classes, limit_class = _key_classes(values), _key_classes(limit)[0]
+        column_before = classes < limit_class
+        column_equal = classes == limit_class
+        if limit_class == 0:
+            compare = pc.less if order == 'ascending' else pc.greater
+            column_before |= pc.fill_null(compare(values, limit[0]), False).to_numpy(zero_copy_only=False) & \
+                (classes == 0)
+            column_equal &= pc.fill_null(pc.equal(values, limit[0]), False).to_numpy(zero_copy_only=False)
+        before |= equal & column_before
+        equal &= column_equal
+    return before | equal
+
+
+class _NumericAggregate:
+    """Mergeable count, mean, variance, min, max and bounded sample of a numeric column."""
+
+    def __init__(self, rng: np.random.Generator):
+        self.rng = rng
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        # Uniform sample: the values with the smallest random keys seen so far
+        self.sample = np.empty(0)
+        self.sample_keys = np.empty(0)
+
+    def add(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        n = len(values)
+        if n == 0:
+            return
+        mean = values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        delta = mean - self.mean
+        total = self.count + n
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        sample = np.concatenate([self.sample, values])
+        keys = np.concatenate([self.sample_keys, self.rng.random(n)])
+        if len(sample) > QUANTILE_SAMPLE_SIZE:
+            keep = np.argpartition(keys, QUANTILE_SAMPLE_SIZE)[:QUANTILE_SAMPLE_SIZE]
+            sample, keys = sample[keep], keys[keep]
+        self.sample, self.sample_keys = sample, keys
+
+    def summary(self) -> Dict[str, Any]:
+        """Summary in the shape of `column_stats.numeric_summary`."""
+        if self.count == 0:
+            return {"count": 0.0, "mean": None, "std": None, "min": None,
+                    "25%": None, "50%": None, "75%": None, "max": None}
+        q25, q50, q75 = np.percentile(self.sample, [25, 50, 75])
+        return {
+            "count": float(self.count),
+            "mean": _finite_or_none(self.mean),
+            "std": _finite_or_none(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else None,
+            "min": _finite_or_none(self.min),
+            "25%": _finite_or_none(q25),
+            "50%": _finite_or_none(q50),
+            "75%": _finite_or_none(q75),
+            "max": _finite_or_none(self.max),
+        }
+
+
+class _CategoricalAggregate:
+    """Mergeable value counts (pruned when too many) and a KMV distinct-count sketch."""
+
+    def __init__(self):
+        self.count = 0
+        self.counts = pd.Series(dtype=np.int64)
+        self.hashes = np.empty(0, dtype=np.uint64)
+
+    def add(self, series: pd.Series):
+        counts = series.value_counts(sort=False)
+        counts = counts[counts > 0]
+        if len(counts) == 0:
+            return
+        self.count += int(counts.sum())
+        counts.index = counts.index.astype(object)
+        self.counts = counts if len(self.counts) == 0 else self.counts.add(counts, fill_value=0)
+        if len(self.counts) > MAX_TRACKED_VALUES:
+            self.counts = self.counts.nlargest(MAX_TRACKED_VALUES // 2)
+
+        hashes = pd.util.hash_array(counts.index.to_numpy(dtype=object))
+        self.hashes = np.unique(np.concatenate([self.hashes, hashes]))[:DISTINCT_SKETCH_SIZE]
+
+    def summary(self) -> Dict[str, Any]:
+        """Summary in the shape of `column_stats.categorical_summary` (without the count)."""
+        if self.count == 0:
+            return {"unique_values": 0, "top_value": None, "top_frequency": 0}
+        if len(self.hashes) < DISTINCT_SKETCH_SIZE:
+            unique_values = len(self.hashes)
+        else:
+            # k-th smallest of uniformly spread hashes estimates the distinct count
+            unique_values = int((DISTINCT_SKETCH_SIZE - 1) * 2.0 ** 64 / float(self.hashes[-1]))
+        frequencies = self.counts.to_numpy()
+        top_frequency = frequencies.max()
+        # Ties resolve to the smallest value, as in `column_stats.categorical_summary`
+        tied = self.counts.index[frequencies == top_frequency]
+        try:
+            top_value = min(tied)
+        except TypeError:
+            top_value = tied[0]
+        return {"unique_values": unique_values, "top_value": str(top_value), "top_frequency": int(top_frequency)}
+
+
+def table_statistics(table: DiskTable) -> Dict[str, Any]:
+    """
+    Compute the statistics payload of a table one batch at a time.
+
+    The payload matches `column_stats.compute_statistics`. Counts, means,
+    deviations, extremes and missing values are exact. Quantiles come from a
+    uniform sample of QUANTILE_SAMPLE_SIZE values per column and distinct
+    counts above DISTINCT_SKETCH_SIZE are estimated. Top values are exact
+    while a column has at most MAX_TRACKED_VALUES distinct values.
+
+    Args:
+        table: Table to summarise
+
+    Returns:
+        Dict with numeric_statistics, categorical_statistics, missing_values,
+        total_rows and total_columns
+    """
+    rng = np.random.default_rng(0)
+    numeric, categorical, missing = {}, {}, {}
+    for field in table.table.schema:
+        kind = field.type
+        if pa.types.is_integer(kind) or pa.types.is_floating(kind):
+            numeric[field.name] = _NumericAggregate(rng)
+        elif pa.types.is_string(kind) or pa.types.is_large_string(kind) or pa.types.is_dictionary(kind):
+            categorical[field.name] = _CategoricalAggregate()
+        missing[field.name] = 0
+
+    for batch in table.iter_batches():
+        for name in batch.schema.names:
+            column = batch.column(name)
+            if name in numeric:
+                numeric[name].add(pc.cast(column, pa.float64()).to_numpy(zero_copy_only=False))
+            elif name in categorical:
+                categorical[name].add(column.to_pandas())
+            else:
+                missing[name] += column.null_count
+
+    n_rows = table.num_rows
+    for name, aggregate in list(numeric.items()) + list(categorical.items()):
+        missing[name] = n_rows - aggregate.count
+    return {
+        "numeric_statistics": {name: aggregate.summary() for name, aggregate in numeric.items()},
+        "categorical_statistics": {name: aggregate.summary() for name, aggregate in categorical.items()},
+        "missing_values": missing,
+        "total_rows": n_rows,
+        "total_columns": table.table.num_columns
+    }
+
+
+class DiskResult:
+    """A window of a disk view selected by a QueryPlan."""
+
+    def __init__(self, table: DiskTable, start: int, end: Optional[int], columns: Optional[List[str]]):
+        """
+        Initialize a DiskResult.
+
+        Args:
+            table: The filtered and sorted view
+            start: First row of the window
+            end: End row of the window (exclusive; None = end of the view)
+            columns: Selected columns (None = all columns)
+        """
+        self.table = table
+        self.start = start
+        self.end = table.num_rows if end is None else min(end, table.num_rows)
+        self.columns = columns
+        self.total_rows = table.num_rows
+
+    def frame(self) -> pd.DataFrame:
+        """Read the window's rows of the selected columns."""
+        return self.table.frame(self.start, self.end, self.columns)
+
+    def iter_batches(self, batch_rows: int = DISK_BATCH_ROWS) -> Iterator["pa.RecordBatch"]:
+        """Yield the window as record batches of the selected columns."""
+        table = self.table.table.slice(self.start, max(self.end - self.start, 0))
+        if self.columns is not None:
+            table = table.select(self.columns)
+        yield from table.to_batches(max_chunksize=batch_rows)
+
+    def iter_frames(self, batch_rows: int = DISK_BATCH_ROWS) -> Iterator[pd.DataFrame]:
+        """Yield the window as DataFrames of at most `batch_rows` rows."""
+        for batch in self.iter_batches(batch_rows):
+            yield batch.to_pandas()
+
+
+class DiskDataset:
+    """
+    Session data held on disk: the converted table, its cached views and statistics.
+
+    Views are written on first use and the MAX_CACHED_VIEWS most recently
+    used are kept; the dataset's directory is deleted on `close`. The lock
+    only guards the caches: views and statistics are built outside it, and
+    concurrent requests for the same one wait for the first build instead
+    of repeating it.
+    """
+
+    def __init__(self, table: DiskTable, directory: str, sort_run_bytes: int = SORT_RUN_BYTES):
+        """
+        Initialize a DiskDataset.
+
+        Args:
+            table: The converted session data
+            directory: Directory holding the table and its views
+            sort_run_bytes: Memory used by one sorted run of an external sort
+        """
+        self.table = table
+        self.directory = directory
+        self.sort_run_bytes = sort_run_bytes
+        self._views: "OrderedDict[str, DiskTable]" = OrderedDict()
+        self._statistics: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._building: Dict[Tuple[int, str], threading.Event] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_csv(
+        cls,
+        csv_path: str,
+        base_dir: Optional[str] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+        sort_run_bytes: int = SORT_RUN_BYTES
+    ) -> "DiskDataset":
+        """
+        Convert a CSV file into a new dataset directory.
+
+        Args:
+            csv_path: CSV file to convert
+            base_dir: Directory under which the dataset is created (system temp dir by default)
+            progress: Called with (bytes parsed, rows written) after every batch
+            sort_run_bytes: Memory used by one sorted run of an external sort
+
+        Returns:
+            The new DiskDataset
+        """
+        if base_dir is not None:
+            os.makedirs(base_dir, exist_ok=True)
+        directory = tempfile.mkdtemp(prefix="easydata-disk-", dir=base_dir)
+        try:
+            table = csv_to_table(csv_path, os.path.join(directory, 'data.arrow'), progress)
+        except BaseException:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+        return cls(table, directory, sort_run_bytes)
+
+    @property
+    def num_rows(self) -> int:
+        return self.table.num_rows
+
+    @property
+    def columns(self) -> pd.Index:
+        return self.table.columns
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.table.num_rows, len(self.table.columns)
+
+    def sample(self, n_rows: int) -> pd.DataFrame:
+        """First `n_rows` rows as a DataFrame (for profiling and previews)."""
+        return self.table.frame(0, n_rows)
+
+    def view(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None,
+        sort_keys: Sequence[Tuple[str, bool]] = ()
+    ) -> DiskTable:
+        """
+        Return the table of a filtered, searched and sorted view, building it on first use.
+
+        The filtered view is built first and cached on its own, so re-sorting
+        a filtered view does not re-filter it.
+
+        Args:
+            filters: Filters dict (see `filter_engine.compile_filters`)
+            search: Optional text that must appear in any column
+            sort_keys: (column, ascending) pairs, most significant first
+
+        Returns:
+            DiskTable holding the view's rows in order
+        """
+        sort_keys = [(column, bool(asc)) for column, asc in sort_keys if column in self.columns]
+        if not filters and not search and not sort_keys:
+            return self.table
+
+        key = json.dumps([filters, search, sort_keys], sort_keys=True, default=str)
+        path = self._view_path(key)
+        if not sort_keys:
+            return self._cached(self._views, MAX_CACHED_VIEWS, key,
+                                lambda: filter_table(self.table, path, filters, search))
+
+        def build():
+            # The filtered view is cached on its own, so re-sorting it does not re-filter
+            source = self.view(filters, search) if filters or search else self.table
+            return sort_table(source, path, sort_keys, self.sort_run_bytes)
+
+        return self._cached(self._views, MAX_CACHED_VIEWS, key, build)
+
+    def _view_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"view-{hashlib.sha1(key.encode()).hexdigest()}.arrow")
+
+    def _cached(self, cache: "OrderedDict[str, Any]", limit: int, key: str, build: Callable[[], Any]) -> Any:
+        """
+        Return a cached value, building it outside the lock on a miss.
+
+        A build in progress for the same key is waited for rather than
+        repeated; if it fails, the next waiter builds instead. Views evicted
+        beyond `limit` are closed and their files deleted (readers that
+        already hold one keep a valid mapping).
+        """
+        building = (id(cache), key)
+        while True:
+            with self._lock:
+                value = cache.get(key)
+                if value is not None:
+                    cache.move_to_end(key)
+                    return value
+                pending = self._building.get(building)
+                if pending is None:
+                    pending = self._building[building] = threading.Event()
+                    break
+            pending.wait()
+
+        try:
+            value = build()
+            with self._lock:
+                cache[key] = value
+                while len(cache) > limit:
+                    _, evicted = cache.popitem(last=False)
+                    if isinstance(evicted, DiskTable):
+                        evicted.close()
+                        _remove_file(evicted.path)
+            return value
+        finally:
+            with self._lock:
+                del self._building[building]
+            pending.set()
+
+    def execute(self, plan) -> DiskResult:
+        """
+        Run a `query_plan.QueryPlan` against the dataset.
+
+        Args:
+            plan: QueryPlan to run
+
+        Returns:
+            DiskResult for the plan's window of the view
+        """
+        plan = plan.optimize(self)
+        view = self.view(plan.filters, plan.search, plan.sort_keys)
+        end = None if plan.limit is None else plan.offset + plan.limit
+        return DiskResult(view, plan.offset, end, plan.columns)
+
+    def statistics(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Return the statistics of the dataset (or of a filtered view), computed once.
+
+        Args:
+            filters: Filters defining the view (None = whole dataset)
+
+        Returns:
+            Statistics payload (see `table_statistics`)
+        """
+        key = json.dumps(filters, sort_keys=True, default=str)
+        return self._cached(self._statistics, MAX_CACHED_STATISTICS, key,
+                            lambda: table_statistics(self.view(filters) if filters else self.table))
+
+    def close(self):
+        """Close the dataset's mappings and delete its files."""
+        with self._lock:
+            views = list(self._views.values())
+            self._views.clear()
+            self._statistics.clear()
+        for view in views:
+            view.close()
+        self.table.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def iter_table_export(result: DiskResult, format: str) -> Iterator[bytes]:
+    """
+    Stream a disk view in an export format one batch at a time.
+
+    Args:
+        result: Window of the view to export
+        format: 'csv', 'ndjson', 'json', 'arrow' or 'parquet'
+
+    Yields:
+        Encoded blocks of the export
+    """
+    if format in ('arrow', 'parquet'):
+        schema = result.table.table.schema
+        if result.columns is not None:
+            schema = pa.schema([schema.field(col) for col in result.columns])
+        sink = io.BytesIO()
+        writer = pa.ipc.new_stream(sink, schema) if format == 'arrow' else pq.ParquetWriter(sink, schema)
+        with writer:
+            for batch in result.iter_batches():
+                writer.write_batch(batch)
+                yield _drain(sink)
+        yield _drain(sink)
+        return
+
+    if format == 'csv':
+        header = result.table.frame(0, 0, result.columns)
+        yield header.to_csv(index=False).encode()
+        for frame in result.iter_frames():
+            yield frame.to_csv(index=False, header=False).encode()
+    elif format == 'ndjson':
+        for frame in result.iter_frames():
+            text = frame.to_json(orient='records', lines=True)
+            yield (text if text.endswith('\n') else text + '\n').encode() if text else b''
+    elif format == 'json':
+        # One JSON array, written as the concatenation of each block's records
+        yield b'['
+        first = True
+        for frame in result.iter_frames():
+            if len(frame):
+                records = frame.to_json(orient='records')[1:-1]
+                yield (records if first else ',' + records).encode()
+                first = False
+        yield b']'
+    else:
+        raise ValueError(f"Unsupported streamed format: {format}")
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    """Return everything written to the sink so far and empty it."""
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
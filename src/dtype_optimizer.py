@@ -0,0 +1,119 @@
+"""
+Dtype Optimizer Module
+Compacts DataFrame memory by converting columns to the smallest safe dtypes.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Tuple
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def arrow_string_dtype():
+    """Arrow-backed string dtype that uses NaN for missing values, like object columns."""
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        return 'string[pyarrow_numpy]'
+
+
+class DtypeOptimizer:
+    """
+    Reduces the memory footprint of a DataFrame:
+    - Low-cardinality text columns become `category`
+    - Integers are downcast to the smallest width that holds their range
+    - Floats are downcast to float32 when no value changes
+    - Remaining text columns move to the Arrow-backed string dtype
+    """
+
+    def __init__(self, max_category_ratio: float = 0.5, use_arrow_strings: bool = True):
+        """
+        Initialize the DtypeOptimizer.
+
+        Args:
+            max_category_ratio: Maximum unique/total ratio for a text column to become categorical
+            use_arrow_strings: Convert remaining text columns to Arrow-backed strings (needs pyarrow)
+        """
+        self.max_category_ratio = max_category_ratio
+        self.use_arrow_strings = use_arrow_strings and pyarrow is not None
+
+    def optimize(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Convert the columns of a DataFrame to compact dtypes.
+
+        Args:
+            df: Input pandas DataFrame (left unchanged)
+
+        Returns:
+            Tuple of the optimized DataFrame and a report with the memory
+            before/after and the dtype changes per column
+        """
+        memory_before = df.memory_usage(deep=True).sum()
+        optimized = []
+        changes = {}
+
+        for i in range(df.shape[1]):
+            series = df.iloc[:, i]
+            converted = self._optimize_column(series)
+            optimized.append(converted)
+            if converted.dtype != series.dtype:
+                changes[str(df.columns[i])] = {"from": str(series.dtype), "to": str(converted.dtype)}
+
+        result = pd.concat(optimized, axis=1) if optimized else df.copy()
+        result.columns = df.columns
+        memory_after = result.memory_usage(deep=True).sum()
+
+        report = {
+            "memory_before_mb": float(memory_before) / (1024 * 1024),
+            "memory_after_mb": float(memory_after) / (1024 * 1024),
+            "reduction_ratio": float(memory_before / memory_after) if memory_after > 0 else 0.0,
+            "columns": changes
+        }
+        return result, report
+
+    def _optimize_column(self, series: pd.Series) -> pd.Series:
+        """Return the column converted to its most compact safe dtype."""
+        dtype = series.dtype
+
+        if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+            return series
+
+        if pd.api.types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype):
+            return pd.to_numeric(series, downcast='integer')
+
+        if pd.api.types.is_float_dtype(dtype) and isinstance(dtype, np.dtype):
+            return self._downcast_float(series)
+
+        if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            return self._optimize_text(series)
+
+        return series
+
+    @staticmethod
+    def _downcast_float(series: pd.Series) -> pd.Series:
+        """Downcast to float32 only if every value survives the round trip."""
+        if series.dtype == np.float32:
+            return series
+        values = series.to_numpy()
+        downcast = values.astype(np.float32)
+        if np.array_equal(downcast.astype(values.dtype), values, equal_nan=True):
+            return pd.Series(downcast, index=series.index, name=series.name)
+        return series
+
+    def _optimize_text(self, series: pd.Series) -> pd.Series:
+        """Convert text columns to categorical or Arrow-backed strings."""
+        # Mixed-type object columns are left alone so values keep their type
+        if pd.api.types.infer_dtype(series, skipna=True) not in ['string', 'empty']:
+            return series
+
+        n_rows = len(series)
+        if n_rows > 0 and series.nunique() / n_rows <= self.max_category_ratio:
+            return series.astype('category')
+
+        if self.use_arrow_strings and pd.api.types.is_object_dtype(series.dtype):
+            return series.astype(arrow_string_dtype())
+        return series
@@ -0,0 +1,203 @@
+"""
+Excel Reader Module
+Streaming Excel ingestion: cheap sheet listing and row iteration in openpyxl's
+read-only mode, building the frame column-wise in typed chunks.
+"""
+
+import pandas as pd
+from typing import Dict, Any, List, Optional, Iterator, Union, IO
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+
+# Rows converted to a typed DataFrame chunk at a time
+DEFAULT_CHUNK_ROWS = 50000
+
+ExcelSource = Union[str, IO]
+
+
+def _is_legacy_xls(source: ExcelSource) -> bool:
+    """Whether the source is a legacy .xls workbook, which openpyxl cannot read."""
+    if isinstance(source, str):
+        return source.lower().endswith('.xls')
+    position = source.tell()
+    signature = source.read(8)
+    source.seek(position)
+    return signature == b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'  # OLE2 compound document
+
+
+def _open_workbook(source: ExcelSource):
+    """Open a workbook in read-only mode (rows are streamed from the sheet XML)."""
+    if openpyxl is None:
+        raise ImportError("Excel processing requires openpyxl. Install openpyxl.")
+    return openpyxl.load_workbook(source, read_only=True, data_only=True)
+
+
+def list_sheets(source: ExcelSource) -> List[Dict[str, Any]]:
+    """
+    List the sheets of a workbook without reading their rows.
+
+    Row and column counts come from each sheet's declared dimensions and are
+    None when the workbook does not record them.
+
+    Args:
+        source: Path or file-like object
+
+    Returns:
+        List of {'name', 'rows', 'columns'} dicts in workbook order
+    """
+    if _is_legacy_xls(source):
+        return [{'name': name, 'rows': None, 'columns': None} for name in pd.ExcelFile(source).sheet_names]
+
+    workbook = _open_workbook(source)
+    try:
+        return [
+            {'name': ws.title, 'rows': ws.max_row, 'columns': ws.max_column}
+            for ws in workbook.worksheets
+        ]
+    finally:
+        workbook.close()
+
+
+def _convert_cell(value: Any) -> Any:
+    """Convert a cell value like pandas' openpyxl reader (whole floats become ints)."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _column_names(header: List[Any], width: int) -> List[Any]:
+    """Header values with pandas' names for blank ('Unnamed: i') and duplicate ('a.1') cells."""
+    names, seen = [], {}
+    for i in range(width):
+        name = header[i] if i < len(header) and header[i] is not None else f"Unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _parse_numeric_text(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Parse text columns that hold only numbers, the way read_excel does.
+
+    This runs once over the whole sheet: parsing chunk by chunk would turn a
+    column that is numeric in one chunk and text in another into a mix of
+    numbers and strings.
+    """
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        if column.dtype == object or pd.api.types.is_string_dtype(column.dtype):
+            try:
+                df.isetitem(i, pd.to_numeric(column))
+            except (ValueError, TypeError):
+                pass
+    return df
+
+
+def _build_chunk(rows: List[tuple], names: List[Any], start: int) -> pd.DataFrame:
+    """Transpose buffered rows into columns typed from their cell values."""
+    width = len(names)
+    columns = [[] for _ in range(width)]
+    for row in rows:
+        for i in range(width):
+            columns[i].append(_convert_cell(row[i]) if i < len(row) else None)
+
+    chunk = pd.DataFrame({i: pd.Series(values) for i, values in enumerate(columns)})
+    chunk.columns = names
+    chunk.index = pd.RangeIndex(start, start + len(chunk))
+    return chunk
+
+
+def iter_excel_chunks(
+    source: ExcelSource,
+    sheet_name: Optional[str] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    """
+    Read one sheet of a workbook in chunks, streaming its rows.
+
+    The first non-blank row is the header. Blank rows are skipped and trailing
+    empty cells are ignored, as in `pd.read_excel`. Only the selected sheet
+    is parsed. Numeric text stays text in the chunks; `read_excel_fast`
+    parses it once over the whole sheet.
+
+    Args:
+        source: Path or file-like object
+        sheet_name: Sheet to read (None = the first sheet)
+        chunk_rows: Rows per yielded chunk
+
+    Yields:
+        DataFrame chunks in row order with a continuous RangeIndex
+    """
+    if _is_legacy_xls(source):
+        yield pd.read_excel(source, sheet_name=sheet_name or 0)
+        return
+
+    workbook = _open_workbook(source)
+    try:
+        if sheet_name is None:
+            worksheet = workbook.worksheets[0]
+        elif sheet_name in workbook.sheetnames:
+            worksheet = workbook[sheet_name]
+        else:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+
+        header = None
+        names: List[Any] = []
+        buffer: List[tuple] = []
+        offset = 0
+
+        for row in worksheet.iter_rows(values_only=True):
+            # Trim trailing empty cells; skip blank rows
+            width = len(row)
+            while width and row[width - 1] is None:
+                width -= 1
+            if width == 0:
+                continue
+
+            if header is None:
+                header = list(row[:width])
+                names = _column_names(header, width)
+                continue
+
+            if width > len(names):
+                names = _column_names(header, width)
+            buffer.append(row[:width])
+
+            if len(buffer) >= chunk_rows:
+                yield _build_chunk(buffer, names, offset)
+                offset += len(buffer)
+                buffer = []
+
+        if buffer or offset == 0:
+            yield _build_chunk(buffer, names, offset)
+    finally:
+        workbook.close()
+
+
+def read_excel_fast(
+    source: ExcelSource,
+    sheet_name: Optional[str] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> pd.DataFrame:
+    """
+    Read one sheet of a workbook without loading the workbook DOM.
+
+    Args:
+        source: Path or file-like object
+        sheet_name: Sheet to read (None = the first sheet)
+        chunk_rows: Rows converted per typed chunk
+
+    Returns:
+        DataFrame of the sheet
+    """
+    chunks = list(iter_excel_chunks(source, sheet_name, chunk_rows))
+    df = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+    return _parse_numeric_text(df)
@@ -0,0 +1,154 @@
+"""
+Executor Module
+Runs CPU-heavy work off the asyncio event loop with concurrency limits and timeouts.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+
+class TaskExecutor:
+    """
+    Offloads blocking work from async request handlers:
+    - A thread pool for pandas/NumPy work, which mostly releases the GIL
+    - A process pool for GIL-bound parsing and document rendering
+    - Per-pool concurrency limits; excess tasks wait for a free slot
+    - A per-task timeout covering both the wait and the run
+
+    A task that times out while waiting for a slot never runs. One that times
+    out while running is not interrupted (threads and pool processes cannot
+    be stopped safely): its worker stays busy until the function returns.
+
+    With no process workers, process tasks run on the thread pool instead.
+    """
+
+    def __init__(
+        self,
+        thread_workers: Optional[int] = None,
+        process_workers: int = 0,
+        timeout_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the TaskExecutor.
+
+        Args:
+            thread_workers: Size of the thread pool (default: CPU count + 4, max 32)
+            process_workers: Size of the process pool (0 = no process pool)
+            timeout_seconds: Default timeout per task (None = no timeout)
+        """
+        self.thread_workers = thread_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.process_workers = process_workers
+        self.timeout_seconds = timeout_seconds
+
+        self._thread_pool = ThreadPoolExecutor(
+            max_workers=self.thread_workers, thread_name_prefix="easydata-worker"
+        )
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._thread_slots: Optional[asyncio.Semaphore] = None
+        self._process_slots: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_env(cls) -> "TaskExecutor":
+        """
+        Create an executor configured from environment variables:
+        EXECUTOR_THREADS, EXECUTOR_PROCESSES and EXECUTOR_TIMEOUT_SECONDS.
+        """
+        threads = os.environ.get("EXECUTOR_THREADS")
+        processes = os.environ.get("EXECUTOR_PROCESSES")
+        timeout = os.environ.get("EXECUTOR_TIMEOUT_SECONDS", "300")
+        return cls(
+            thread_workers=int(threads) if threads else None,
+            process_workers=int(processes) if processes else min(4, os.cpu_count() or 1),
+            timeout_seconds=float(timeout) if timeout else None
+        )
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use (spawned, so workers never inherit locks)."""
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._process_pool
+
+    def start(self):
+        """Spawn the process workers ahead of the first task, so it does not pay their start-up."""
+        if self.process_workers:
+            pool = self._get_process_pool()
+            for _ in range(self.process_workers):
+                pool.submit(os.getpid)
+
+    async def _submit(self, pool, slots: asyncio.Semaphore, fn: Callable, timeout: Optional[float]) -> Any:
+        """Wait for a free slot, run `fn` on the pool and enforce the timeout."""
+        async def run():
+            async with slots:
+                return await asyncio.get_running_loop().run_in_executor(pool, fn)
+
+        timeout = self.timeout_seconds if timeout is None else timeout
+        return await asyncio.wait_for(run(), timeout)
+
+    async def run_in_thread(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run a blocking function on the thread pool.
+
+        Args:
+            fn: Function to call
+            *args: Positional arguments for `fn`
+            timeout: Timeout in seconds (defaults to the executor's timeout)
+            **kwargs: Keyword arguments for `fn`
+
+        Returns:
+            The function's return value
+
+        Raises:
+            asyncio.TimeoutError: If the task does not finish in time
+        """
+        if self._thread_slots is None:
+            self._thread_slots = asyncio.Semaphore(self.thread_workers)
+        return await self._submit(
+            self._thread_pool, self._thread_slots, functools.partial(fn, *args, **kwargs), timeout
+        )
+
+    async def run_in_process(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run a picklable function in the process pool.
+
+        Falls back to the thread pool when no process workers are configured.
+
+        Args:
+            fn: Module-level function to call
+            *args: Picklable positional arguments for `fn`
+            timeout: Timeout in seconds (defaults to the executor's timeout)
+            **kwargs: Picklable keyword arguments for `fn`
+
+        Returns:
+            The function's return value
+
+        Raises:
+            asyncio.TimeoutError: If the task does not finish in time
+        """
+        if not self.process_workers:
+            return await self.run_in_thread(fn, *args, timeout=timeout, **kwargs)
+
+        if self._process_slots is None:
+            self._process_slots = asyncio.Semaphore(self.process_workers)
+        try:
+            return await self._submit(
+                self._get_process_pool(), self._process_slots, functools.partial(fn, *args, **kwargs), timeout
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool for later tasks
+            self._process_pool = None
+            raise
+
+    def shutdown(self):
+        """Stop both pools without waiting for queued tasks."""
+        self._thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
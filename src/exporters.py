@@ -0,0 +1,243 @@
+"""
+Exporters Module
+Chunked, streaming serialisation of DataFrame views for file exports.
+"""
+
+import io
+import numpy as np
+import pandas as pd
+from typing import Any, Iterator, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+# Rows serialised per streamed block
+DEFAULT_CHUNK_ROWS = 10000
+
+# Rows per Arrow record batch / Parquet row group
+ARROW_CHUNK_ROWS = 65536
+
+# pandas.api.types.infer_dtype results for object columns Arrow cannot type
+MIXED_INFERRED_TYPES = {'mixed', 'mixed-integer'}
+
+
+def _column_positions(df: pd.DataFrame, columns: Optional[List[str]]) -> List[int]:
+    """Positions of the selected columns (all of them for None), duplicate names included."""
+    if columns is None:
+        return list(range(df.shape[1]))
+    return list(df.columns.get_indexer_for(columns))
+
+
+def iter_view_chunks(
+    df: pd.DataFrame,
+    rows: Optional[np.ndarray] = None,
+    columns: Optional[List[str]] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a view of a DataFrame in row blocks.
+
+    Only one block is materialised at a time, so memory stays flat no matter
+    how large the view is.
+
+    Args:
+        df: Source DataFrame
+        rows: Row positions of the view in order (None = all rows)
+        columns: Columns to include (None = all columns)
+        chunk_rows: Number of rows per block
+
+    Yields:
+        DataFrame blocks of at most `chunk_rows` rows
+    """
+    col_positions = slice(None) if columns is None else _column_positions(df, columns)
+    n_rows = len(df) if rows is None else len(rows)
+
+    for start in range(0, n_rows, chunk_rows):
+        end = start + chunk_rows
+        positions = slice(start, end) if rows is None else rows[start:end]
+        yield df.iloc[positions, col_positions]
+
+
+def iter_csv(
+    df: pd.DataFrame,
+    rows: Optional[np.ndarray] = None,
+    columns: Optional[List[str]] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[bytes]:
+    """
+    Stream a DataFrame view as CSV.
+
+    The header is yielded on its own first, so the client receives bytes
+    before any data block has been serialised.
+
+    Args:
+        df: Source DataFrame
+        rows: Row positions of the view in order (None = all rows)
+        columns: Columns to include (None = all columns)
+        chunk_rows: Number of rows per block
+
+    Yields:
+        UTF-8 encoded CSV blocks
+    """
+    header = df.iloc[:0, _column_positions(df, columns)]
+    yield header.to_csv(index=False).encode()
+
+    for chunk in iter_view_chunks(df, rows, columns, chunk_rows):
+        yield chunk.to_csv(index=False, header=False).encode()
+
+
+def iter_ndjson(
+    df: pd.DataFrame,
+    rows: Optional[np.ndarray] = None,
+    columns: Optional[List[str]] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[bytes]:
+    """
+    Stream a DataFrame view as newline-delimited JSON (one object per row).
+
+    Args:
+        df: Source DataFrame
+        rows: Row positions of the view in order (None = all rows)
+        columns: Columns to include (None = all columns)
+        chunk_rows: Number of rows per block
+
+    Yields:
+        UTF-8 encoded NDJSON blocks
+    """
+    for chunk in iter_view_chunks(df, rows, columns, chunk_rows):
+        text = chunk.to_json(orient='records', lines=True)
+        if text and not text.endswith('\n'):
+            text += '\n'
+        yield text.encode()
+
+
+def _field_names(names: List[Any]) -> List[str]:
+    """Field names for the exported columns; repeated names get a '.1', '.2' suffix as in read_csv."""
+    fields, seen = [], {}
+    for name in map(str, names):
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        fields.append(name)
+    return fields
+
+
+def _arrow_type(column: pd.Series) -> "pa.DataType":
+    """
+    Arrow type of a whole column.
+
+    Object columns are typed from all their values, so a block that starts
+    with nulls or with one kind of value still fits the later blocks; those
+    mixing incompatible values (numbers and strings) are exported as text.
+    """
+    if column.dtype != object:
+        return pa.Schema.from_pandas(column.iloc[:0].to_frame(), preserve_index=False).field(0).type
+    if pd.api.types.infer_dtype(column, skipna=True) in MIXED_INFERRED_TYPES:
+        return pa.string()
+    return pa.infer_type(column, from_pandas=True)
+
+
+def _arrow_array(column: pd.Series, arrow_type: "pa.DataType") -> "pa.Array":
+    """Convert one block of a column to the column's Arrow type."""
+    if pa.types.is_string(arrow_type) and column.dtype == object:
+        column = column.where(column.isna(), column.astype(str))
+    return pa.array(column, type=arrow_type, from_pandas=True)
+
+
+def _iter_record_batches(
+    df: pd.DataFrame,
+    rows: Optional[np.ndarray],
+    columns: Optional[List[str]],
+    chunk_rows: int
+) -> Iterator[Any]:
+    """
+    Convert a DataFrame view to Arrow record batches one block at a time.
+
+    Yields the schema first, then one record batch per block. The schema is
+    built from the whole columns before any block is converted, so a
+    conversion error surfaces before the first byte is streamed. Columns
+    are selected by position, so duplicate names are exported too. Numeric
+    columns are handed to Arrow without copying their buffers.
+    """
+    positions = _column_positions(df, columns)
+    names = _field_names([df.columns[i] for i in positions])
+    schema = pa.schema([
+        pa.field(name, _arrow_type(df.iloc[:, i]))
+        for name, i in zip(names, positions)
+    ])
+    yield schema
+
+    for chunk in iter_view_chunks(df, rows, columns, chunk_rows):
+        arrays = [_arrow_array(chunk.iloc[:, j], field.type) for j, field in enumerate(schema)]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    """Return everything written to the sink so far and empty it."""
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
+
+
+def iter_arrow_ipc(
+    df: pd.DataFrame,
+    rows: Optional[np.ndarray] = None,
+    columns: Optional[List[str]] = None,
+    chunk_rows: int = ARROW_CHUNK_ROWS
+) -> Iterator[bytes]:
+    """
+    Stream a DataFrame view in the Arrow IPC streaming format.
+
+    Args:
+        df: Source DataFrame
+        rows: Row positions of the view in order (None = all rows)
+        columns: Columns to include (None = all columns)
+        chunk_rows: Number of rows per record batch
+
+    Yields:
+        Arrow IPC stream bytes, one record batch at a time
+    """
+    batches = _iter_record_batches(df, rows, columns, chunk_rows)
+    sink = io.BytesIO()
+
+    with pa.ipc.new_stream(sink, next(batches)) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            yield _drain(sink)
+    yield _drain(sink)
+
+
+def iter_parquet(
+    df: pd.DataFrame,
+    rows: Optional[np.ndarray] = None,
+    columns: Optional[List[str]] = None,
+    chunk_rows: int = ARROW_CHUNK_ROWS
+) -> Iterator[bytes]:
+    """
+    Stream a DataFrame view as a Parquet file, one row group per block.
+
+    Args:
+        df: Source DataFrame
+        rows: Row positions of the view in order (None = all rows)
+        columns: Columns to include (None = all columns)
+        chunk_rows: Number of rows per row group
+
+    Yields:
+        Parquet file bytes; the footer is part of the last block
+    """
+    batches = _iter_record_batches(df, rows, columns, chunk_rows)
+    sink = io.BytesIO()
+
+    with pq.ParquetWriter(sink, next(batches)) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            yield _drain(sink)
+    yield _drain(sink)
@@ -0,0 +1,250 @@
+"""
+Filter Engine Module
+Compiles API filter specifications into a single vectorised boolean mask.
+"""
+
+import json
+import operator as op
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional
+
+from .session_store import SessionStore
+from .text_index import TEXT_INDEX_MIN_ROWS, get_text_index
+from .bitmap_index import BITMAP_INDEX_MIN_ROWS, BITMAP_OPERATORS, get_bitmap_index, unpack_bitset
+from .range_index import RANGE_INDEX_MIN_ROWS, RANGE_OPERATORS, get_range_index, is_range_indexable
+
+
+# Comparison operators supported by the filter API
+COMPARISONS = {
+    'eq': op.eq,
+    'ne': op.ne,
+    'gt': op.gt,
+    'lt': op.lt,
+    'gte': op.ge,
+    'lte': op.le,
+}
+
+# Operators without a value: missing / present values
+NULL_CHECKS = {'is_null', 'not_null'}
+
+OPERATORS = set(COMPARISONS) | {'contains', 'in'} | NULL_CHECKS
+
+
+def coerce_filter_value(series: pd.Series, value: Any) -> Any:
+    """
+    Convert a filter value to the type of the column it is compared with.
+
+    Args:
+        series: Column being filtered
+        value: Raw value from the request
+
+    Returns:
+        Converted value, or the original value if it cannot be converted
+    """
+    col_dtype = series.dtype
+    try:
+        if pd.api.types.is_bool_dtype(col_dtype):
+            return str(value).lower() in ['true', '1', 'yes']
+        if pd.api.types.is_numeric_dtype(col_dtype):
+            return pd.to_numeric(value)
+    except (ValueError, TypeError):
+        pass  # Keep as string
+    return value
+
+
+class Predicate:
+    """A single compiled filter condition on one column."""
+
+    def __init__(self, column: str, operator: str, value: Any):
+        """
+        Initialize a predicate.
+
+        Args:
+            column: Column to filter on
+            operator: One of OPERATORS
+            value: Raw value from the request
+        """
+        self.column = column
+        self.operator = operator
+        self.value = value
+
+    @property
+    def key(self) -> tuple:
+        """Hashable identity of the predicate, used for mask memoisation."""
+        return ('mask', self.column, self.operator, json.dumps(self.value, sort_keys=True, default=str))
+
+    def evaluate(
+        self,
+        df: pd.DataFrame,
+        store: Optional[SessionStore] = None,
+        session_id: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Evaluate the predicate over a DataFrame.
+
+        When a session store is given, 'contains' on large columns goes
+        through the column's cached trigram index, and selective range
+        predicates on large numeric or datetime columns through its range index.
+
+        Args:
+            df: DataFrame containing the column
+            store: Optional session store holding column indexes
+            session_id: Session the DataFrame belongs to
+
+        Returns:
+            Boolean NumPy array with one entry per row
+        """
+        series = df[self.column]
+
+        if self.operator in NULL_CHECKS:
+            missing = series.isna().to_numpy(dtype=bool)
+            return missing if self.operator == 'is_null' else ~missing
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return self._evaluate_categorical(series)
+
+        if self.operator == 'contains':
+            if store is not None and session_id is not None and len(series) >= TEXT_INDEX_MIN_ROWS:
+                return get_text_index(store, session_id, self.column, df).contains(str(self.value))
+            matches = series.astype(str).str.contains(str(self.value), case=False, na=False)
+            return matches.to_numpy(dtype=bool)
+
+        if self.operator == 'in':
+            values = self.value if isinstance(self.value, (list, tuple)) else [self.value]
+            return series.isin([coerce_filter_value(series, value) for value in values]).to_numpy(dtype=bool)
+
+        value = coerce_filter_value(series, self.value)
+        compare = COMPARISONS[self.operator]
+
+        if (self.operator in RANGE_OPERATORS and store is not None and session_id is not None
+                and len(series) >= RANGE_INDEX_MIN_ROWS and is_range_indexable(series)):
+            mask = get_range_index(store, session_id, self.column, df).lookup(self.operator, value)
+            if mask is not None:
+                return mask
+
+        # Plain NumPy columns compare directly on the underlying array
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biuf':
+            return np.asarray(compare(series.to_numpy(), value), dtype=bool)
+
+        return compare(series, value).to_numpy(dtype=bool, na_value=False)
+
+    def _evaluate_categorical(self, series: pd.Series) -> np.ndarray:
+        """
+        Evaluate the predicate once per category and broadcast it through the codes.
+
+        Missing values are evaluated exactly as in a non-categorical column.
+        """
+        categories = pd.Series(series.cat.categories)
+        category_mask = np.array(Predicate(self.column, self.operator, self.value).evaluate(
+            pd.DataFrame({self.column: pd.concat([categories, pd.Series([np.nan])], ignore_index=True)})
+        ))
+        if self.operator in COMPARISONS:
+            category_mask[-1] = self.operator == 'ne'
+        # Code -1 (missing) selects the last entry
+        return category_mask[series.cat.codes.to_numpy()]
+
+
+def compile_filters(df: pd.DataFrame, filters: Optional[Dict[str, Any]]) -> List[Predicate]:
+    """
+    Compile a filters dict into predicates.
+
+    Filters on unknown columns or with unknown operators are ignored.
+
+    Args:
+        df: DataFrame the filters apply to
+        filters: {'column': {'operator': 'eq|ne|gt|lt|gte|lte|contains|in|is_null|not_null',
+            'value': ...}, ...}; 'in' takes a list of values, the null checks none
+
+    Returns:
+        List of predicates
+    """
+    predicates = []
+    for column, filter_config in (filters or {}).items():
+        if column not in df.columns:
+            continue
+
+        operator = filter_config.get('operator', 'eq')
+        if operator not in OPERATORS:
+            continue
+
+        predicates.append(Predicate(column, operator, filter_config.get('value')))
+    return predicates
+
+
+def build_filter_mask(
+    df: pd.DataFrame,
+    filters: Optional[Dict[str, Any]],
+    store: Optional[SessionStore] = None,
+    session_id: Optional[str] = None
+) -> Optional[np.ndarray]:
+    """
+    Combine all filters into one boolean mask.
+
+    When a session store is given, equality, 'in' and null predicates on
+    low-cardinality columns are answered from bitmap indexes and combined as
+    packed bitsets. The mask of every other predicate is memoised in the
+    session cache, so changing one filter of a set only recomputes that
+    filter's mask.
+
+    Args:
+        df: DataFrame to filter
+        filters: Filters dict (see `compile_filters`)
+        store: Optional session store used for memoisation
+        session_id: Session the DataFrame belongs to
+
+    Returns:
+        Boolean NumPy array, or None when no filter applies
+    """
+    predicates = compile_filters(df, filters)
+    if not predicates:
+        return None
+
+    use_cache = store is not None and session_id is not None
+    version = store.version(session_id) if use_cache else None
+
+    mask, bitset = None, None
+    for predicate in predicates:
+        if use_cache and predicate.operator in BITMAP_OPERATORS and len(df) >= BITMAP_INDEX_MIN_ROWS:
+            index = get_bitmap_index(store, session_id, predicate.column, df)
+            if index is not None:
+                selected = index.lookup(predicate)
+                bitset = selected if bitset is None else np.bitwise_and(bitset, selected, out=bitset)
+                continue
+
+        predicate_mask = store.cache_get(session_id, predicate.key) if use_cache else None
+        if predicate_mask is None:
+            predicate_mask = predicate.evaluate(df, store, session_id)
+            if use_cache:
+                store.cache_put(session_id, predicate.key, predicate_mask, version=version)
+
+        mask = predicate_mask.copy() if mask is None else np.logical_and(mask, predicate_mask, out=mask)
+
+    if bitset is not None:
+        bitmap_mask = unpack_bitset(bitset, len(df))
+        mask = bitmap_mask if mask is None else np.logical_and(mask, bitmap_mask, out=mask)
+    return mask
+
+
+def apply_filters(
+    df: pd.DataFrame,
+    filters: Optional[Dict[str, Any]],
+    store: Optional[SessionStore] = None,
+    session_id: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Filter a DataFrame in a single boolean-indexing step.
+
+    Args:
+        df: DataFrame to filter
+        filters: Filters dict (see `compile_filters`)
+        store: Optional session store used for mask memoisation
+        session_id: Session the DataFrame belongs to
+
+    Returns:
+        Filtered DataFrame (the input itself when no filter applies)
+    """
+    mask = build_filter_mask(df, filters, store, session_id)
+    if mask is None:
+        return df
+    return df[mask]
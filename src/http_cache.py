@@ -0,0 +1,68 @@
+"""
+HTTP Cache Module
+ETags for responses derived from session data, and conditional GET handling.
+"""
+
+import hashlib
+from typing import Any, Iterable, Optional, Tuple
+
+from fastapi import Response
+
+
+# Clients may store responses but must revalidate them (with If-None-Match)
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(session_id: str, version: int, params: Iterable[Tuple[str, Any]]) -> str:
+    """
+    Build a weak ETag for a response computed from a session's data.
+
+    The tag changes whenever the data version or any query parameter changes.
+    Parameters are ordered by name with a stable sort, so the values of a
+    repeated parameter (e.g. multi-column `sort_column`) keep their order.
+    It is weak because the encoded bytes may differ, e.g. when compressed.
+
+    Args:
+        session_id: Session identifier
+        version: Data version of the session
+        params: Query parameters as (name, value) pairs
+
+    Returns:
+        ETag header value
+    """
+    pairs = sorted(((str(k), str(v)) for k, v in params), key=lambda pair: pair[0])
+    key = repr((session_id, version, pairs))
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison).
+
+    Args:
+        if_none_match: Header value ('*' or a comma-separated list of tags)
+        etag: Current ETag
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith('W/') else tag
+
+    return any(opaque(tag) == opaque(etag) for tag in if_none_match.split(','))
+
+
+def not_modified(etag: str) -> Response:
+    """Build a 304 Not Modified response for an ETag."""
+    return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': CACHE_CONTROL})
+
+
+def cache_headers(etag: str) -> dict:
+    """Headers for a response carrying an ETag."""
+    return {'ETag': etag, 'Cache-Control': CACHE_CONTROL}
@@ -0,0 +1,121 @@
+"""
+Ingest Jobs Module
+Tracks background upload ingestion: stage, bytes parsed and rows produced.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+# Job stages in order; a job ends in 'ready' or 'failed'
+STAGES = ['queued', 'parsing', 'optimizing', 'profiling', 'ready', 'failed']
+
+
+class IngestJob:
+    """Progress of one background ingestion."""
+
+    def __init__(self, filename: str, bytes_total: int, session_id: str):
+        """
+        Initialize an IngestJob.
+
+        Args:
+            filename: Name of the uploaded file
+            bytes_total: Size of the uploaded file
+            session_id: Session the data is loaded into
+        """
+        self.job_id = uuid.uuid4().hex
+        self.filename = filename
+        self.session_id = session_id
+        self.stage = 'queued'
+        self.bytes_total = bytes_total
+        self.bytes_parsed = 0
+        self.rows = 0
+        self.session_ready = False
+        self.error: Optional[Dict[str, Any]] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.task = None  # asyncio task running the job
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished, successfully or not."""
+        return self.stage in ('ready', 'failed')
+
+    def update(self, **fields):
+        """Set progress fields and record the update time."""
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.updated_at = time.time()
+
+    def fail(self, status_code: int, detail: str):
+        """Mark the job as failed with an HTTP-style error."""
+        self.update(stage='failed', error={'status_code': status_code, 'detail': detail})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable job status."""
+        return {
+            'job_id': self.job_id,
+            'session_id': self.session_id,
+            'filename': self.filename,
+            'stage': self.stage,
+            'bytes_total': self.bytes_total,
+            'bytes_parsed': self.bytes_parsed,
+            'progress': min(self.bytes_parsed / self.bytes_total, 1.0) if self.bytes_total else 0.0,
+            'rows': self.rows,
+            'session_ready': self.session_ready,
+            'error': self.error,
+            'result': self.result,
+            'elapsed_seconds': round(self.updated_at - self.created_at, 3)
+        }
+
+
+class JobRegistry:
+    """
+    Bounded registry of ingest jobs.
+
+    Once `max_jobs` is exceeded, the oldest finished jobs are dropped.
+    """
+
+    def __init__(self, max_jobs: int = 256):
+        """
+        Initialize the JobRegistry.
+
+        Args:
+            max_jobs: Number of jobs kept
+        """
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, filename: str, bytes_total: int, session_id: str) -> IngestJob:
+        """
+        Register a new job.
+
+        Args:
+            filename: Name of the uploaded file
+            bytes_total: Size of the uploaded file
+            session_id: Session the data is loaded into
+
+        Returns:
+            The new job
+        """
+        job = IngestJob(filename, bytes_total, session_id)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            finished = [job_id for job_id, other in self._jobs.items() if other.done]
+            while len(self._jobs) > self.max_jobs and finished:
+                del self._jobs[finished.pop(0)]
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        """Return a job, or None if it is unknown or was dropped."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
@@ -0,0 +1,223 @@
+"""
+PDF Tables Module
+Page-range table extraction with a per-page disk cache, so large PDFs can be
+split across worker processes and retried without redoing finished pages.
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from typing import List, Optional, Tuple, Union
+
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+
+
+# Pages extracted by one worker task
+DEFAULT_PAGES_PER_TASK = 8
+
+# Tables of one page: a list of tables, each a list of rows of cell strings
+PageTables = List[List[List[Optional[str]]]]
+
+
+class PageTableCache:
+    """
+    Disk cache of the tables extracted from each page of a document.
+
+    Entries are keyed by a hash of the document content, so re-uploading the
+    same file hits the cache. Every page is stored as its own JSON file as
+    soon as it is extracted. Only the most recently used documents are kept.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_documents: int = 64):
+        """
+        Initialize the PageTableCache.
+
+        Args:
+            cache_dir: Cache directory (a directory under the system temp dir by default)
+            max_documents: Number of documents kept before the oldest are pruned
+        """
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "easydata-pdf-pages")
+        self.max_documents = max_documents
+
+    @staticmethod
+    def document_key(source: Union[str, bytes]) -> str:
+        """
+        Hash the content of a document.
+
+        Args:
+            source: File path or raw bytes
+
+        Returns:
+            Hex digest identifying the document
+        """
+        digest = hashlib.sha256()
+        if isinstance(source, bytes):
+            digest.update(source)
+        else:
+            with open(source, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+        return digest.hexdigest()
+
+    def _page_path(self, document_key: str, page: int) -> str:
+        return os.path.join(self.cache_dir, document_key, f"{page}.json")
+
+    def get(self, document_key: str, page: int) -> Optional[PageTables]:
+        """Return the cached tables of a page, or None if the page was not extracted yet."""
+        try:
+            with open(self._page_path(document_key, page), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, document_key: str, page: int, tables: PageTables):
+        """Store the tables of a page (written atomically, so readers never see partial files)."""
+        directory = os.path.join(self.cache_dir, document_key)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(tables, f)
+        os.replace(tmp_path, self._page_path(document_key, page))
+
+    def touch(self, document_key: str):
+        """Mark a document as recently used and prune the least recently used ones."""
+        directory = os.path.join(self.cache_dir, document_key)
+        os.makedirs(directory, exist_ok=True)
+        os.utime(directory)
+
+        # The touched document is always kept, even when mtimes tie
+        others = sorted(
+            (entry for entry in os.scandir(self.cache_dir) if entry.is_dir() and entry.name != document_key),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True
+        )
+        for entry in others[max(self.max_documents - 1, 0):]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def _open(source: Union[str, bytes]):
+    return pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+
+def count_pages(source: Union[str, bytes]) -> int:
+    """
+    Count the pages of a PDF.
+
+    Args:
+        source: File path or raw bytes
+
+    Returns:
+        Number of pages
+    """
+    with _open(source) as pdf:
+        return len(pdf.pages)
+
+
+def page_ranges(n_pages: int, pages_per_task: int = DEFAULT_PAGES_PER_TASK) -> List[Tuple[int, int]]:
+    """
+    Split the pages of a document into [start, end) ranges.
+
+    Args:
+        n_pages: Number of pages
+        pages_per_task: Maximum pages per range
+
+    Returns:
+        List of (start, end) page ranges in page order
+    """
+    pages_per_task = max(1, pages_per_task)
+    return [(start, min(start + pages_per_task, n_pages)) for start in range(0, n_pages, pages_per_task)]
+
+
+def extract_page_range(
+    source: Union[str, bytes],
+    start: int,
+    end: int,
+    cache_dir: Optional[str] = None,
+    document_key: Optional[str] = None
+) -> List[PageTables]:
+    """
+    Extract the tables of pages [start, end).
+
+    This is a module-level function so it can run in a process pool. Pages
+    found in the cache are not extracted again, and each extracted page is
+    cached straight away.
+
+    Args:
+        source: File path or raw bytes of the PDF
+        start: First page (0-based)
+        end: Page after the last one
+        cache_dir: Page cache directory (None = no caching)
+        document_key: Content hash of the document (computed when missing)
+
+    Returns:
+        One entry per page, each a list of tables
+    """
+    cache = PageTableCache(cache_dir) if cache_dir else None
+    if cache is not None and document_key is None:
+        document_key = PageTableCache.document_key(source)
+
+    results: List[Optional[PageTables]] = [
+        cache.get(document_key, page) if cache is not None else None
+        for page in range(start, end)
+    ]
+    if all(tables is not None for tables in results):
+        return results
+
+    with _open(source) as pdf:
+        for offset, tables in enumerate(results):
+            if tables is not None:
+                continue
+            tables = pdf.pages[start + offset].extract_tables() or []
+            results[offset] = tables
+            if cache is not None:
+                cache.put(document_key, start + offset, tables)
+
+    return results
+
+
+def merge_page_tables(pages: List[PageTables]) -> List[List[Optional[str]]]:
+    """
+    Concatenate the rows of every non-empty table in page order.
+
+    Args:
+        pages: Tables per page, in page order
+
+    Returns:
+        All table rows
+    """
+    rows = []
+    for tables in pages:
+        for table in tables:
+            if table:
+                rows.extend(table)
+    return rows
+
+
+def extract_pdf_tables(
+    source: Union[str, bytes],
+    cache: Optional[PageTableCache] = None
+) -> List[List[Optional[str]]]:
+    """
+    Extract and merge the tables of a whole PDF in the current process.
+
+    Args:
+        source: File path or raw bytes of the PDF
+        cache: Optional page cache
+
+    Returns:
+        All table rows in page order
+    """
+    document_key = None
+    if cache is not None:
+        document_key = cache.document_key(source)
+        cache.touch(document_key)
+
+    n_pages = count_pages(source)
+    pages = extract_page_range(source, 0, n_pages, cache.cache_dir if cache else None, document_key)
+    return merge_page_tables(pages)
@@ -0,0 +1,260 @@
+"""
+Query Plan Module
+Lazy logical plans over a session's DataFrame: filters, search, selected
+columns, sort keys and a limit/offset window.
+
+A plan is only a description until it is executed. The optimiser normalises
+it (unknown columns and repeated sort keys are dropped) and execution runs
+the steps cheapest first: filters and search resolve to a row mask through
+the session's cached masks and indexes, the sort orders row positions using
+only the sort columns, the window slices those positions, and the selected
+columns are gathered for the page rows alone. A small window over a large
+view is ordered with a partial sort (`np.argpartition`) instead of a full one.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from .session_store import SessionStore
+from .data_views import resolve_view_rows
+from .range_index import is_range_indexable
+from .sorting import positions_dtype
+
+
+# Views shorter than this are always fully sorted (the permutation is cached)
+TOP_K_MIN_ROWS = 10000
+
+# Largest window, as a share of the view, ordered by a partial sort
+TOP_K_MAX_FRACTION = 0.05
+
+
+def _stable_order(values: np.ndarray, ascending: bool) -> np.ndarray:
+    """Stable argsort; equal values keep their relative order in both directions."""
+    if ascending:
+        return np.argsort(values, kind='stable')
+    # Sorting the reversed array and reversing the result keeps ties in order
+    return (len(values) - 1 - np.argsort(values[::-1], kind='stable'))[::-1]
+
+
+def top_k_rows(
+    series: pd.Series,
+    rows: Optional[np.ndarray],
+    k: int,
+    ascending: bool = True
+) -> np.ndarray:
+    """
+    Return the first k row positions of a view sorted by one column.
+
+    The result matches the first k entries of a stable sort with missing
+    values last (`compute_sort_permutation`), but only the values around the
+    k-th are sorted: `np.argpartition` finds the k-th value and every value
+    on the right side of it, ties included, is ordered.
+
+    Args:
+        series: Numeric or datetime column to sort by
+        rows: Row positions of the view in natural order (None = all rows)
+        k: Number of positions to return
+        ascending: Sort direction
+
+    Returns:
+        Array of at most k row positions in sorted order
+    """
+    n_rows = len(series)
+    if k <= 0:
+        return np.empty(0, dtype=positions_dtype(n_rows))
+    values = series.to_numpy()
+    positions = np.arange(n_rows) if rows is None else rows
+    if rows is not None:
+        values = values[rows]
+
+    missing = pd.isna(values) if values.dtype.kind in 'fmM' else np.zeros(len(values), dtype=bool)
+    present = np.flatnonzero(~missing)
+    values = values[present]
+
+    if k < len(values):
+        # Threshold from a partial sort; `<=`/`>=` keeps every tie of the k-th value
+        if ascending:
+            threshold = values[np.argpartition(values, k - 1)[:k]].max()
+            chosen = np.flatnonzero(values <= threshold)
+        else:
+            threshold = values[np.argpartition(values, len(values) - k)[len(values) - k:]].min()
+            chosen = np.flatnonzero(values >= threshold)
+        order = chosen[_stable_order(values[chosen], ascending)][:k]
+        result = positions[present[order]]
+    else:
+        order = present[_stable_order(values, ascending)]
+        result = np.concatenate([positions[order], positions[missing]])[:k]
+    return result.astype(positions_dtype(n_rows))
+
+
+class QueryResult:
+    """Row positions and columns selected by an executed QueryPlan."""
+
+    def __init__(
+        self,
+        rows: Optional[np.ndarray],
+        total_rows: int,
+        columns: Optional[List[str]],
+        steps: Optional[List[str]] = None
+    ):
+        """
+        Initialize a QueryResult.
+
+        Args:
+            rows: Row positions of the result in order (None = all rows in natural order)
+            total_rows: Rows in the view before the limit/offset window
+            columns: Selected columns (None = all columns)
+            steps: Steps the plan ran, in order ('filter', 'top_k' or 'sort',
+                'slice', 'project')
+        """
+        self.rows = rows
+        self.total_rows = total_rows
+        self.columns = columns
+        self.steps = steps or []
+
+    def frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Gather the result rows of the selected columns.
+
+        Args:
+            df: The DataFrame the plan was executed on
+
+        Returns:
+            DataFrame holding only the result rows and columns
+        """
+        rows = slice(None) if self.rows is None else self.rows
+        if self.columns is None:
+            return df.iloc[rows]
+        return df.iloc[rows, df.columns.get_indexer(self.columns)]
+
+
+class QueryPlan:
+    """Logical query over a DataFrame, executed lazily."""
+
+    def __init__(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        sort_keys: Optional[Sequence[Tuple[str, bool]]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ):
+        """
+        Initialize a QueryPlan.
+
+        Args:
+            filters: Filters dict (see `filter_engine.compile_filters`)
+            search: Optional text that must appear in any column
+            columns: Columns to return (None = all columns)
+            sort_keys: (column, ascending) pairs, most significant first
+            offset: Position of the first returned row within the view
+            limit: Number of rows returned (None = all rows from the offset)
+        """
+        self.filters = filters
+        self.search = search
+        self.columns = list(columns) if columns is not None else None
+        self.sort_keys = list(sort_keys or [])
+        self.offset = offset
+        self.limit = limit
+
+    def optimize(self, df: pd.DataFrame) -> "QueryPlan":
+        """
+        Normalise the plan against a DataFrame.
+
+        Empty filters and search are dropped, unknown and repeated columns
+        and sort keys are removed, and a selection of every column in frame
+        order becomes no projection at all.
+
+        Args:
+            df: The DataFrame (or `disk_table.DiskDataset`) the plan will run on
+
+        Returns:
+            A new, optimised QueryPlan
+        """
+        columns = None
+        if self.columns is not None:
+            columns = list(dict.fromkeys(col for col in self.columns if col in df.columns))
+            if columns == list(df.columns):
+                columns = None
+
+        sort_keys, seen = [], set()
+        for column, ascending in self.sort_keys:
+            if column in df.columns and column not in seen:
+                seen.add(column)
+                sort_keys.append((column, bool(ascending)))
+
+        return QueryPlan(
+            filters=self.filters or None,
+            search=self.search or None,
+            columns=columns,
+            sort_keys=sort_keys,
+            offset=max(int(self.offset), 0),
+            limit=None if self.limit is None else max(int(self.limit), 0)
+        )
+
+    def _use_top_k(self, store: SessionStore, session_id: str, df: pd.DataFrame, view_rows: int) -> bool:
+        """Whether the window is small enough to order with a partial sort."""
+        if self.limit is None or len(self.sort_keys) != 1 or view_rows < TOP_K_MIN_ROWS:
+            return False
+        column, ascending = self.sort_keys[0]
+        if store.cache_get(session_id, ('sort', column, ascending)) is not None:
+            # A full ordering is already cached; slicing it is cheaper
+            return False
+        k = self.offset + self.limit
+        return 0 < k <= TOP_K_MAX_FRACTION * view_rows and is_range_indexable(df[column])
+
+    def execute(self, store: SessionStore, session_id: str, df: pd.DataFrame) -> QueryResult:
+        """
+        Run the plan against a session's DataFrame.
+
+        Filter masks, sort permutations and filtered views come from the
+        session's cache and are added to it, so repeated plans over the same
+        view only slice cached positions. Rows are not gathered until
+        `QueryResult.frame` (or a streaming exporter) asks for them.
+
+        Args:
+            store: Session store holding the session
+            session_id: Session identifier
+            df: The session's DataFrame
+
+        Returns:
+            QueryResult with the ordered row positions of the window and
+            the steps that produced them
+        """
+        plan = self.optimize(df)
+        start = plan.offset
+        end = None if plan.limit is None else start + plan.limit
+        steps = []
+
+        # Filters first: the sort and the window only see matching rows
+        rows = None
+        if plan.filters or plan.search:
+            steps.append('filter')
+            rows = resolve_view_rows(store, session_id, df, filters=plan.filters, search=plan.search)
+        total_rows = len(df) if rows is None else len(rows)
+
+        if plan.sort_keys and plan._use_top_k(store, session_id, df, total_rows):
+            steps.append('top_k')
+            column, ascending = plan.sort_keys[0]
+            rows = top_k_rows(df[column], rows, end, ascending)[start:end]
+        elif plan.sort_keys:
+            steps.append('sort')
+            rows = resolve_view_rows(
+                store, session_id, df,
+                filters=plan.filters,
+                search=plan.search,
+                sort_keys=plan.sort_keys
+            )[start:end]
+        elif rows is not None:
+            rows = rows[start:end]
+        elif start or end is not None:
+            stop = total_rows if end is None else min(end, total_rows)
+            rows = np.arange(min(start, stop), stop, dtype=positions_dtype(len(df)))
+
+        if start or end is not None:
+            steps.append('slice')
+        if plan.columns is not None:
+            steps.append('project')
+        return QueryResult(rows, total_rows, plan.columns, steps)
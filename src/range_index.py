@@ -0,0 +1,176 @@
+"""
+Range Index Module
+Sorted-column index for range filters (gt, gte, lt, lte) on numeric and
+datetime columns.
+
+The index is the column's ascending sort permutation with the sorted
+non-missing values alongside. A range predicate becomes two binary searches
+and a contiguous slice of the permutation, whose row positions are set in
+the mask. Setting scattered positions costs more per row than a sequential
+comparison, so the index is only used when the slice (or its complement)
+is small; other predicates scan the column.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Optional, Tuple
+
+from .session_store import SessionStore
+from .sorting import get_sort_permutation
+
+
+# Columns shorter than this are scanned directly; the index would not pay off
+RANGE_INDEX_MIN_ROWS = 10000
+
+# Largest share of rows set from the index (the matching rows, or the
+# non-matching ones for very unselective predicates); a scan is used between
+RANGE_INDEX_MAX_SELECTIVITY = 0.05
+
+# Operators answered from a range index
+RANGE_OPERATORS = {'gt', 'gte', 'lt', 'lte'}
+
+
+def is_range_indexable(series: pd.Series) -> bool:
+    """Whether a column has a plain NumPy numeric or datetime dtype."""
+    dtype = series.dtype
+    return isinstance(dtype, np.dtype) and dtype.kind in 'iufmM'
+
+
+class SortedColumnIndex:
+    """Ascending sort permutation of a column and its sorted non-missing values."""
+
+    def __init__(self, series: pd.Series, permutation: np.ndarray):
+        """
+        Build the index from a column and its ascending sort permutation.
+
+        Args:
+            series: Column to index (numeric or datetime)
+            permutation: Stable ascending permutation with missing values last
+        """
+        values = series.to_numpy()
+        n_valid = len(values) - int(series.isna().sum())
+        self.n_rows = len(values)
+        self.permutation = permutation
+        self.sorted_values = values[permutation[:n_valid]]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the index (the permutation may also be cached on its own)."""
+        return int(self.sorted_values.nbytes + self.permutation.nbytes)
+
+    def _bound(self, value: Any) -> Optional[Any]:
+        """Convert a filter value to a search key of the column's type, or None if it cannot be."""
+        kind = self.sorted_values.dtype.kind
+        try:
+            if kind == 'M':
+                return pd.Timestamp(value).to_datetime64()
+            if kind == 'm':
+                return pd.Timedelta(value).to_timedelta64()
+            if isinstance(value, (bool, np.bool_)) or not np.isscalar(value):
+                return None
+            value = float(value) if kind == 'f' else value
+            if not isinstance(value, (int, float, np.integer, np.floating)) or np.isnan(value):
+                return None
+            return value
+        except (ValueError, TypeError):
+            return None
+
+    def slice(self, operator: str, value: Any) -> Optional[Tuple[int, int]]:
+        """
+        Find the range of the permutation matching a predicate.
+
+        Args:
+            operator: 'gt', 'gte', 'lt' or 'lte'
+            value: Filter value, already coerced to the column type
+
+        Returns:
+            (start, end) positions in the permutation, or None when the value
+            cannot be searched for
+        """
+        bound = self._bound(value)
+        if bound is None:
+            return None
+        values = self.sorted_values
+        if operator == 'gt':
+            return int(np.searchsorted(values, bound, side='right')), len(values)
+        if operator == 'gte':
+            return int(np.searchsorted(values, bound, side='left')), len(values)
+        if operator == 'lt':
+            return 0, int(np.searchsorted(values, bound, side='left'))
+        return 0, int(np.searchsorted(values, bound, side='right'))
+
+    def lookup(
+        self,
+        operator: str,
+        value: Any,
+        max_selectivity: float = RANGE_INDEX_MAX_SELECTIVITY
+    ) -> Optional[np.ndarray]:
+        """
+        Resolve a range predicate through the index when it is selective enough.
+
+        Args:
+            operator: 'gt', 'gte', 'lt' or 'lte'
+            value: Filter value, already coerced to the column type
+            max_selectivity: Largest share of rows set from the index
+
+        Returns:
+            Boolean NumPy array with one entry per row, or None when a scan
+            is expected to be faster or the value cannot be searched for
+        """
+        try:
+            bounds = self.slice(operator, value)
+        except (TypeError, ValueError, OverflowError):
+            bounds = None
+        if bounds is None:
+            return None
+        start, end = bounds
+        matches = end - start
+        limit = max_selectivity * self.n_rows
+
+        if matches <= limit:
+            mask = np.zeros(self.n_rows, dtype=bool)
+            mask[self.permutation[start:end]] = True
+            return mask
+        if self.n_rows - matches <= limit:
+            # Clear everything outside the slice, missing values included
+            mask = np.ones(self.n_rows, dtype=bool)
+            mask[self.permutation[:start]] = False
+            mask[self.permutation[end:]] = False
+            return mask
+        return None
+
+
+def get_range_index(
+    store: SessionStore,
+    session_id: str,
+    column: str,
+    df: Optional[pd.DataFrame] = None
+) -> SortedColumnIndex:
+    """
+    Return the range index of a session column, building it on first use.
+
+    The index shares the cached ascending sort permutation of the column,
+    is cached in the session store, counts against the memory budget and is
+    dropped when the data changes.
+
+    Args:
+        store: Session store holding the session
+        session_id: Session identifier
+        column: Numeric or datetime column
+        df: The session's DataFrame, if already fetched
+
+    Returns:
+        The column's SortedColumnIndex
+    """
+    key = ('range_index', column)
+    index = store.cache_get(session_id, key)
+    if index is not None:
+        return index
+
+    version = store.version(session_id)
+    if df is None:
+        df = store[session_id]['dataframe']
+    permutation = get_sort_permutation(store, session_id, column, ascending=True, df=df)
+    index = SortedColumnIndex(df[column], permutation)
+    store.cache_put(session_id, key, index, nbytes=index.nbytes, version=version)
+    return index
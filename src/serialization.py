@@ -0,0 +1,227 @@
+"""
+Serialization Module
+Fast JSON encoding of API responses straight from DataFrame column arrays.
+"""
+
+import datetime
+import decimal
+import json
+import math
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Payload layouts for DataFrame pages
+LAYOUTS = ['records', 'columnar']
+
+# Text columns are dictionary encoded in the columnar layout when they have at
+# most this many distinct values in the page ...
+DICTIONARY_MAX_SIZE = 4096
+
+# ... and at most this many distinct values per row
+DICTIONARY_MAX_RATIO = 0.5
+
+
+def _default(value: Any) -> Any:
+    """
+    Convert values the encoder does not handle natively.
+
+    Covers NumPy scalars, pandas timestamps, missing-value markers
+    (NaT, pd.NA), timedeltas and decimals.
+    """
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, np.ndarray):
+        return _sanitize(value.tolist())
+    if isinstance(value, np.generic):
+        value = _sanitize(value.item())
+        return value if value is None or isinstance(value, (bool, int, float, str)) else _default(value)
+    if isinstance(value, (pd.Timestamp, datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (pd.Timedelta, datetime.timedelta)):
+        return str(value)
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def _sanitize(value: Any) -> Any:
+    """Replace non-finite floats with None for the standard-library encoder."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _sanitize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_sanitize(item) for item in value]
+    return value
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content as JSON bytes.
+
+    NaN and infinity become null, and NumPy scalars and arrays, timestamps,
+    NaT and pd.NA are converted. orjson is used when installed.
+
+    Args:
+        content: JSON-like content
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                content,
+                default=_default,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        except TypeError:
+            # orjson's native NumPy support rejects some values (e.g. NaT
+            # datetime64 scalars); route everything NumPy through `_default`
+            return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        _sanitize(content), default=_default, ensure_ascii=False, allow_nan=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+def column_values(series: pd.Series) -> List[Any]:
+    """
+    Convert a column to a list of JSON-ready Python values in one vectorised step.
+
+    Numeric columns go through `ndarray.tolist()`. Other columns keep their
+    objects, which the encoder converts. Missing values become None when
+    encoded.
+
+    Args:
+        series: Column to convert
+
+    Returns:
+        List with one value per row
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biuf':
+        return series.to_numpy().tolist()
+    return series.to_numpy(dtype=object).tolist()
+
+
+def frame_records(df: pd.DataFrame) -> List[Dict[Any, Any]]:
+    """
+    Build the 'records' layout of a DataFrame (one dict per row) column-wise.
+
+    Equivalent to `df.to_dict('records')`, but without boxing every cell
+    through pandas.
+
+    Args:
+        df: DataFrame (typically one page)
+
+    Returns:
+        List of row dicts
+    """
+    columns = list(df.columns)
+    values = [column_values(df.iloc[:, i]) for i in range(len(columns))]
+    return [dict(zip(columns, row)) for row in zip(*values)] if columns else [{} for _ in range(len(df))]
+
+
+def _is_text(series: pd.Series) -> bool:
+    dtype = series.dtype
+    return (
+        dtype == object
+        or isinstance(dtype, pd.CategoricalDtype)
+        or pd.api.types.is_string_dtype(dtype)
+    )
+
+
+def _numeric_array(series: pd.Series) -> Any:
+    """
+    A numeric column as an array orjson encodes natively, or a list otherwise.
+
+    Float NaN and infinity are encoded as null.
+    """
+    values = series.to_numpy()
+    if orjson is not None and (values.dtype.kind in 'biu' or values.dtype in (np.float32, np.float64)):
+        return np.ascontiguousarray(values)
+    return values.tolist()
+
+
+def frame_columns(
+    df: pd.DataFrame,
+    max_dictionary_size: int = DICTIONARY_MAX_SIZE,
+    max_dictionary_ratio: float = DICTIONARY_MAX_RATIO
+) -> Dict[str, Any]:
+    """
+    Build the 'columnar' layout of a DataFrame: one value array per column.
+
+    Text columns with few distinct values in the page are dictionary encoded
+    as integer codes into a list of distinct values; a code of -1 marks a
+    missing value.
+
+    Args:
+        df: DataFrame (typically one page)
+        max_dictionary_size: Most distinct values a dictionary-encoded column may have
+        max_dictionary_ratio: Most distinct values per row for dictionary encoding
+
+    Returns:
+        {'layout': 'columnar', 'length': rows, 'columns': [...]}, where each
+        column is {'name', 'values'} or {'name', 'encoding': 'dictionary',
+        'dictionary', 'codes'}
+    """
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df.iloc[:, i]
+        dtype = series.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in 'biuf':
+            columns.append({'name': name, 'values': _numeric_array(series)})
+            continue
+
+        if _is_text(series) and len(series):
+            codes, uniques = pd.factorize(series, use_na_sentinel=True)
+            if len(uniques) <= max_dictionary_size and len(uniques) <= max_dictionary_ratio * len(series):
+                columns.append({
+                    'name': name,
+                    'encoding': 'dictionary',
+                    'dictionary': column_values(pd.Series(uniques)),
+                    'codes': codes if orjson is not None else codes.tolist()
+                })
+                continue
+
+        columns.append({'name': name, 'values': column_values(series)})
+
+    return {'layout': 'columnar', 'length': len(df), 'columns': columns}
+
+
+def frame_payload(df: pd.DataFrame, layout: str = 'records') -> Any:
+    """
+    Encode a DataFrame page in the requested layout.
+
+    Args:
+        df: DataFrame (typically one page)
+        layout: 'records' (list of row dicts) or 'columnar' (see `frame_columns`)
+
+    Returns:
+        JSON-ready payload
+    """
+    if layout == 'columnar':
+        return frame_columns(df)
+    if layout == 'records':
+        return frame_records(df)
+    raise ValueError(f"Unknown layout '{layout}'. Use one of: {', '.join(LAYOUTS)}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with `dumps` (orjson, NaN-safe, NumPy-aware)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
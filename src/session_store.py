@@ -0,0 +1,479 @@
+"""
+Session Store Module
+Bounded storage for API sessions with TTL expiry, LRU eviction and spill-to-disk.
+"""
+
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Iterator, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def estimate_dataframe_bytes(df: pd.DataFrame) -> int:
+    """
+    Estimate the in-memory footprint of a DataFrame.
+
+    Args:
+        df: Input pandas DataFrame
+
+    Returns:
+        Size in bytes, including the payload of object columns
+    """
+    return int(df.memory_usage(deep=True).sum())
+
+
+class SessionRecord:
+    """Bookkeeping for a single stored session."""
+
+    def __init__(self, nbytes: int, ttl_seconds: Optional[float] = None, version: int = 0):
+        """
+        Initialize a session record.
+
+        Args:
+            nbytes: Memory footprint of the session's DataFrame
+            ttl_seconds: Idle time after which the session expires (None = never)
+            version: Initial data version
+        """
+        self.nbytes = nbytes
+        self.ttl_seconds = ttl_seconds
+        self.last_access = time.monotonic()
+        self.spill_path: Optional[str] = None
+        self.version = version
+        self.cache: Dict[Any, Tuple[Any, int]] = {}
+        # Memory held by derived data cached for the session
+        self.cache_bytes = 0
+
+    def cache_set(self, key: Any, value: Any, nbytes: int):
+        """Cache a derived value, keeping `cache_bytes` up to date."""
+        if key in self.cache:
+            self.cache_bytes -= self.cache[key][1]
+        self.cache[key] = (value, nbytes)
+        self.cache_bytes += nbytes
+
+    def cache_reset(self):
+        """Drop all cached derived values."""
+        self.cache.clear()
+        self.cache_bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        """Memory held by the session's DataFrame and its caches."""
+        return self.nbytes + self.cache_bytes
+
+    @property
+    def resident(self) -> bool:
+        """Whether the session's DataFrame is currently held in memory."""
+        return self.spill_path is None
+
+    @property
+    def resident_bytes(self) -> int:
+        """Memory counted against the budget (nothing while spilled)."""
+        return self.total_bytes if self.resident else 0
+
+    def is_expired(self, now: float) -> bool:
+        """Check whether the session has been idle for longer than its TTL."""
+        return self.ttl_seconds is not None and now - self.last_access > self.ttl_seconds
+
+
+class SessionStore:
+    """
+    Dict-like store for API sessions that keeps memory usage bounded:
+    - Global memory budget shared by all sessions
+    - Per-session idle TTL after which a session is dropped
+    - LRU eviction: the least recently used sessions are spilled to disk
+      (Parquet when pyarrow is available, pickle otherwise)
+    - Spilled sessions are transparently reloaded on their next access
+    - Per-session cache for derived data (sort permutations, masks, ...)
+      that counts against the budget and is cleared when the data changes
+
+    Each session is a plain dict holding at least a 'dataframe' key; the
+    remaining keys (agent, filename, current filters, ...) stay in memory.
+    Read the DataFrame with `dataframe`, which reloads a spilled session and
+    reads it under the store's lock. Data versions come from one store-wide
+    counter, so they only increase, even when a session is replaced.
+    Sessions backed by an out-of-core 'dataset' (see `disk_table.DiskDataset`)
+    have it closed, and its files deleted, when they are dropped.
+    Subclasses can override `_write_spill` / `_read_spill` to plug in a
+    different storage backend.
+    """
+
+    def __init__(
+        self,
+        memory_budget_mb: Optional[float] = None,
+        ttl_seconds: Optional[float] = None,
+        spill_dir: Optional[str] = None
+    ):
+        """
+        Initialize the SessionStore.
+
+        Args:
+            memory_budget_mb: Total memory allowed for resident DataFrames (None = unbounded)
+            ttl_seconds: Default idle time after which sessions expire (None = never)
+            spill_dir: Directory for spilled sessions (a temp directory by default)
+        """
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024) if memory_budget_mb else None
+        self.ttl_seconds = ttl_seconds
+        self._spill_dir = spill_dir
+
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._records: Dict[str, SessionRecord] = {}
+        self._versions = itertools.count(1)
+        # Bytes held by resident sessions, updated on every change
+        self._resident_bytes = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_env(cls) -> "SessionStore":
+        """
+        Create a store configured from environment variables:
+        SESSION_MEMORY_BUDGET_MB, SESSION_TTL_SECONDS and SESSION_SPILL_DIR.
+        """
+        budget = os.environ.get("SESSION_MEMORY_BUDGET_MB")
+        ttl = os.environ.get("SESSION_TTL_SECONDS")
+        return cls(
+            memory_budget_mb=float(budget) if budget else None,
+            ttl_seconds=float(ttl) if ttl else None,
+            spill_dir=os.environ.get("SESSION_SPILL_DIR") or None
+        )
+
+    @property
+    def spill_dir(self) -> str:
+        """Directory for spilled sessions, created on first use."""
+        with self._lock:
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix="easydata-sessions-")
+            os.makedirs(self._spill_dir, exist_ok=True)
+            return self._spill_dir
+
+    # ------------------------------------------------------------------
+    # Dict interface
+    # ------------------------------------------------------------------
+
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            self._expire()
+            return session_id in self._sessions
+
+    def __getitem__(self, session_id: str) -> Dict[str, Any]:
+        with self._lock:
+            self._expire()
+            if session_id not in self._sessions:
+                raise KeyError(session_id)
+
+            record = self._records[session_id]
+            record.last_access = time.monotonic()
+            self._sessions.move_to_end(session_id)
+
+            if not record.resident:
+                self._load(session_id)
+                self._enforce_budget(keep=session_id)
+
+            return self._sessions[session_id]
+
+    def __setitem__(self, session_id: str, session: Dict[str, Any]):
+        self.put(session_id, session)
+
+    def __delitem__(self, session_id: str):
+        with self._lock:
+            if session_id not in self._sessions:
+                raise KeyError(session_id)
+            self._drop(session_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._sessions)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            self._expire()
+            return iter(list(self._sessions))
+
+    def get(self, session_id: str, default: Any = None) -> Any:
+        """Return the session for `session_id`, or `default` if it does not exist."""
+        try:
+            return self[session_id]
+        except KeyError:
+            return default
+
+    # ------------------------------------------------------------------
+    # Store operations
+    # ------------------------------------------------------------------
+
+    def put(
+        self,
+        session_id: str,
+        session: Dict[str, Any],
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Add or replace a session.
+
+        Args:
+            session_id: Unique session identifier
+            session: Session dict; must contain a 'dataframe' key
+            ttl_seconds: Idle TTL for this session (defaults to the store's TTL)
+        """
+        with self._lock:
+            if session_id in self._sessions:
+                self._drop(session_id)
+
+            df = session.get('dataframe')
+            nbytes = estimate_dataframe_bytes(df) if df is not None else 0
+            ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+
+            self._sessions[session_id] = session
+            self._records[session_id] = SessionRecord(nbytes, ttl, next(self._versions))
+            self._resident_bytes += nbytes
+
+            self._expire()
+            self._enforce_budget(keep=session_id)
+
+    def update_dataframe(self, session_id: str, df: pd.DataFrame):
+        """
+        Replace the DataFrame of an existing session and bump its data version.
+
+        Args:
+            session_id: Session identifier
+            df: New DataFrame for the session
+        """
+        with self._lock:
+            session = self[session_id]
+            record = self._records[session_id]
+
+            session['dataframe'] = df
+            agent = session.get('agent')
+            if agent is not None:
+                agent.df = df
+
+            self._resident_bytes -= record.resident_bytes
+            record.nbytes = estimate_dataframe_bytes(df)
+            record.version = next(self._versions)
+            record.cache_reset()
+            self._resident_bytes += record.resident_bytes
+            self._enforce_budget(keep=session_id)
+
+    def dataframe(self, session_id: str) -> pd.DataFrame:
+        """
+        Return a session's DataFrame, reloading it if it was spilled.
+
+        The lookup and the read happen under the store's lock, so a
+        concurrent spill cannot hand back None in between.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            The session's DataFrame
+
+        Raises:
+            KeyError: If the session does not exist
+        """
+        with self._lock:
+            return self[session_id]['dataframe']
+
+    def version(self, session_id: str) -> int:
+        """Return the data version of a session (increased on every data change)."""
+        with self._lock:
+            return self._records[session_id].version
+
+    def cache_get(self, session_id: str, key: Any) -> Any:
+        """
+        Look up derived data cached for a session.
+
+        Args:
+            session_id: Session identifier
+            key: Cache key
+
+        Returns:
+            The cached value, or None if it is not cached
+        """
+        with self._lock:
+            record = self._records.get(session_id)
+            if record is None or key not in record.cache:
+                return None
+            return record.cache[key][0]
+
+    def cache_put(
+        self,
+        session_id: str,
+        key: Any,
+        value: Any,
+        nbytes: Optional[int] = None,
+        version: Optional[int] = None
+    ):
+        """
+        Cache derived data for a session, accounted against the memory budget.
+
+        Args:
+            session_id: Session identifier
+            key: Cache key
+            value: Value to cache
+            nbytes: Memory held by the value (defaults to `value.nbytes`)
+            version: Data version the value was computed from; stale values are discarded
+        """
+        with self._lock:
+            record = self._records.get(session_id)
+            if record is None or not record.resident:
+                return
+            if version is not None and version != record.version:
+                return
+
+            if nbytes is None:
+                nbytes = int(getattr(value, 'nbytes', 0))
+            self._resident_bytes -= record.cache_bytes
+            record.cache_set(key, value, nbytes)
+            self._resident_bytes += record.cache_bytes
+            self._enforce_budget(keep=session_id)
+
+    def cache_clear(self, session_id: str):
+        """Drop all derived data cached for a session."""
+        with self._lock:
+            record = self._records.get(session_id)
+            if record is not None:
+                self._resident_bytes -= record.resident_bytes
+                record.cache_reset()
+                self._resident_bytes += record.resident_bytes
+
+    def memory_usage(self) -> int:
+        """Return the total bytes held by resident sessions."""
+        with self._lock:
+            return self._resident_bytes
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a summary of the store state."""
+        with self._lock:
+            self._expire()
+            spilled = sum(1 for r in self._records.values() if not r.resident)
+            return {
+                "sessions": len(self._sessions),
+                "resident": len(self._sessions) - spilled,
+                "spilled": spilled,
+                "memory_usage_mb": self.memory_usage() / (1024 * 1024),
+                "memory_budget_mb": (
+                    self.memory_budget_bytes / (1024 * 1024) if self.memory_budget_bytes else None
+                )
+            }
+
+    def clear(self):
+        """Remove all sessions and their spill files."""
+        with self._lock:
+            for session_id in list(self._sessions):
+                self._drop(session_id)
+
+    def close(self):
+        """Remove all sessions and delete the spill directory."""
+        self.clear()
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Eviction and spilling
+    # ------------------------------------------------------------------
+
+    def _expire(self):
+        """Drop sessions whose idle TTL has elapsed."""
+        now = time.monotonic()
+        for session_id in [sid for sid, r in self._records.items() if r.is_expired(now)]:
+            self._drop(session_id)
+
+    def _enforce_budget(self, keep: Optional[str] = None):
+        """Spill least recently used sessions until the memory budget is met."""
+        if self.memory_budget_bytes is None:
+            return
+
+        for session_id in list(self._sessions):
+            if self._resident_bytes <= self.memory_budget_bytes:
+                break
+            if session_id == keep or not self._records[session_id].resident:
+                continue
+            self._spill(session_id)
+
+    def _spill(self, session_id: str):
+        """Write a session's DataFrame to disk and release it from memory."""
+        session = self._sessions[session_id]
+        record = self._records[session_id]
+        df = session.get('dataframe')
+        if df is None:
+            return
+
+        self._resident_bytes -= record.resident_bytes
+        record.spill_path = self._write_spill(session_id, df)
+        record.cache_reset()
+        session['dataframe'] = None
+        agent = session.get('agent')
+        if agent is not None and getattr(agent, 'df', None) is df:
+            agent.df = None
+
+    def _load(self, session_id: str):
+        """Reload a spilled session's DataFrame from disk."""
+        session = self._sessions[session_id]
+        record = self._records[session_id]
+
+        df = self._read_spill(record.spill_path)
+        self._remove_file(record.spill_path)
+        record.spill_path = None
+        self._resident_bytes += record.resident_bytes
+
+        session['dataframe'] = df
+        agent = session.get('agent')
+        if agent is not None:
+            agent.df = df
+
+    def _write_spill(self, session_id: str, df: pd.DataFrame) -> str:
+        """
+        Persist a DataFrame for a spilled session.
+
+        Parquet is used when pyarrow is installed; frames Arrow cannot
+        represent (e.g. mixed-type object columns) fall back to pickle.
+
+        Returns:
+            Path of the written file
+        """
+        base = os.path.join(self.spill_dir, session_id)
+        if pyarrow is not None:
+            path = base + ".parquet"
+            try:
+                df.to_parquet(path)
+                return path
+            except Exception:
+                self._remove_file(path)
+
+        path = base + ".pkl"
+        df.to_pickle(path)
+        return path
+
+    def _read_spill(self, path: str) -> pd.DataFrame:
+        """Read a DataFrame written by `_write_spill`."""
+        if path.endswith(".parquet"):
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def _drop(self, session_id: str):
+        """Remove a session, its spill file and its on-disk dataset."""
+        record = self._records.pop(session_id)
+        session = self._sessions.pop(session_id)
+        self._resident_bytes -= record.resident_bytes
+        if record.spill_path:
+            self._remove_file(record.spill_path)
+        dataset = session.get('dataset')
+        if dataset is not None:
+            dataset.close()
+
+    @staticmethod
+    def _remove_file(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
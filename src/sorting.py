@@ -0,0 +1,212 @@
+"""
+Sorting Module
+Sort permutations for paginating large DataFrames without re-sorting them.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, List, Sequence, Tuple
+
+from .session_store import SessionStore
+
+
+def positions_dtype(n_rows: int) -> type:
+    """Smallest integer dtype able to address `n_rows` rows."""
+    return np.int32 if n_rows < np.iinfo(np.int32).max else np.int64
+
+
+def compute_sort_permutation(series: pd.Series, ascending: bool = True) -> np.ndarray:
+    """
+    Compute the row positions that sort a column.
+
+    Matches `DataFrame.sort_values` with a stable sort and missing values last,
+    so that consecutive pages of the same ordering never overlap.
+
+    Args:
+        series: Column to sort by
+        ascending: Sort direction
+
+    Returns:
+        Array of row positions (int32 when the frame is small enough)
+    """
+    positions = (
+        series.reset_index(drop=True)
+        .sort_values(ascending=ascending, kind='stable', na_position='last')
+        .index.to_numpy()
+    )
+    return positions.astype(positions_dtype(len(positions)))
+
+
+def compute_rank_array(series: pd.Series) -> np.ndarray:
+    """
+    Compute the dense ascending rank of every value of a column.
+
+    Equal values share a rank and missing values get the largest value of the
+    rank dtype, after all others. Text columns with mixed types are ranked by
+    their string form.
+
+    Args:
+        series: Column to rank
+
+    Returns:
+        Array of ranks (int32 when there are few enough distinct values)
+    """
+    try:
+        codes, uniques = pd.factorize(series, sort=True, use_na_sentinel=True)
+    except TypeError:
+        missing = series.isna().to_numpy()
+        codes, uniques = pd.factorize(series.astype(str), sort=True)
+        codes[missing] = -1
+    ranks = codes.astype(positions_dtype(len(uniques) + 1))
+    ranks[codes < 0] = np.iinfo(ranks.dtype).max
+    return ranks
+
+
+def get_rank_array(
+    store: SessionStore,
+    session_id: str,
+    column: str,
+    df: Optional[pd.DataFrame] = None
+) -> np.ndarray:
+    """
+    Return the rank array of a session column, building it on first use.
+
+    Rank arrays are cached per column and shared by every multi-column
+    ordering that uses the column, in either direction.
+
+    Args:
+        store: Session store holding the session
+        session_id: Session identifier
+        column: Column to rank
+        df: The session's DataFrame, if already fetched
+
+    Returns:
+        Array of dense ranks (see `compute_rank_array`)
+    """
+    key = ('rank', column)
+    ranks = store.cache_get(session_id, key)
+    if ranks is not None:
+        return ranks
+
+    version = store.version(session_id)
+    if df is None:
+        df = store[session_id]['dataframe']
+    ranks = compute_rank_array(df[column])
+    store.cache_put(session_id, key, ranks, version=version)
+    return ranks
+
+
+def normalize_sort_keys(
+    columns: Optional[Sequence[str]],
+    orders: Optional[Sequence[str]],
+    available: Sequence[str]
+) -> List[Tuple[str, bool]]:
+    """
+    Pair sort columns with their directions.
+
+    Order i applies to column i and defaults to ascending. Unknown and
+    repeated columns are dropped.
+
+    Args:
+        columns: Sort columns, most significant first
+        orders: 'asc' or 'desc' per column
+        available: Columns of the DataFrame
+
+    Returns:
+        List of (column, ascending) pairs
+    """
+    keys, seen = [], set()
+    orders = list(orders or [])
+    for i, column in enumerate(columns or []):
+        if column not in available or column in seen:
+            continue
+        seen.add(column)
+        order = orders[i] if i < len(orders) and orders[i] else 'asc'
+        keys.append((column, order.lower() != 'desc'))
+    return keys
+
+
+def get_sort_permutation(
+    store: SessionStore,
+    session_id: str,
+    column: str,
+    ascending: bool = True,
+    df: Optional[pd.DataFrame] = None
+) -> np.ndarray:
+    """
+    Return the sort permutation for a session column, building it on first use.
+
+    Permutations are cached per (column, order) in the session store, so they
+    count against the memory budget and are dropped when the data changes.
+
+    Args:
+        store: Session store holding the session
+        session_id: Session identifier
+        column: Column to sort by
+        ascending: Sort direction
+        df: The session's DataFrame, if already fetched
+
+    Returns:
+        Array of row positions in sorted order
+    """
+    key = ('sort', column, ascending)
+    permutation = store.cache_get(session_id, key)
+    if permutation is not None:
+        return permutation
+
+    version = store.version(session_id)
+    if df is None:
+        df = store[session_id]['dataframe']
+    permutation = compute_sort_permutation(df[column], ascending)
+    store.cache_put(session_id, key, permutation, version=version)
+    return permutation
+
+
+def get_multi_sort_permutation(
+    store: SessionStore,
+    session_id: str,
+    keys: Sequence[Tuple[str, bool]],
+    df: Optional[pd.DataFrame] = None
+) -> np.ndarray:
+    """
+    Return the permutation sorting a session by several columns.
+
+    The ordering is a stable lexsort over the columns' cached rank arrays, with
+    missing values last in each column. It is cached per key list, so paging
+    a multi-column sort only slices the cached array.
+
+    Args:
+        store: Session store holding the session
+        session_id: Session identifier
+        keys: (column, ascending) pairs, most significant first
+        df: The session's DataFrame, if already fetched
+
+    Returns:
+        Array of row positions in sorted order
+    """
+    if len(keys) == 1:
+        column, ascending = keys[0]
+        return get_sort_permutation(store, session_id, column, ascending, df=df)
+
+    key = ('sort', tuple(keys))
+    permutation = store.cache_get(session_id, key)
+    if permutation is not None:
+        return permutation
+
+    version = store.version(session_id)
+    if df is None:
+        df = store[session_id]['dataframe']
+
+    sort_keys = []
+    for column, ascending in keys:
+        ranks = get_rank_array(store, session_id, column, df=df)
+        if not ascending:
+            # Reverse the order of present values; missing values stay last
+            missing = np.iinfo(ranks.dtype).max
+            ranks = np.where(ranks == missing, missing, -ranks)
+        sort_keys.append(ranks)
+
+    # lexsort treats its last key as the most significant
+    permutation = np.lexsort(sort_keys[::-1]).astype(positions_dtype(len(df)))
+    store.cache_put(session_id, key, permutation, version=version)
+    return permutation
@@ -0,0 +1,190 @@
+"""
+Text Index Module
+Per-column trigram index for case-insensitive substring filters ('contains').
+
+A column is dictionary encoded once: row codes into its distinct string
+values, kept lower-cased. The trigram postings map every three-character
+sequence to the distinct values containing it. A search intersects the
+postings of the needle's trigrams, verifies the few candidates exactly and
+broadcasts the matching values to rows through the codes.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+from .session_store import SessionStore
+
+
+# Columns shorter than this are scanned directly; the index would not pay off
+TEXT_INDEX_MIN_ROWS = 10000
+
+# Characters that make a filter value a regular expression rather than a literal
+REGEX_METACHARACTERS = set('.^$*+?{}[]\\|()')
+
+# Separator between values in the concatenated code-point buffer
+_SEPARATOR = 0
+
+# Estimated per-object overhead of a Python str
+_STR_OVERHEAD_BYTES = 49
+
+
+def _trigram_keys(codepoints: np.ndarray) -> np.ndarray:
+    """Pack every run of three code points (each < 2**21) into one uint64 key."""
+    cp = codepoints.astype(np.uint64)
+    return (cp[:-2] << np.uint64(42)) | (cp[1:-1] << np.uint64(21)) | cp[2:]
+
+
+def _codepoints(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+class TextIndex:
+    """Lower-cased, dictionary-encoded text column with trigram postings."""
+
+    def __init__(self, series: pd.Series):
+        """
+        Build the index of a column.
+
+        Values are stringified like `Series.astype(str)`; missing values never match.
+
+        Args:
+            series: Column to index
+        """
+        codes, uniques = pd.factorize(series.astype(str), use_na_sentinel=True)
+        self.n_rows = len(codes)
+        self.codes = codes.astype(np.int32 if len(uniques) < np.iinfo(np.int32).max else np.int64)
+        self.values = pd.Series(uniques)
+        self.lowered = self.values.str.lower()
+        self._build_postings()
+
+    def _build_postings(self):
+        """Build CSR postings: sorted trigram keys, offsets, and value ids per key."""
+        lowered = self.lowered.tolist()
+        n_values = len(lowered)
+        lengths = np.fromiter((len(value) for value in lowered), dtype=np.int64, count=n_values)
+        self._text_bytes = int(lengths.sum())
+
+        buffer = _codepoints('\x00'.join(lowered))
+        if len(buffer) < 3:
+            self.gram_keys = np.empty(0, dtype=np.uint64)
+            self.gram_offsets = np.zeros(1, dtype=np.int64)
+            self.gram_ids = np.empty(0, dtype=np.int32)
+            return
+
+        # Value id of every position in the buffer (a separator takes the id of the value before it)
+        value_ids = np.repeat(np.arange(n_values, dtype=np.int32), lengths + 1)[:len(buffer)]
+        keys = _trigram_keys(buffer)
+        separator = buffer == _SEPARATOR
+        valid = ~(separator[:-2] | separator[1:-1] | separator[2:])
+        keys, ids = keys[valid], value_ids[:-2][valid]
+
+        # Sort by (key, id) and drop repeated trigrams within one value
+        order = np.lexsort((ids, keys))
+        keys, ids = keys[order], ids[order]
+        keep = np.ones(len(keys), dtype=bool)
+        keep[1:] = (keys[1:] != keys[:-1]) | (ids[1:] != ids[:-1])
+        keys, ids = keys[keep], ids[keep]
+
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, dtype=np.int64)
+        self.gram_keys = keys[starts]
+        self.gram_offsets = np.r_[starts, len(keys)].astype(np.int64)
+        self.gram_ids = ids
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the index."""
+        arrays = (self.codes, self.gram_keys, self.gram_offsets, self.gram_ids)
+        if self.values.dtype == object:
+            strings = 2 * (self._text_bytes + (_STR_OVERHEAD_BYTES + 8) * len(self.values))
+        else:
+            strings = self.values.array.nbytes + self.lowered.array.nbytes
+        return int(sum(array.nbytes for array in arrays) + strings)
+
+    def _candidates(self, needle: str) -> Optional[np.ndarray]:
+        """Value ids containing every trigram of the needle (None = needle too short to narrow)."""
+        if len(needle) < 3 or '\x00' in needle:
+            return None
+        grams = np.unique(_trigram_keys(_codepoints(needle)))
+        positions = np.searchsorted(self.gram_keys, grams)
+        postings = []
+        for gram, position in zip(grams, positions):
+            if position >= len(self.gram_keys) or self.gram_keys[position] != gram:
+                return np.empty(0, dtype=self.gram_ids.dtype)
+            postings.append(self.gram_ids[self.gram_offsets[position]:self.gram_offsets[position + 1]])
+
+        postings.sort(key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+        return candidates
+
+    def _rows_for(self, matching: np.ndarray) -> np.ndarray:
+        """Broadcast a boolean per distinct value to rows (missing values never match)."""
+        hit = np.zeros(len(self.values) + 1, dtype=bool)
+        hit[:-1] = matching
+        return hit[self.codes]
+
+    def contains(self, value: str) -> np.ndarray:
+        """
+        Case-insensitive substring match, like `astype(str).str.contains(value, case=False)`.
+
+        Values with regular-expression metacharacters are matched as regular
+        expressions against the distinct values.
+
+        Args:
+            value: Filter value
+
+        Returns:
+            Boolean NumPy array with one entry per row
+        """
+        if REGEX_METACHARACTERS & set(value):
+            matching = self.values.str.contains(value, case=False, na=False)
+            return self._rows_for(matching.to_numpy(dtype=bool))
+
+        needle = value.lower()
+        candidates = self._candidates(needle)
+        if candidates is None:
+            matching = self.lowered.str.contains(needle, regex=False).to_numpy(dtype=bool)
+        else:
+            matching = np.zeros(len(self.values), dtype=bool)
+            if len(candidates):
+                found = self.lowered.iloc[candidates].str.contains(needle, regex=False)
+                matching[candidates] = found.to_numpy(dtype=bool)
+        return self._rows_for(matching)
+
+
+def get_text_index(
+    store: SessionStore,
+    session_id: str,
+    column: str,
+    df: Optional[pd.DataFrame] = None
+) -> TextIndex:
+    """
+    Return the text index of a session column, building it on first use.
+
+    The index is cached in the session store, counts against the memory
+    budget and is dropped when the data changes.
+
+    Args:
+        store: Session store holding the session
+        session_id: Session identifier
+        column: Column to index
+        df: The session's DataFrame, if already fetched
+
+    Returns:
+        The column's TextIndex
+    """
+    key = ('text_index', column)
+    index = store.cache_get(session_id, key)
+    if index is not None:
+        return index
+
+    version = store.version(session_id)
+    if df is None:
+        df = store[session_id]['dataframe']
+    index = TextIndex(df[column])
+    store.cache_put(session_id, key, index, nbytes=index.nbytes, version=version)
+    return index
@@ -0,0 +1,303 @@
+"""
+Text Sniffer Module
+Detects the layout of plain-text uploads from a bounded prefix: encoding,
+delimiter, quoting, header row or fixed-width columns.
+"""
+
+import codecs
+import csv
+import io
+from collections import Counter
+from typing import Dict, Any, List, Optional, Union
+
+import pandas as pd
+
+
+# Bytes of the file inspected by the sniffer
+DEFAULT_SAMPLE_BYTES = 64 * 1024
+
+# Records of the prefix used for scoring
+MAX_SAMPLE_ROWS = 500
+
+# Candidate delimiters and quote characters, in order of preference on ties
+DELIMITERS = [',', '\t', ';', '|']
+QUOTECHARS = ['"', "'"]
+
+# Minimum share of records with the modal field count for a delimiter to be accepted
+MIN_CONSISTENCY = 0.8
+
+# Minimum share of lines that must be blank at a position for it to separate fixed-width columns
+MIN_BLANK_SHARE = 0.95
+
+# Sample size at which the confidence is no longer discounted
+MIN_CONFIDENT_ROWS = 5
+
+TextSource = Union[str, bytes]
+
+
+class SniffResult:
+    """Detected layout of a text file."""
+
+    def __init__(
+        self,
+        format: str,
+        encoding: str,
+        confidence: float,
+        delimiter: Optional[str] = None,
+        quotechar: Optional[str] = None,
+        has_header: bool = True,
+        columns: int = 1
+    ):
+        """
+        Initialize a SniffResult.
+
+        Args:
+            format: 'delimited', 'fixed_width' or 'lines'
+            encoding: Text encoding
+            confidence: Score between 0 and 1
+            delimiter: Field delimiter (delimited format)
+            quotechar: Quote character (delimited format)
+            has_header: Whether the first record holds column names
+            columns: Number of columns detected in the sample
+        """
+        self.format = format
+        self.encoding = encoding
+        self.confidence = confidence
+        self.delimiter = delimiter
+        self.quotechar = quotechar
+        self.has_header = has_header
+        self.columns = columns
+
+    def read_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for `pd.read_csv` (delimited) or `pd.read_fwf` (fixed width)."""
+        kwargs = {'encoding': self.encoding, 'header': 0 if self.has_header else None}
+        if self.format == 'delimited':
+            kwargs.update(sep=self.delimiter, quotechar=self.quotechar)
+        return kwargs
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable summary."""
+        return {
+            'format': self.format,
+            'encoding': self.encoding,
+            'delimiter': self.delimiter,
+            'quotechar': self.quotechar,
+            'has_header': self.has_header,
+            'columns': self.columns,
+            'confidence': self.confidence
+        }
+
+
+def read_prefix(source: TextSource, sample_bytes: int = DEFAULT_SAMPLE_BYTES) -> bytes:
+    """
+    Read up to `sample_bytes` bytes from the start of a file.
+
+    Args:
+        source: File path or raw bytes
+
+    Returns:
+        The prefix
+    """
+    if isinstance(source, bytes):
+        return source[:sample_bytes]
+    with open(source, 'rb') as f:
+        return f.read(sample_bytes)
+
+
+def detect_encoding(prefix: bytes, complete: bool = False) -> str:
+    """
+    Detect the encoding of a text prefix.
+
+    A byte-order mark wins; otherwise UTF-8 is used when the prefix decodes
+    (a multi-byte character cut off at the end is allowed), and Latin-1,
+    which accepts any byte, as a last resort.
+
+    Args:
+        prefix: Leading bytes of the file
+        complete: Whether the prefix is the whole file
+
+    Returns:
+        Encoding name
+    """
+    if prefix.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if prefix.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(prefix, final=complete)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def _decode_prefix(prefix: bytes, encoding: str, complete: bool) -> str:
+    """Decode a prefix, dropping the last (possibly partial) line unless it is the whole file."""
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(prefix, final=complete)
+    if not complete and '\n' in text:
+        text = text[:text.rindex('\n') + 1]
+    return text
+
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+def _detect_header(rows: List[List[str]], width: int) -> bool:
+    """
+    Decide whether the first record is a header.
+
+    Columns whose values are numeric below a non-numeric first cell vote for
+    a header; columns numeric throughout vote against. Ties (e.g. all-text
+    files) keep the header, like `pd.read_csv`.
+    """
+    first, data = rows[0], [row for row in rows[1:] if len(row) == width]
+    if not data or len(first) != width:
+        return True
+
+    votes_header, votes_data = 0, 0
+    for j in range(width):
+        values = [row[j].strip() for row in data if row[j].strip()]
+        if not values or sum(_is_number(v) for v in values) < 0.8 * len(values):
+            continue
+        if _is_number(first[j].strip()):
+            votes_data += 1
+        else:
+            votes_header += 1
+    return votes_header >= votes_data
+
+
+def _sniff_delimited(text: str) -> Optional[Dict[str, Any]]:
+    """Score each delimiter/quote pair and return the most consistent one, if any."""
+    best = None
+    for quotechar in QUOTECHARS:
+        if quotechar != '"' and quotechar not in text:
+            continue
+        for delimiter in DELIMITERS:
+            if delimiter not in text:
+                continue
+            reader = csv.reader(io.StringIO(text), delimiter=delimiter, quotechar=quotechar)
+            rows = []
+            try:
+                for row in reader:
+                    if any(cell.strip() for cell in row):
+                        rows.append(row)
+                    if len(rows) >= MAX_SAMPLE_ROWS:
+                        break
+            except csv.Error:
+                continue
+            if not rows:
+                continue
+
+            width, count = Counter(len(row) for row in rows).most_common(1)[0]
+            if width < 2:
+                continue
+            candidate = {
+                'delimiter': delimiter,
+                'quotechar': quotechar,
+                'rows': rows,
+                'width': width,
+                'consistency': count / len(rows)
+            }
+            if best is None or (candidate['consistency'], width) > (best['consistency'], best['width']):
+                best = candidate
+    return best
+
+
+def _sniff_fixed_width(lines: List[str]) -> Optional[Dict[str, Any]]:
+    """Find columns separated by positions that are blank on (nearly) every line."""
+    # With only a header and one row, aligned spaces are mostly coincidence
+    if len(lines) < 3:
+        return None
+
+    # Only positions reached by at least 80% of the lines can separate columns,
+    # so short lines do not make trailing positions look blank
+    line_length = sorted(len(line) for line in lines)[len(lines) // 5]
+    blank_share = []
+    for position in range(line_length):
+        blanks = sum(1 for line in lines if line[position:position + 1] in ('', ' '))
+        blank_share.append(blanks / len(lines))
+
+    # Count runs of content between separator positions
+    fields, in_field, separator_shares = 0, False, []
+    for share in blank_share:
+        if share >= MIN_BLANK_SHARE:
+            if in_field:
+                separator_shares.append(share)
+            in_field = False
+        elif not in_field:
+            fields += 1
+            in_field = True
+
+    if fields < 2 or not separator_shares:
+        return None
+    return {'width': fields, 'consistency': sum(separator_shares) / len(separator_shares)}
+
+
+def sniff_text(source: TextSource, sample_bytes: int = DEFAULT_SAMPLE_BYTES) -> SniffResult:
+    """
+    Detect the layout of a text file from its first `sample_bytes` bytes.
+
+    Args:
+        source: File path or raw bytes
+        sample_bytes: Size of the inspected prefix
+
+    Returns:
+        SniffResult with the detected format and a confidence score
+    """
+    prefix = read_prefix(source, sample_bytes + 1)
+    complete = len(prefix) <= sample_bytes
+    prefix = prefix[:sample_bytes]
+
+    encoding = detect_encoding(prefix, complete)
+    text = _decode_prefix(prefix, encoding, complete)
+    lines = [line.rstrip('\r') for line in text.split('\n') if line.strip()][:MAX_SAMPLE_ROWS]
+    if not lines:
+        return SniffResult('lines', encoding, 0.0)
+
+    evidence = min(1.0, len(lines) / MIN_CONFIDENT_ROWS)
+
+    delimited = _sniff_delimited(text)
+    if delimited is not None and delimited['consistency'] >= MIN_CONSISTENCY:
+        return SniffResult(
+            'delimited', encoding,
+            confidence=round(delimited['consistency'] * evidence, 3),
+            delimiter=delimited['delimiter'],
+            quotechar=delimited['quotechar'],
+            has_header=_detect_header(delimited['rows'], delimited['width']),
+            columns=delimited['width']
+        )
+
+    fixed = _sniff_fixed_width(lines)
+    if fixed is not None:
+        return SniffResult(
+            'fixed_width', encoding,
+            confidence=round(fixed['consistency'] * evidence, 3),
+            columns=fixed['width']
+        )
+
+    # One value per line; confident when no delimiter came close
+    closest = delimited['consistency'] if delimited is not None else 0.0
+    return SniffResult('lines', encoding, confidence=round((1.0 - closest) * evidence, 3))
+
+
+def read_lines(source: TextSource, encoding: str = 'utf-8') -> pd.DataFrame:
+    """
+    Read a text file as a single 'content' column of its non-blank lines.
+
+    Args:
+        source: File path or raw bytes
+        encoding: Text encoding
+
+    Returns:
+        DataFrame with one row per non-blank line
+    """
+    if isinstance(source, bytes):
+        text = source.decode(encoding)
+    else:
+        with open(source, encoding=encoding) as f:
+            text = f.read()
+    return pd.DataFrame({'content': [line.strip() for line in text.split('\n') if line.strip()]})
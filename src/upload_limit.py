@@ -0,0 +1,70 @@
+"""
+Upload Limit Module
+ASGI middleware bounding request bodies, so oversized uploads are refused
+while they arrive instead of after they have been written to disk.
+"""
+
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class UploadLimitMiddleware:
+    """
+    Reject request bodies larger than a per-request limit.
+
+    A declared Content-Length over the limit is refused before the body is
+    read. Otherwise the body bytes are counted as they are received (which
+    also covers chunked uploads without a Content-Length) and reading stops
+    with a 413 as soon as the running total passes the limit.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limit: Callable[[Scope], Optional[int]],
+        overhead: int = 0
+    ):
+        """
+        Initialize the UploadLimitMiddleware.
+
+        Args:
+            app: Wrapped ASGI application
+            limit: Returns the largest accepted file (in bytes) for a request,
+                or None for requests without a limit
+            overhead: Bytes allowed on top of the limit for multipart
+                boundaries and part headers
+        """
+        self.app = app
+        self.limit = limit
+        self.overhead = overhead
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        limit = self.limit(scope) if scope['type'] == 'http' else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"File too large (limit {limit / (1024 * 1024):g} MB)"
+        max_body = limit + self.overhead
+        content_length = Headers(scope=scope).get('content-length')
+        if content_length and content_length.isdigit() and int(content_length) > max_body:
+            await JSONResponse(status_code=413, content={"detail": detail})(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message['type'] == 'http.request':
+                received += len(message.get('body', b''))
+                if received > max_body:
+                    # Raised inside the body parser, so it reaches the client as a 413
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
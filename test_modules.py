@@ -129,6 +129,886 @@ def test_sample_data():
         return False
 
 
+def test_session_store():
+    """Test bounded session store."""
+    print("\nTesting session store...")
+    try:
+        import time
+        from src.session_store import SessionStore
+        from src.utils import load_sample_data
+        
+        df = load_sample_data('titanic')
+        store = SessionStore(memory_budget_mb=0.001, ttl_seconds=60)
+        store['a'] = {'dataframe': df, 'filename': 'a.csv'}
+        store['b'] = {'dataframe': df.copy(), 'filename': 'b.csv'}
+        
+        # Over budget: the least recently used session is spilled
+        assert store.stats()['spilled'] == 1
+        assert store['a']['dataframe'].equals(df)
+        assert store['a']['filename'] == 'a.csv'
+        assert store.stats()['spilled'] == 1
+        
+        # Sort permutations are cached and dropped when the data changes
+        from src.sorting import get_sort_permutation
+        perm = get_sort_permutation(store, 'a', 'Age', ascending=False)
+        expected = df.sort_values('Age', ascending=False, kind='stable')
+        assert df.iloc[perm].equals(expected)
+        assert get_sort_permutation(store, 'a', 'Age', ascending=False) is perm
+        
+        # Multi-column orderings are a lexsort of cached rank arrays
+        from src.sorting import get_multi_sort_permutation
+        keys = [('Pclass', True), ('Age', False), ('Name', True)]
+        perm = get_multi_sort_permutation(store, 'a', keys)
+        expected = df.sort_values(['Pclass', 'Age', 'Name'], ascending=[True, False, True], kind='stable')
+        assert df.iloc[perm].equals(expected)
+        assert get_multi_sort_permutation(store, 'a', keys) is perm
+        
+        store.update_dataframe('a', df.head(10))
+        assert len(get_sort_permutation(store, 'a', 'Age')) == 10
+        
+        # Versions keep increasing when a session is replaced
+        version = store.version('a')
+        store['a'] = {'dataframe': df.head(10)}
+        assert store.version('a') > version
+
+        # The running byte total matches the resident sessions
+        store.cache_put('a', 'mask', np.zeros(100, dtype=bool))
+        store.cache_put('a', 'mask', np.zeros(200, dtype=bool))
+        resident = sum(r.total_bytes for r in store._records.values() if r.resident)
+        assert store.memory_usage() == resident
+        assert store.dataframe('b').equals(df)
+        assert store.memory_usage() == sum(r.total_bytes for r in store._records.values() if r.resident)
+
+        store.put('c', {'dataframe': df}, ttl_seconds=0)
+        time.sleep(0.01)
+        assert 'c' not in store
+        assert len(store) == 2
+        assert store.memory_usage() == sum(r.total_bytes for r in store._records.values() if r.resident)
+        store.close()
+        
+        print("✓ Session store works")
+        return True
+    except Exception as e:
+        print(f"✗ Session store error: {e}")
+        return False
+
+
+def test_filter_engine():
+    """Test compiled filter masks."""
+    print("\nTesting filter engine...")
+    try:
+        from src.filter_engine import apply_filters, build_filter_mask
+        from src.session_store import SessionStore
+        from src.utils import load_sample_data
+        
+        df = load_sample_data('titanic')
+        filters = {
+            'Sex': {'operator': 'eq', 'value': 'female'},
+            'Fare': {'operator': 'gt', 'value': '20'},
+            'Name': {'operator': 'contains', 'value': 'PASSENGER 1'}
+        }
+        expected = df[(df['Sex'] == 'female') & (df['Fare'] > 20)
+                      & df['Name'].str.contains('passenger 1', case=False)]
+        assert apply_filters(df, filters).equals(expected)
+        
+        # Predicate masks are memoised per session
+        store = SessionStore()
+        store['s'] = {'dataframe': df}
+        build_filter_mask(df, filters, store, 's')
+        assert store.cache_get('s', ('mask', 'Sex', 'eq', '"female"')) is not None
+        assert apply_filters(df, filters, store, 's').equals(expected)
+        assert build_filter_mask(df, {'Missing': {'operator': 'eq', 'value': 1}}) is None
+        
+        # Filtered views resolve to sorted row positions
+        from src.data_views import resolve_view_rows
+        rows = resolve_view_rows(store, 's', df, filters=filters, sort_keys=[('Fare', False)])
+        assert df.iloc[rows[:5]].equals(
+            expected.sort_values('Fare', ascending=False, kind='stable').head(5))
+        store.close()
+        
+        print("✓ Filter engine works")
+        return True
+    except Exception as e:
+        print(f"✗ Filter engine error: {e}")
+        return False
+
+
+def test_exporters():
+    """Test streaming exporters."""
+    print("\nTesting exporters...")
+    try:
+        import numpy as np
+        from src.exporters import iter_csv, iter_ndjson
+        from src.utils import load_sample_data
+        
+        df = load_sample_data('tips')
+        rows = np.argsort(df['total_bill'].to_numpy(), kind='stable')
+        view = df.iloc[rows][['day', 'tip']]
+        
+        csv_blocks = list(iter_csv(df, rows, ['day', 'tip'], chunk_rows=40))
+        assert len(csv_blocks) == 5
+        assert b"".join(csv_blocks) == view.to_csv(index=False).encode()
+        
+        ndjson = b"".join(iter_ndjson(df, rows, ['day', 'tip'], chunk_rows=40))
+        assert ndjson.count(b"\n") == len(df)
+        
+        try:
+            import io
+            import pyarrow as pa
+            from src.exporters import iter_arrow_ipc
+            arrow = b"".join(iter_arrow_ipc(df, rows, ['day', 'tip'], chunk_rows=40))
+            table = pa.ipc.open_stream(io.BytesIO(arrow)).read_all()
+            assert table.to_pandas().equals(view.reset_index(drop=True))
+
+            # The schema covers whole columns: object columns that start null
+            # or mix numbers and text still fit every block
+            mixed = pd.DataFrame({'text': [None] * 50 + ['x'] * 10, 'mixed': [None] * 50 + ['x', 1.5] * 5})
+            arrow = b"".join(iter_arrow_ipc(mixed, chunk_rows=40))
+            table = pa.ipc.open_stream(io.BytesIO(arrow)).read_all()
+            assert table.num_rows == 60 and table.column('mixed').to_pylist()[50:52] == ['x', '1.5']
+
+            # Duplicate column names are selected by position
+            import pyarrow.parquet as pq
+            from src.exporters import iter_parquet
+            dup = pd.DataFrame([[1, 2.0, 'a'], [3, 4.0, 'b']], columns=['x', 'x', 'y'])
+            table = pq.read_table(io.BytesIO(b"".join(iter_parquet(dup, columns=['y', 'x']))))
+            assert table.column_names == ['y', 'x', 'x.1'] and table.column('x.1').to_pylist() == [2.0, 4.0]
+        except ImportError:
+            pass
+        
+        print("✓ Exporters work")
+        return True
+    except Exception as e:
+        print(f"✗ Exporters error: {e}")
+        return False
+
+
+def test_upload_limit():
+    """Test that oversized uploads are rejected before they are parsed."""
+    print("\nTesting upload size limit...")
+    try:
+        from fastapi.testclient import TestClient
+        import api.main as main
+
+        client = TestClient(main.app)
+        limit, ingest, spool = main.MAX_UPLOAD_BYTES, main.run_ingest_job, main.spool_upload
+        parsed, spooled = [], []
+
+        async def record_ingest(*args, **kwargs):
+            parsed.append(args)
+
+        main.MAX_UPLOAD_BYTES = 1000
+        main.run_ingest_job = record_ingest
+        try:
+            # Declared too large: refused from Content-Length alone
+            body = b"0" * (1000 + main.MULTIPART_OVERHEAD_BYTES + 1)
+            response = client.post("/api/upload?backend=memory", content=body,
+                                   headers={'Content-Type': 'text/csv'})
+            assert response.status_code == 413
+
+            # Under the Content-Length allowance but over the limit once spooled
+            csv = b"a,b\n" + b"1,2\n" * 500
+            response = client.post("/api/upload?backend=memory", files={'file': ('big.csv', csv, 'text/csv')})
+            assert response.status_code == 413
+            assert not parsed
+
+            # Chunked, without a Content-Length: refused while the body is read,
+            # before the endpoint spools it
+            async def record_spool(*args, **kwargs):
+                spooled.append(args)
+                return await spool(*args, **kwargs)
+
+            main.spool_upload = record_spool
+            part = (b'--limit\r\nContent-Disposition: form-data; name="file"; filename="big.csv"\r\n'
+                    b'Content-Type: text/csv\r\n\r\n')
+
+            def chunks():
+                yield part
+                for _ in range(200):
+                    yield b"1,2\n" * 1024
+                yield b'\r\n--limit--\r\n'
+
+            response = client.post("/api/upload?backend=memory", content=chunks(),
+                                   headers={'Content-Type': 'multipart/form-data; boundary=limit'})
+            assert response.status_code == 413 and not spooled and not parsed
+
+            response = client.post("/api/upload?backend=memory", files={'file': ('small.csv', b"a,b\n1,2\n", 'text/csv')})
+            assert response.status_code == 202 and len(parsed) == 1 and len(spooled) == 1
+        finally:
+            main.MAX_UPLOAD_BYTES, main.run_ingest_job = limit, ingest
+            main.spool_upload = spool
+
+        print("✓ Upload size limit works")
+        return True
+    except Exception as e:
+        print(f"✗ Upload size limit error: {e}")
+        return False
+
+
+def test_csv_reader():
+    """Test fast-path CSV reader."""
+    print("\nTesting CSV reader...")
+    try:
+        import io
+        from src.csv_reader import read_csv_fast, iter_csv_chunks, infer_csv_dtypes
+        from src.utils import load_sample_data
+        
+        df = load_sample_data('tips')
+        text = df.to_csv(index=False)
+        expected = pd.read_csv(io.StringIO(text))
+        
+        for engine in ['auto', 'c']:
+            parsed = read_csv_fast(io.BytesIO(text.encode()), engine=engine, infer_dtypes=True, sample_rows=20)
+            assert list(parsed.columns) == list(df.columns)
+            assert parsed['size'].equals(expected['size'])
+        
+        assert infer_csv_dtypes(io.StringIO(text))['size'] == 'int64'
+        chunks = list(iter_csv_chunks(io.BytesIO(text.encode()), chunk_rows=40, engine='c'))
+        assert sum(len(c) for c in chunks) == len(df)
+        
+        print("✓ CSV reader works")
+        return True
+    except Exception as e:
+        print(f"✗ CSV reader error: {e}")
+        return False
+
+
+def test_dtype_optimizer():
+    """Test dtype optimizer."""
+    print("\nTesting dtype optimizer...")
+    try:
+        from src.dtype_optimizer import DtypeOptimizer
+        from src.utils import load_sample_data
+        
+        df = load_sample_data('titanic')
+        optimized, report = DtypeOptimizer().optimize(df)
+        
+        assert str(optimized['Sex'].dtype) == 'category'
+        assert optimized['Pclass'].dtype.itemsize == 1
+        assert report['memory_after_mb'] < report['memory_before_mb']
+        assert (optimized['Fare'] == df['Fare']).all()
+        assert optimized['Sex'].astype(str).equals(df['Sex'].astype(str))
+        
+        print(f"✓ Dtype optimizer works (reduction: {report['reduction_ratio']:.1f}x)")
+        return True
+    except Exception as e:
+        print(f"✗ Dtype optimizer error: {e}")
+        return False
+
+
+def test_column_stats():
+    """Test single-pass column statistics."""
+    print("\nTesting column statistics...")
+    try:
+        from src.column_stats import compute_statistics
+        from src.utils import load_sample_data
+        
+        df = load_sample_data('titanic')
+        stats = compute_statistics(df)
+        described = df.describe()
+        
+        assert abs(stats['numeric_statistics']['Age']['mean'] - described['Age']['mean']) < 1e-9
+        assert abs(stats['numeric_statistics']['Fare']['75%'] - described['Fare']['75%']) < 1e-9
+        assert stats['categorical_statistics']['Sex']['top_value'] == df['Sex'].mode()[0]
+        assert stats['missing_values'] == {k: int(v) for k, v in df.isnull().sum().items()}
+        
+        print("✓ Column statistics work")
+        return True
+    except Exception as e:
+        print(f"✗ Column statistics error: {e}")
+        return False
+
+
+def test_executor():
+    """Test the task executor."""
+    print("\nTesting task executor...")
+    try:
+        import asyncio
+        import time
+        from src.executor import TaskExecutor
+        
+        executor = TaskExecutor(thread_workers=2, process_workers=0, timeout_seconds=0.2)
+        
+        async def check():
+            assert await executor.run_in_thread(sum, [1, 2, 3]) == 6
+            # Without process workers, isolated tasks fall back to the thread pool
+            assert await executor.run_in_process(max, 4, 9) == 9
+            try:
+                await executor.run_in_thread(time.sleep, 1)
+                return False
+            except asyncio.TimeoutError:
+                return True
+        
+        assert asyncio.run(check())
+        executor.shutdown()
+        
+        print("✓ Task executor works")
+        return True
+    except Exception as e:
+        print(f"✗ Task executor error: {e}")
+        return False
+
+
+def test_pdf_tables():
+    """Test page-range PDF table extraction helpers."""
+    print("\nTesting PDF table extraction...")
+    try:
+        import tempfile
+        from src.pdf_tables import PageTableCache, page_ranges, merge_page_tables
+        
+        assert page_ranges(10, 4) == [(0, 4), (4, 8), (8, 10)]
+        assert page_ranges(0, 4) == []
+        
+        pages = [[[['h1', 'h2'], ['a', 'b']]], [], [[], [['c', None]]]]
+        assert merge_page_tables(pages) == [['h1', 'h2'], ['a', 'b'], ['c', None]]
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PageTableCache(tmp, max_documents=1)
+            key = cache.document_key(b'%PDF example')
+            assert cache.get(key, 0) is None
+            cache.put(key, 0, pages[0])
+            assert cache.get(key, 0) == pages[0]
+            
+            # Only the most recently used document is kept
+            cache.touch(key)
+            other = cache.document_key(b'%PDF other')
+            cache.touch(other)
+            assert cache.get(key, 0) is None
+
+        # A PDF job is bounded by the ingest timeout and fails instead of
+        # falling back to text extraction
+        import asyncio
+        import os
+        import time
+        import api.main as main
+        count_pages, timeout = main.count_pages, main.INGEST_TIMEOUT_SECONDS
+        main.count_pages = lambda path: time.sleep(1) or 1
+        main.INGEST_TIMEOUT_SECONDS = 0.1
+        try:
+            fd, path = tempfile.mkstemp(suffix='.pdf')
+            os.close(fd)
+            job = main.jobs.create('slow.pdf', 0, 'pdf-timeout-test')
+            asyncio.run(main.run_ingest_job(job, path, False))
+            assert job.stage == 'failed' and job.to_dict()['error']['status_code'] == 504
+            assert not os.path.exists(path)
+        finally:
+            main.count_pages, main.INGEST_TIMEOUT_SECONDS = count_pages, timeout
+
+        print("✓ PDF table extraction helpers work")
+        return True
+    except Exception as e:
+        print(f"✗ PDF table extraction error: {e}")
+        return False
+
+
+def test_ingest_jobs():
+    """Test ingest job tracking."""
+    print("\nTesting ingest jobs...")
+    try:
+        from src.ingest_jobs import JobRegistry
+        
+        registry = JobRegistry(max_jobs=2)
+        job = registry.create('data.csv', 200, 'session-1')
+        assert registry.get(job.job_id) is job
+        assert job.to_dict()['stage'] == 'queued' and not job.done
+        
+        job.update(stage='parsing', bytes_parsed=50, rows=10)
+        assert job.to_dict()['progress'] == 0.25
+        job.fail(400, 'bad file')
+        assert job.done and job.to_dict()['error']['status_code'] == 400
+        
+        # Finished jobs are dropped first once the registry is full
+        running = registry.create('b.csv', 10, 'session-2')
+        registry.create('c.csv', 10, 'session-3')
+        assert registry.get(job.job_id) is None and registry.get(running.job_id) is running
+        
+        print("✓ Ingest jobs work")
+        return True
+    except Exception as e:
+        print(f"✗ Ingest jobs error: {e}")
+        return False
+
+
+def test_excel_reader():
+    """Test the streaming Excel reader."""
+    print("\nTesting Excel reader...")
+    try:
+        import io
+        import pandas as pd
+        from src.excel_reader import read_excel_fast, list_sheets
+        
+        df = pd.DataFrame({'id': range(25), 'score': [i / 4 for i in range(25)], 'name': [f"n{i}" for i in range(25)],
+                           'code': [str(i) for i in range(24)] + ['x'], 'amount': [str(i) for i in range(25)]})
+        buffer = io.BytesIO()
+        with pd.ExcelWriter(buffer) as writer:
+            df.to_excel(writer, index=False, sheet_name='Scores')
+            df.head(3).to_excel(writer, index=False, sheet_name='Head')
+        data = buffer.getvalue()
+        
+        sheets = list_sheets(io.BytesIO(data))
+        assert [sheet['name'] for sheet in sheets] == ['Scores', 'Head']
+        
+        # Chunked read matches pandas, for the default and a selected sheet; column
+        # types are decided over the whole sheet ('code' is numeric text until its last row)
+        pd.testing.assert_frame_equal(read_excel_fast(io.BytesIO(data), chunk_rows=10), pd.read_excel(io.BytesIO(data)))
+        pd.testing.assert_frame_equal(
+            read_excel_fast(io.BytesIO(data), sheet_name='Head'),
+            pd.read_excel(io.BytesIO(data), sheet_name='Head')
+        )
+        
+        print("✓ Excel reader works")
+        return True
+    except Exception as e:
+        print(f"✗ Excel reader error: {e}")
+        return False
+
+
+def test_text_sniffer():
+    """Test text layout sniffing."""
+    print("\nTesting text sniffer...")
+    try:
+        from src.text_sniffer import sniff_text
+        
+        csv_text = b'name;age\nann;31\nbob;25\ncy;40\ndee;22\n'
+        sniff = sniff_text(csv_text)
+        assert sniff.format == 'delimited' and sniff.delimiter == ';' and sniff.has_header
+        assert sniff.confidence == 1.0
+        
+        no_header = sniff_text(b'1\t2.5\n3\t4.5\n5\t6.5\n')
+        assert no_header.delimiter == '\t' and not no_header.has_header
+        
+        fixed = sniff_text(b'id   name    score\n1    alice   10.5\n2    bob     8.25\n3    carol   7.0\n')
+        assert fixed.format == 'fixed_width' and fixed.columns == 3
+        
+        assert sniff_text(b'Just some text\nwith a few lines\n').format == 'lines'
+        assert sniff_text('a,b\ncaf\xe9,1\n'.encode('latin-1')).encoding == 'latin-1'
+        
+        print("✓ Text sniffer works")
+        return True
+    except Exception as e:
+        print(f"✗ Text sniffer error: {e}")
+        return False
+
+
+def test_serialization():
+    """Test JSON response serialization."""
+    print("\nTesting serialization...")
+    try:
+        import json
+        import numpy as np
+        import pandas as pd
+        from src.serialization import frame_records, frame_payload, dumps
+        
+        df = pd.DataFrame({
+            'id': [1, 2],
+            'value': [1.5, np.nan],
+            'name': ['a', None],
+            'when': pd.to_datetime(['2024-01-02', None])
+        })
+        records = frame_records(df)
+        assert records[0] == {'id': 1, 'value': 1.5, 'name': 'a', 'when': pd.Timestamp('2024-01-02')}
+        
+        decoded = json.loads(dumps({'data': records, 'count': np.int64(2)}))
+        assert decoded['count'] == 2
+        assert decoded['data'][0]['when'] == '2024-01-02T00:00:00'
+        assert decoded['data'][1] == {'id': 2, 'value': None, 'name': None, 'when': None}
+        
+        page = pd.DataFrame({'id': [1, 2, 3], 'group': ['a', None, 'a'], 'label': ['x', 'y', 'z']})
+        columnar = json.loads(dumps(frame_payload(page, 'columnar')))
+        by_name = {column['name']: column for column in columnar['columns']}
+        assert columnar['length'] == 3 and by_name['id']['values'] == [1, 2, 3]
+        assert by_name['group']['dictionary'] == ['a'] and by_name['group']['codes'] == [0, -1, 0]
+        assert by_name['label']['values'] == ['x', 'y', 'z']
+        
+        print("✓ Serialization works")
+        return True
+    except Exception as e:
+        print(f"✗ Serialization error: {e}")
+        return False
+
+
+def test_http_cache():
+    """Test ETag construction and matching."""
+    print("\nTesting HTTP cache...")
+    try:
+        from src.http_cache import make_etag, etag_matches
+        
+        etag = make_etag('s1', 3, [('page', '0'), ('sort_column', 'a')])
+        assert etag.startswith('W/"')
+        assert etag == make_etag('s1', 3, [('sort_column', 'a'), ('page', '0')])
+        assert etag != make_etag('s1', 4, [('page', '0'), ('sort_column', 'a')])
+        assert etag != make_etag('s1', 3, [('page', '1'), ('sort_column', 'a')])
+        
+        # Repeated parameters keep their order: swapped sort directions differ
+        multi = [('sort_column', 'a'), ('sort_order', 'desc'), ('sort_column', 'b'), ('sort_order', 'asc')]
+        swapped = [('sort_column', 'a'), ('sort_order', 'asc'), ('sort_column', 'b'), ('sort_order', 'desc')]
+        assert make_etag('s1', 3, multi) != make_etag('s1', 3, swapped)
+        assert make_etag('s1', 3, [('columns', 'a'), ('columns', 'b')]) != \
+            make_etag('s1', 3, [('columns', 'b'), ('columns', 'a')])
+        
+        assert etag_matches(etag, etag) and etag_matches('*', etag)
+        assert etag_matches(f'"x", {etag[2:]}', etag)
+        assert not etag_matches(None, etag) and not etag_matches('"x"', etag)
+        
+        print("✓ HTTP cache works")
+        return True
+    except Exception as e:
+        print(f"✗ HTTP cache error: {e}")
+        return False
+
+
+def test_compression():
+    """Test response compression negotiation and middleware."""
+    print("\nTesting compression...")
+    try:
+        from fastapi import FastAPI
+        from fastapi.responses import PlainTextResponse, StreamingResponse
+        from fastapi.testclient import TestClient
+        from src.compression import CompressionMiddleware, negotiate_encoding, brotli
+        
+        assert negotiate_encoding('gzip, deflate') == 'gzip'
+        assert negotiate_encoding('gzip;q=0') is None and negotiate_encoding('') is None
+        assert negotiate_encoding('br, gzip') == ('br' if brotli is not None else 'gzip')
+        
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware, minimum_size=100)
+        app.get("/big")(lambda: PlainTextResponse("x" * 1000, media_type="text/csv"))
+        app.get("/small")(lambda: PlainTextResponse("x" * 10, media_type="text/csv"))
+        app.get("/stream")(lambda: StreamingResponse(iter(["a,b\n"] * 300), media_type="text/csv"))
+        client = TestClient(app)
+        
+        response = client.get("/big", headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['content-encoding'] == 'gzip' and response.text == "x" * 1000
+        streamed = client.get("/stream", headers={'Accept-Encoding': 'gzip'})
+        assert streamed.headers['content-encoding'] == 'gzip' and streamed.text == "a,b\n" * 300
+        assert 'content-encoding' not in client.get("/small", headers={'Accept-Encoding': 'gzip'}).headers
+        assert 'content-encoding' not in client.get("/big", headers={'Accept-Encoding': 'identity'}).headers
+        
+        print("✓ Compression works")
+        return True
+    except Exception as e:
+        print(f"✗ Compression error: {e}")
+        return False
+
+
+def test_text_index():
+    """Test the trigram index for 'contains' filters."""
+    print("\nTesting text index...")
+    try:
+        import numpy as np
+        import pandas as pd
+        from src.session_store import SessionStore
+        from src.text_index import TextIndex, get_text_index
+        
+        names = pd.Series(['Alice Smith', 'bob SMITHERS', None, 'Carol', 'alice', 'Zoë Ångström'] * 50)
+        index = TextIndex(names)
+        for needle in ['smith', 'ALI', 'ol', 'zzz', 'ångs', 'a.i', 'bob|carol', '']:
+            expected = names.astype(str).str.contains(needle, case=False, na=False).to_numpy(dtype=bool)
+            assert np.array_equal(index.contains(needle), expected), needle
+        
+        store = SessionStore()
+        store['s'] = {'dataframe': pd.DataFrame({'name': names})}
+        before = store.memory_usage()
+        cached = get_text_index(store, 's', 'name')
+        assert get_text_index(store, 's', 'name') is cached
+        assert store.memory_usage() >= before + cached.nbytes
+        
+        print("✓ Text index works")
+        return True
+    except Exception as e:
+        print(f"✗ Text index error: {e}")
+        return False
+
+
+def test_bitmap_index():
+    """Test bitmap-indexed equality, membership and null filters."""
+    print("\nTesting bitmap index...")
+    try:
+        import numpy as np
+        import pandas as pd
+        from src.session_store import SessionStore
+        from src.filter_engine import build_filter_mask
+        from src.bitmap_index import BITMAP_INDEX_MIN_ROWS, get_bitmap_index
+        
+        n = BITMAP_INDEX_MIN_ROWS
+        df = pd.DataFrame({
+            'port': pd.Series(['S', 'C', 'Q', None] * (n // 4), dtype=object),
+            'pclass': np.tile([1, 2, 3, 1], n // 4),
+            'id': np.arange(n)
+        })
+        store = SessionStore()
+        store['s'] = {'dataframe': df}
+        
+        for filters in [
+            {'port': {'operator': 'eq', 'value': 'S'}},
+            {'port': {'operator': 'ne', 'value': 'S'}},
+            {'port': {'operator': 'in', 'value': ['C', 'Q']}, 'pclass': {'operator': 'eq', 'value': 1}},
+            {'port': {'operator': 'is_null'}, 'id': {'operator': 'gt', 'value': 100}},
+            {'port': {'operator': 'not_null'}}
+        ]:
+            assert np.array_equal(build_filter_mask(df, filters), build_filter_mask(df, filters, store, 's'))
+        
+        assert get_bitmap_index(store, 's', 'port') is not None
+        assert get_bitmap_index(store, 's', 'id') is None  # too many distinct values
+        
+        print("✓ Bitmap index works")
+        return True
+    except Exception as e:
+        print(f"✗ Bitmap index error: {e}")
+        return False
+
+
+def test_range_index():
+    """Test range filters resolved through the sorted-column index."""
+    print("\nTesting range index...")
+    try:
+        import numpy as np
+        import pandas as pd
+        from src.session_store import SessionStore
+        from src.filter_engine import build_filter_mask
+        from src.range_index import RANGE_INDEX_MIN_ROWS, get_range_index
+        
+        n = RANGE_INDEX_MIN_ROWS * 2
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=n)
+        values[::97] = np.nan
+        df = pd.DataFrame({'value': values, 'day': pd.Timestamp('2024-01-01') + pd.to_timedelta(np.arange(n), unit='h')})
+        store = SessionStore()
+        store['s'] = {'dataframe': df}
+        
+        index = get_range_index(store, 's', 'value')
+        assert index.lookup('gt', 3.0) is not None       # selective: resolved by binary search
+        assert index.lookup('gt', 0.0) is None           # about half the rows: scanned
+        assert index.lookup('lte', 3.0) is not None      # complement is small
+        
+        for column, operator, value in [
+            ('value', 'gt', 2.5), ('value', 'lte', 2.5), ('value', 'gte', '-0.1'), ('value', 'lt', -2.9),
+            ('day', 'gte', '2026-04-01'), ('day', 'lt', '2024-01-05')
+        ]:
+            filters = {column: {'operator': operator, 'value': value}}
+            assert np.array_equal(build_filter_mask(df, filters), build_filter_mask(df, filters, store, 's'))
+        
+        print("✓ Range index works")
+        return True
+    except Exception as e:
+        print(f"✗ Range index error: {e}")
+        return False
+
+
+def test_query_plan():
+    """Test lazy query plans and partial-sort pages."""
+    print("\nTesting query plan...")
+    try:
+        import numpy as np
+        import pandas as pd
+        from src.session_store import SessionStore
+        from src.query_plan import QueryPlan, TOP_K_MIN_ROWS
+        
+        n = TOP_K_MIN_ROWS * 4
+        rng = np.random.default_rng(0)
+        values = rng.integers(0, 500, n).astype(float)
+        values[::53] = np.nan
+        df = pd.DataFrame({'value': values, 'group': rng.choice(['a', 'b', 'c'], n), 'id': np.arange(n)})
+        store = SessionStore()
+        store['s'] = {'dataframe': df}
+        
+        filters = {'group': {'operator': 'ne', 'value': 'b'}}
+        plan = QueryPlan(filters=filters, columns=['id', 'value', 'id'], sort_keys=[('value', False)], offset=20, limit=50)
+        
+        # The partial sort matches a stable full sort, ties and missing values included
+        result = plan.execute(store, 's', df)
+        assert result.steps == ['filter', 'top_k', 'slice', 'project']
+        expected = df[df['group'] != 'b'].sort_values('value', ascending=False, kind='stable')
+        assert result.total_rows == len(expected)
+        assert result.frame(df).equals(expected[['id', 'value']].iloc[20:70])
+        assert store.cache_get('s', ('sort', 'value', False)) is None
+        
+        # Large windows and multi-column sorts use the cached full ordering
+        keys = [('group', True), ('value', True)]
+        result = QueryPlan(sort_keys=keys, offset=n - 10).execute(store, 's', df)
+        assert result.frame(df).equals(df.sort_values(['group', 'value'], kind='stable').iloc[n - 10:])
+        assert QueryPlan(offset=5, limit=3).execute(store, 's', df).frame(df).equals(df.iloc[5:8])
+
+        # An empty window over a large sorted view is an empty page
+        empty = QueryPlan(sort_keys=[('value', True)], limit=0)
+        result = empty.execute(store, 's', df)
+        assert result.steps == ['sort', 'slice'] and len(result.rows) == 0
+        store.close()
+
+        from fastapi.testclient import TestClient
+        from api.main import app, sessions, new_session
+        sessions['query-plan-test'] = new_session(df, 'values.csv')
+        response = TestClient(app).get('/api/data/query-plan-test', params={'sort_column': 'value', 'page_size': 0})
+        assert response.status_code == 200 and response.json()['data'] == []
+        del sessions['query-plan-test']
+
+        print("✓ Query plan works")
+        return True
+    except Exception as e:
+        print(f"✗ Query plan error: {e}")
+        return False
+
+
+def test_concurrent_reads():
+    """Test that concurrent reads share the session frame instead of copying it."""
+    print("\nTesting concurrent read memory...")
+    try:
+        import threading
+        import tracemalloc
+        import numpy as np
+        import pandas as pd
+        from src.session_store import SessionStore
+        from src.query_plan import QueryPlan
+        from src.serialization import frame_payload, dumps
+        
+        n = 400000
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(rng.normal(size=(n, 8)), columns=list('abcdefgh'))
+        df['group'] = rng.choice(['x', 'y'], n)
+        frame_bytes = int(df.memory_usage(deep=True).sum())
+        store = SessionStore()
+        store['s'] = {'dataframe': df}
+        
+        def read():
+            # The /api/data path: a filtered, sorted page and a plain page
+            filters = {'group': {'operator': 'eq', 'value': 'x'}}
+            result = QueryPlan(filters=filters, sort_keys=[('a', False)], offset=50000, limit=100).execute(store, 's', df)
+            dumps(frame_payload(result.frame(df), 'records'))
+            result = QueryPlan(offset=1000, limit=100).execute(store, 's', df)
+            dumps(frame_payload(result.frame(df), 'columnar'))
+        
+        def peak_memory(n_readers):
+            barrier = threading.Barrier(n_readers)
+            threads = [threading.Thread(target=lambda: (barrier.wait(), read())) for _ in range(n_readers)]
+            tracemalloc.start()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+        
+        read()  # builds the cached masks, ordering and view
+        single, concurrent = peak_memory(1), peak_memory(16)
+        print(f"  frame {frame_bytes / 1e6:.1f} MB, peak 1 reader {single / 1e6:.2f} MB, 16 readers {concurrent / 1e6:.2f} MB")
+        
+        # A per-request copy would add a full frame per reader
+        assert concurrent < frame_bytes / 10
+        store.close()
+        
+        print("✓ Concurrent reads share the session frame")
+        return True
+    except Exception as e:
+        print(f"✗ Concurrent read memory error: {e}")
+        return False
+
+
+def test_disk_table():
+    """Test the out-of-core disk backend."""
+    print("\nTesting disk tables...")
+    try:
+        import os
+        import tempfile
+        import numpy as np
+        import pandas as pd
+        from src.disk_table import DiskDataset, iter_table_export
+        from src.query_plan import QueryPlan
+        from src.column_stats import compute_statistics
+        
+        n = 20000
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'group': rng.choice(['a', 'b', 'c', None], n),
+            'value': rng.integers(0, 50, n),
+            'score': rng.normal(size=n).round(2),
+            'id': np.arange(n),
+            'day': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, n), unit='D')
+        })
+        df.loc[rng.random(n) < 0.05, 'score'] = np.nan
+        base_dir = tempfile.mkdtemp()
+        csv_path = os.path.join(base_dir, 'data.csv')
+        df.to_csv(csv_path, index=False)
+        expected = pd.read_csv(csv_path)
+        
+        # Small runs force the external sort to merge many of them
+        dataset = DiskDataset.from_csv(csv_path, base_dir, sort_run_bytes=64 * 1024)
+        assert dataset.shape == df.shape
+        
+        # Dates stay text, as in the in-memory reader
+        from src.csv_reader import read_csv_fast
+        assert dataset.sample(5)['day'].tolist() == read_csv_fast(csv_path)['day'].head(5).tolist()
+        
+        keys = [('group', False), ('score', True)]
+        result = dataset.execute(QueryPlan(sort_keys=keys, offset=500, limit=100, columns=['id']))
+        ordered = expected.sort_values(['group', 'score'], ascending=[False, True], kind='stable')
+        assert result.total_rows == n
+        assert result.frame()['id'].tolist() == ordered['id'].iloc[500:600].tolist()
+        
+        # Presorted input: the runs do not overlap
+        result = dataset.execute(QueryPlan(sort_keys=[('id', False)], columns=['id']))
+        assert result.frame()['id'].tolist() == list(range(n - 1, -1, -1))
+        
+        filters = {'group': {'operator': 'eq', 'value': 'a'}, 'value': {'operator': 'lt', 'value': 10}}
+        matching = expected[(expected['group'] == 'a') & (expected['value'] < 10)]
+        result = dataset.execute(QueryPlan(filters=filters, sort_keys=[('value', True)]))
+        assert result.total_rows == len(matching)
+        exported = b"".join(iter_table_export(result, 'csv'))
+        assert exported == matching.sort_values('value', kind='stable').to_csv(index=False).encode()
+        
+        # Counts, moments, extremes and missing values are exact
+        statistics, reference = dataset.statistics(), compute_statistics(expected)
+        assert statistics['missing_values'] == reference['missing_values']
+        assert statistics['categorical_statistics'] == reference['categorical_statistics']
+        for key in ['count', 'min', 'max']:
+            assert statistics['numeric_statistics']['score'][key] == reference['numeric_statistics']['score'][key]
+        assert abs(statistics['numeric_statistics']['score']['std'] - reference['numeric_statistics']['score']['std']) < 1e-9
+        
+        # A slow sort neither blocks other views nor runs twice for concurrent requests
+        import threading
+        import src.disk_table as disk_table
+        sort_table, release, builds = disk_table.sort_table, threading.Event(), []
+
+        def slow_sort(*args, **kwargs):
+            # Times out (False) if the filtered view below is blocked behind this sort
+            builds.append(release.wait(10))
+            return sort_table(*args, **kwargs)
+
+        disk_table.sort_table = slow_sort
+        try:
+            workers = [threading.Thread(target=dataset.view, kwargs={'sort_keys': [('score', False)]}) for _ in range(2)]
+            for worker in workers:
+                worker.start()
+            assert dataset.view({'value': {'operator': 'gt', 'value': 40}}).num_rows == (expected['value'] > 40).sum()
+            release.set()
+            for worker in workers:
+                worker.join()
+        finally:
+            disk_table.sort_table = sort_table
+        assert builds == [True]
+
+        dataset.close()
+        assert not os.path.exists(dataset.directory)
+        os.remove(csv_path)
+        
+        # Without pyarrow there is no disk backend, so CSV uploads keep the memory limit
+        import api.main as main
+        arrow = main.pyarrow
+        try:
+            assert main.upload_limit('auto', 'csv') >= main.MAX_UPLOAD_BYTES
+            main.pyarrow = None
+            assert main.upload_limit('auto', 'csv') == main.MAX_UPLOAD_BYTES
+            assert main.upload_limit('disk') == main.MAX_UPLOAD_BYTES
+        finally:
+            main.pyarrow = arrow
+        
+        print("✓ Disk tables work")
+        return True
+    except Exception as e:
+        print(f"✗ Disk table error: {e}")
+        return False
+
+
 def run_all_tests():
     """Run all tests."""
     print("=" * 60)
@@ -140,7 +1020,28 @@ def run_all_tests():
         test_schema_compression,
         test_history_compression,
         test_eda_agent,
-        test_sample_data
+        test_sample_data,
+        test_session_store,
+        test_filter_engine,
+        test_exporters,
+        test_upload_limit,
+        test_csv_reader,
+        test_dtype_optimizer,
+        test_column_stats,
+        test_executor,
+        test_pdf_tables,
+        test_ingest_jobs,
+        test_excel_reader,
+        test_text_sniffer,
+        test_serialization,
+        test_http_cache,
+        test_compression,
+        test_text_index,
+        test_bitmap_index,
+        test_range_index,
+        test_query_plan,
+        test_concurrent_reads,
+        test_disk_table
     ]
     
     results = []